@@ -0,0 +1,137 @@
+# backend/artifacts.py
+"""
+Optional content-addressed store for generated exports.
+
+Artifacts are keyed by a hash of the render inputs (format + request data),
+so asking for the same export again is served from disk without rendering.
+Artifacts older than the TTL are removed by a sweep that runs at most once
+per ARTIFACT_SWEEP_SECONDS on writes. Sweeps only touch artifact files and
+the temp files of writes abandoned for longer than the TTL, so the directory
+may be shared.
+
+Configuration (environment):
+  ARTIFACT_DIR            directory for stored exports (default: disabled)
+  ARTIFACT_TTL            seconds an artifact is kept (default 3600)
+  ARTIFACT_SWEEP_SECONDS  minimum interval between TTL sweeps (default 60)
+"""
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+_ID_RE = re.compile(r"^[0-9a-f]{64}\.(docx|pdf)$")
+_PART_PREFIX = "artifact-"
+_PART_RE = re.compile(r"^artifact-\w+\.part$")
+
+
+def artifact_key(fmt: str, data: Dict[str, Any]) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{fmt}\0{payload}".encode("utf-8")).hexdigest() + "." + fmt
+
+
+class ArtifactStore:
+    def __init__(self, root: str, ttl: float = 3600.0, sweep_every: float = 60.0):
+        self.root = root
+        self.ttl = ttl
+        self.sweep_every = sweep_every
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, artifact_id: str) -> Optional[str]:
+        if not _ID_RE.match(artifact_id):
+            return None
+        return os.path.join(self.root, artifact_id)
+
+    def get(self, artifact_id: str) -> Optional[bytes]:
+        path = self._path(artifact_id)
+        try:
+            if path is None or time.time() - os.path.getmtime(path) > self.ttl:
+                self.misses += 1
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def has(self, artifact_id: str) -> bool:
+        path = self._path(artifact_id)
+        try:
+            return path is not None and time.time() - os.path.getmtime(path) <= self.ttl
+        except OSError:
+            return False
+
+    def put(self, artifact_id: str, data: bytes) -> None:
+        path = self._path(artifact_id)
+        if path is None:
+            raise ValueError(f"invalid artifact id: {artifact_id}")
+        # write-then-rename so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=_PART_PREFIX, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self._maybe_sweep()
+
+    def _maybe_sweep(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < self.sweep_every:
+                return
+            self._last_sweep = now
+        self.sweep(now)
+
+    def sweep(self, now: Optional[float] = None, everything: bool = False) -> int:
+        """
+        Remove artifacts older than the TTL (all of them with everything=True) and
+        temp files older than the TTL; returns how many files were removed.
+        In-flight writes and files that are not ours are never touched.
+        """
+        now = now or time.time()
+        removed = 0
+        for entry in os.scandir(self.root):
+            if _ID_RE.match(entry.name):
+                artifact = True
+            elif _PART_RE.match(entry.name):
+                artifact = False
+            else:
+                continue
+            try:
+                if (artifact and everything) or now - entry.stat().st_mtime > self.ttl:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self) -> int:
+        """Delete every stored artifact; returns how many files were removed."""
+        return self.sweep(everything=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "ttl": self.ttl, "root": self.root}
+
+
+_store: Optional[ArtifactStore] = None
+
+
+def get_store() -> Optional[ArtifactStore]:
+    global _store
+    root = os.environ.get("ARTIFACT_DIR")
+    if not root:
+        return None
+    if _store is None:
+        _store = ArtifactStore(
+            root,
+            ttl=float(os.environ.get("ARTIFACT_TTL", "3600")),
+            sweep_every=float(os.environ.get("ARTIFACT_SWEEP_SECONDS", "60")),
+        )
+    return _store
@@ -1,68 +1,269 @@
-# backend/ats_score.py
-from typing import Dict, Any, List
-import re
-from difflib import SequenceMatcher
-
-def _tokenize(text: str) -> List[str]:
-    if not text:
-        return []
-    text = text.lower()
-    # split on non word
-    toks = re.findall(r"[a-z0-9\+\#\.\-]+", text)
-    return toks
-
-def _unique_keywords(jd: str) -> List[str]:
-    toks = _tokenize(jd)
-    # remove common short words
-    toks = [t for t in toks if len(t) > 2]
-    uniq = []
-    for t in toks:
-        if t not in uniq:
-            uniq.append(t)
-    return uniq
-
-def _semantic_similarity(a: str, b: str) -> float:
-    # simple string similarity via SequenceMatcher
-    if not a or not b:
-        return 0.0
-    return SequenceMatcher(None, a, b).ratio()
-
-def score_resume(parsed: Dict[str, Any], job_description: str) -> Dict[str, Any]:
-    """
-    Very lightweight ATS scoring:
-      - Find JD keywords in parsed['text']
-      - coverage = matched / total
-      - semantic = average similarity between JD and parsed text (coarse)
-      - ats_score is weighted combination
-    """
-    text = ""
-    if isinstance(parsed, dict):
-        text = parsed.get("text", "") or ""
-    else:
-        text = str(parsed or "")
-
-    jd = job_description or ""
-    keywords = _unique_keywords(jd)
-    total_keywords = len(keywords)
-    found = []
-    for kw in keywords:
-        if re.search(r"\b" + re.escape(kw) + r"\b", text, flags=re.I):
-            found.append(kw)
-
-    coverage = (len(found) / total_keywords) if total_keywords > 0 else 0.0
-
-    # semantic: compare JD to the longest block of text in resume (coarse)
-    # simplified: compare full strings
-    semantic = _semantic_similarity(jd, text)
-
-    # ats score: 0..100
-    ats_score = (coverage * 0.6 + semantic * 0.4) * 100
-
-    return {
-        "ats_score": round(float(ats_score), 2),
-        "semantic": round(float(semantic), 3),
-        "coverage": round(float(coverage), 3),
-        "matched_keywords": found,
-        "missing_keywords": [k for k in keywords if k not in found],
-        "total_keywords": total_keywords,
-    }
+# backend/ats_score.py
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Set, Tuple, Union
+import hashlib
+import os
+import re
+
+from backend.cache import LRUCache
+from backend.metrics import stage
+from backend.similarity import get_engine
+from backend.resume_model import build_model, has_index, token_sections
+from backend.skills import get_skill_index
+from backend.utils.constants import STOP_WORDS
+from backend.utils.text_cleanup import stem, tokenize
+
+# ats_score = (coverage * KEYWORD_WEIGHT + semantic * SEMANTIC_WEIGHT) * 100
+KEYWORD_WEIGHT = 0.6
+SEMANTIC_WEIGHT = 0.4
+
+def _keyword_terms(tokens: List[str]) -> Iterator[Tuple[str, str]]:
+    """
+    (term, surface form) for each keyword occurrence in a JD, in order.
+    Taxonomy skills come through as their canonical name ("sklearn" ->
+    "scikit-learn"), however short; other tokens lose sentence punctuation
+    ("python." -> "python"), single characters, numbers shorter than three
+    characters and stop-words, and are stemmed. Two-letter words ("qa",
+    "ux") are kept.
+    """
+    last = 0
+    for i, j, canon in [*get_skill_index().scan(tokens), (len(tokens), len(tokens), None)]:
+        for tok in tokens[last:i]:
+            t = tok.strip(".-")
+            if (len(t) > 2 or len(t) == 2 and t.isalpha()) and t not in STOP_WORDS:
+                yield stem(t), t
+        if canon is not None:
+            yield canon, canon
+        last = j
+
+def _token_variants(tokens: Iterable[str]) -> Set[str]:
+    """
+    Expand raw tokens into the set of forms a keyword may match:
+    the token itself, the token without trailing/leading '.'/'-'
+    ("python." -> "python") and its dotted/hyphenated parts
+    ("scikit-learn" -> "scikit", "learn").
+    """
+    out = set()
+    for t in tokens:
+        out.add(t)
+        s = t.strip(".-")
+        if s != t:
+            out.add(s)
+        if "." in s or "-" in s:
+            out.update(p for p in re.split(r"[.\-]+", s) if p)
+    return out
+
+def _stems(tokens: Iterable[str]) -> Set[str]:
+    return {stem(v) for v in _token_variants(tokens)}
+
+def _terms(tokens: List[str]) -> Set[str]:
+    """
+    Resume terms for matching: canonical skills plus the stems of every
+    token outside a skill alias. One pass over tokens.
+    """
+    skills, rest = get_skill_index().split(tokens)
+    out = _stems(rest)
+    out.update(skills)
+    return out
+
+def resume_terms(tokens: List[str]) -> Set[str]:
+    """The terms a resume's tokens offer for keyword matching (compare with JobProfile.terms)."""
+    return _terms(tokens)
+
+def _semantic_similarity(a: str, b: str) -> float:
+    # term-weighted cosine similarity (see backend/similarity.py)
+    if not a or not b:
+        return 0.0
+    with stage("similarity"):
+        return get_engine().similarity(a, b)
+
+
+def jd_hash(job_description: str) -> str:
+    return hashlib.sha256((job_description or "").encode("utf-8")).hexdigest()
+
+
+class JobProfile:
+    """
+    A job description compiled once: tokenized, skill aliases mapped to
+    canonical names (backend/skills.py), stop-word filtered, stemmed and
+    weighted. Scoring a resume against it is a single tokenize pass over
+    the resume followed by set intersections, so the cost per resume does not
+    grow with keyword count.
+
+      keywords  JD keywords in first-seen order (surface form), one per stem
+      terms     the matching term of each keyword: a stem or canonical skill
+      weights   keyword -> number of times its stem occurs in the JD
+    """
+
+    def __init__(self, job_description: str):
+        self.job_description = job_description or ""
+        self.jd_id = jd_hash(self.job_description)
+        counts: Dict[str, int] = {}
+        surface: Dict[str, str] = {}
+        for term, word in _keyword_terms(tokenize(self.job_description)):
+            surface.setdefault(term, word)
+            counts[term] = counts.get(term, 0) + 1
+        # term per keyword: a stem, or a canonical skill name
+        self._stems = self.terms = list(surface)
+        self._stem_set = frozenset(self._stems)
+        self.keywords = [surface[st] for st in self._stems]
+        self.weights = {surface[st]: counts.get(st, 1) for st in self._stems}
+
+    def match(self, text: str) -> List[str]:
+        return self.match_tokens(tokenize(text))
+
+    def match_tokens(self, tokens: Iterable[str]) -> List[str]:
+        # keep JD order for matched keywords
+        present = self._stem_set & _terms(list(tokens))
+        return [k for k, st in zip(self.keywords, self._stems) if st in present]
+
+    def match_sections(self, model: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Matched keywords grouped by the resume section they appear in.
+        """
+        hits: Dict[str, Set[str]] = {}
+        stems = self._stem_set
+        tokens = model["index"]["tokens"]
+        sections = token_sections(model)
+        skills = {i: (j, canon) for i, j, canon in get_skill_index().scan(tokens)}
+        i, n = 0, len(tokens)
+        while i < n:
+            tok, sec = tokens[i], sections[i]
+            if i in skills:
+                i, canon = skills[i]
+                if canon in stems:
+                    hits.setdefault(sec, set()).add(canon)
+                continue
+            i += 1
+            st = stem(tok)
+            if st in stems:
+                hits.setdefault(sec, set()).add(st)
+            elif "." in tok or "-" in tok:
+                found = stems & _stems((tok,))
+                if found:
+                    hits.setdefault(sec, set()).update(found)
+        return {
+            sec: [k for k, st in zip(self.keywords, self._stems) if st in found]
+            for sec, found in hits.items()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "jd_id": self.jd_id,
+            "keywords": self.keywords,
+            "weights": self.weights,
+            "total_keywords": len(self.keywords),
+        }
+
+
+_profiles = LRUCache(max_items=int(os.environ.get("JD_CACHE_ITEMS", "1024")), sizeof=lambda p: len(p.job_description) * 4)
+
+def compile_profile(job_description: str) -> JobProfile:
+    """
+    Return the cached JobProfile for a JD, compiling it on first use.
+    """
+    jd_id = jd_hash(job_description)
+    profile = _profiles.get(jd_id)
+    if profile is None:
+        profile = JobProfile(job_description)
+        _profiles.set(jd_id, profile)
+    return profile
+
+def get_profile(jd_id: str) -> Optional[JobProfile]:
+    return _profiles.get(jd_id)
+
+def profile_cache_stats() -> Dict[str, Any]:
+    return _profiles.stats()
+
+def _as_profile(job_description: Union[str, JobProfile]) -> JobProfile:
+    if isinstance(job_description, JobProfile):
+        return job_description
+    return compile_profile(job_description)
+
+
+def _resume_text(parsed: Any) -> str:
+    if isinstance(parsed, dict):
+        return parsed.get("text", "") or ""
+    return str(parsed or "")
+
+def _resume_model(parsed: Any, text: str) -> Dict[str, Any]:
+    # reuse the model computed at parse time when the caller has it
+    model = parsed.get("model") if isinstance(parsed, dict) else None
+    return model if has_index(model) else build_model(text)
+
+def _score_with_profile(text: str, profile: JobProfile, semantic: Optional[float] = None,
+                        model: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    keywords = profile.keywords
+    total_keywords = len(keywords)
+    if model is None:
+        model = build_model(text)
+    with stage("keyword_match"):
+        found = profile.match_tokens(model["index"]["tokens"])
+    found_set = set(found)
+
+    coverage = (len(found) / total_keywords) if total_keywords > 0 else 0.0
+    total_weight = sum(profile.weights.values())
+    weighted_coverage = (sum(profile.weights[k] for k in found) / total_weight) if total_weight > 0 else 0.0
+
+    # semantic: similarity between the JD and the full resume text
+    if semantic is None:
+        semantic = _semantic_similarity(profile.job_description, text)
+
+    # ats score: 0..100
+    ats_score = (coverage * KEYWORD_WEIGHT + semantic * SEMANTIC_WEIGHT) * 100
+
+    return {
+        "ats_score": round(float(ats_score), 2),
+        "semantic": round(float(semantic), 3),
+        "coverage": round(float(coverage), 3),
+        "weighted_coverage": round(float(weighted_coverage), 3),
+        "matched_keywords": found,
+        "missing_keywords": [k for k in keywords if k not in found_set],
+        "total_keywords": total_keywords,
+        "section_matches": profile.match_sections(model) if found else {},
+    }
+
+def score_resume(parsed: Dict[str, Any], job_description: Union[str, JobProfile]) -> Dict[str, Any]:
+    """
+    Very lightweight ATS scoring:
+      - Find JD keywords in parsed['text']
+      - coverage = matched / total
+      - semantic = TF-IDF cosine similarity between JD and parsed text
+      - ats_score is weighted combination
+      - weighted_coverage = coverage weighted by keyword frequency in the JD
+      - section_matches = matched keywords per resume section (skills, experience, ...)
+    job_description may be raw text or a compiled JobProfile (see compile_profile).
+    If parsed carries the 'model' built at parse time it is used instead of re-tokenizing.
+    """
+    text = _resume_text(parsed)
+    return _score_with_profile(text, _as_profile(job_description), model=_resume_model(parsed, text))
+
+def score_many(resumes: List[Any], job_description: Union[str, JobProfile], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Score many resumes against one JD (text or JobProfile), compiling it once.
+    Each resume is a parsed dict (with 'text' and optional 'id') or a plain string.
+    Returns results ranked by ats_score (best first), truncated to top_k if given.
+    Every entry carries 'rank', 'index' (position in the input) and 'id' if supplied.
+    """
+    profile = _as_profile(job_description)
+    texts = [_resume_text(p) for p in resumes]
+    # one-vs-many similarity in a single matrix operation
+    if profile.job_description and texts:
+        with stage("similarity"):
+            semantics = get_engine().score(profile.job_description, texts)
+    else:
+        semantics = [0.0] * len(texts)
+    results = []
+    for i, parsed in enumerate(resumes):
+        res = _score_with_profile(texts[i], profile, semantic=float(semantics[i]),
+                                  model=_resume_model(parsed, texts[i]))
+        res["index"] = i
+        if isinstance(parsed, dict) and parsed.get("id") is not None:
+            res["id"] = parsed["id"]
+        results.append(res)
+
+    results.sort(key=lambda r: (-r["ats_score"], r["index"]))
+    if top_k is not None and top_k >= 0:
+        results = results[:top_k]
+    for rank, res in enumerate(results, start=1):
+        res["rank"] = rank
+    return results
@@ -0,0 +1,221 @@
+# backend/cache.py
+"""
+Small caching primitives shared by the API:
+  - LRUCache: in-memory, bounded by item count and approximate bytes, optional TTL
+  - SQLiteTier: on-disk key/value tier that survives restarts
+  - TieredCache: memory in front of an optional disk tier, with counters
+Values stored in the disk tier must be JSON-serialisable.
+"""
+from typing import Any, Callable, Dict, Optional
+from array import array
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _approx_size(value: Any) -> int:
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, array):
+        return value.itemsize * len(value)
+    if isinstance(value, dict):
+        return sum(_approx_size(v) for v in value.values()) + 64
+    if isinstance(value, (list, tuple)):
+        return sum(_approx_size(v) for v in value) + 16
+    return 64
+
+
+class LRUCache:
+    def __init__(self, max_items: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None, sizeof: Callable[[Any], int] = _approx_size):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _count=False) is not None
+
+    def get(self, key: str, default: Any = None, _count: bool = True) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                if _count:
+                    self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            if _count:
+                self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._data[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while len(self._data) > self.max_items or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+                return True
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _drop(self, key: str) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def _json_default(value: Any) -> Any:
+    # resume model offsets are an array('I')
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class SQLiteTier:
+    def __init__(self, path: str, table: str = "cache", ttl: Optional[float] = None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and time.time() - row[1] > self.ttl:
+            self.delete(key)
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        payload = json.dumps(value, default=_json_default)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, payload, time.time()),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+        return cur.rowcount > 0
+
+    def clear(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+        return cur.rowcount
+
+    def purge_expired(self) -> int:
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM {self.table} WHERE stored_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """
+    Memory LRU in front of an optional SQLiteTier. Disk hits are promoted
+    back into memory.
+    """
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteTier] = None):
+        self.memory = memory
+        self.disk = disk
+        self.disk_hits = 0
+
+    def get(self, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def delete(self, key: str) -> bool:
+        removed = self.memory.delete(key)
+        if self.disk is not None:
+            removed = self.disk.delete(key) or removed
+        return removed
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        s = self.memory.stats()
+        s["disk_enabled"] = self.disk is not None
+        s["disk_hits"] = self.disk_hits
+        if self.disk is not None:
+            s["disk_items"] = len(self.disk)
+        return s
@@ -0,0 +1,72 @@
+# backend/compression.py
+"""
+gzip-compressed request bodies.
+
+Responses are compressed by Starlette's GZipMiddleware (see main.py). This
+is the other direction: a client may send a JSON body with
+"Content-Encoding: gzip" (the Streamlit client does so for large payloads
+such as the enhanced resume it posts to /generate/*). The body is
+decompressed before it reaches the route, so endpoints see plain JSON.
+Decompressed bodies over max_bytes are rejected with 413 and corrupt ones
+with 400, before any route code runs.
+"""
+import json
+import zlib
+
+
+async def _reply(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+class GzipRequestMiddleware:
+    """Pure ASGI middleware decoding gzip request bodies (buffered, at most max_bytes)."""
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = next((v for k, v in scope.get("headers", []) if k == b"content-encoding"), None)
+        if encoding is None or encoding.strip().lower() != b"gzip":
+            return await self.app(scope, receive, send)
+
+        inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks, size, more = [], 0, True
+        try:
+            while more:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                more = message.get("more_body", False)
+                # bounded: a small compressed body cannot expand past the limit
+                out = inflate.decompress(message.get("body", b""), self.max_bytes + 1 - size)
+                size += len(out)
+                if size > self.max_bytes:
+                    return await _reply(send, 413, f"decompressed request body exceeds {self.max_bytes} bytes")
+                chunks.append(out)
+            if not inflate.eof:
+                raise zlib.error("truncated gzip stream")
+        except zlib.error as e:
+            return await _reply(send, 400, f"invalid gzip request body: {e}")
+
+        body = b"".join(chunks)
+        headers = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode()))
+        delivered = False
+
+        async def _receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        # in place: the router records the matched route on this scope, and the
+        # metrics middleware outside reads it from there
+        scope["headers"] = headers
+        await self.app(scope, _receive, send)
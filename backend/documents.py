@@ -0,0 +1,119 @@
+# backend/documents.py
+"""
+Content-addressed document store in front of parse_pdf_bytes.
+
+Uploads are keyed by the SHA-256 of their bytes, so re-uploading the same
+file returns the cached parse (text plus its resume model) and the same doc_id. Clients can pass the
+doc_id to /score and /enhance instead of re-sending the text.
+
+Configuration (environment):
+  PARSE_CACHE_ITEMS   max documents kept in memory (default 512)
+  PARSE_CACHE_BYTES   max approximate bytes kept in memory (default 128MB)
+  PARSE_CACHE_TTL     seconds before an entry expires (default: no expiry)
+  PARSE_CACHE_DB      path of an SQLite file for the on-disk tier (default: disabled)
+"""
+from typing import Any, Dict, Iterator, Optional, Tuple
+import os
+
+from backend.cache import LRUCache, SQLiteTier, TieredCache, content_hash
+from backend.metrics import stage
+from backend.parser import iter_pdf_pages, parse_pdf_bytes, sniff_format
+from backend.resume_model import build_model
+from backend.search import index_document
+
+
+def _env_float(name: str) -> Optional[float]:
+    v = os.environ.get(name)
+    return float(v) if v else None
+
+
+def _build_cache() -> TieredCache:
+    ttl = _env_float("PARSE_CACHE_TTL")
+    memory = LRUCache(
+        max_items=int(os.environ.get("PARSE_CACHE_ITEMS", "512")),
+        max_bytes=int(os.environ.get("PARSE_CACHE_BYTES", str(128 * 1024 * 1024))),
+        ttl=ttl,
+    )
+    db = os.environ.get("PARSE_CACHE_DB")
+    disk = SQLiteTier(db, table="documents", ttl=ttl) if db else None
+    return TieredCache(memory, disk)
+
+
+_cache = _build_cache()
+
+
+def find_document(contents: bytes, doc_id: Optional[str] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Hash an upload (unless doc_id is already known) and look it up.
+    Returns (doc_id, cached doc or None).
+    """
+    doc_id = doc_id or content_hash(contents)
+    doc = _cache.get(doc_id)
+    if doc is not None:
+        doc = dict(doc, doc_id=doc_id, cached=True)
+    return doc_id, doc
+
+
+def parse_upload(contents: bytes, filename: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse an upload and build its resume model. Runs in the parse pool.
+    """
+    with stage("parse"):
+        text = parse_pdf_bytes(contents, filename=filename)
+        return {"text": text, "model": build_model(text)}
+
+
+def stream_upload(contents: bytes, filename: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    parse_upload() step by step, for the parse pool's stream(): ("page", text)
+    for each PDF page as it is extracted, then ("parsed", {"text", "model", "pages"}).
+    Other formats yield only the final record.
+    """
+    pages = []
+    with stage("parse"):
+        if sniff_format(contents) == "pdf":
+            for text in iter_pdf_pages(contents):
+                pages.append(text)
+                yield "page", text
+            text = "\n".join(p for p in pages if p).strip()
+        else:
+            text = parse_pdf_bytes(contents, filename=filename)
+        yield "parsed", {"text": text, "model": build_model(text), "pages": len(pages)}
+
+
+def store_document(doc_id: str, text: str, filename: Optional[str] = None,
+                   model: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Cache a parsed document with its resume model (built here if not given)
+    and add it to the recruiter search index when SEARCH_DB is set.
+    """
+    doc = {"text": text, "filename": filename, "model": model if model is not None else build_model(text)}
+    _cache.set(doc_id, doc)
+    index_document(doc_id, text, filename, doc["model"])
+    return dict(doc, doc_id=doc_id, cached=False)
+
+
+def parse_document(contents: bytes, filename: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse an upload through the cache. Returns {"doc_id", "text", "model", "cached"}.
+    """
+    doc_id, doc = find_document(contents)
+    if doc is not None:
+        return doc
+    parsed = parse_upload(contents, filename)
+    return store_document(doc_id, parsed["text"], filename, parsed["model"])
+
+
+def get_document(doc_id: str) -> Optional[Dict[str, Any]]:
+    doc = _cache.get(doc_id)
+    if doc is None:
+        return None
+    return dict(doc, doc_id=doc_id)
+
+
+def forget_document(doc_id: str) -> bool:
+    return _cache.delete(doc_id)
+
+
+def cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
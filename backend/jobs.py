@@ -0,0 +1,538 @@
+# backend/jobs.py
+"""
+Bulk screening jobs: a ZIP of resumes (or a list of cached doc_ids) scored
+against one JD in the background.
+
+Jobs and their items live in a local SQLite database, so progress is
+checkpointed as items finish and a restarted server picks up unfinished
+jobs where they stopped (items still pending are re-run; finished ones are
+kept). Uploaded ZIPs are kept next to the database until the job is deleted.
+A single runner thread per process claims queued jobs one at a time and
+fans their items out to a process pool. When several API workers share
+JOB_DIR, only one of them runs jobs (backend/serve.py sets JOB_RUNNER=0 in
+the others); the rest accept, report and cancel them.
+
+Worker processes get the same limits as the parse pool (backend/workers.py):
+an item that runs past JOB_ITEM_TIMEOUT or needs more than JOB_MAX_MB of
+address space is marked failed and the job moves on. The timeout is a
+SIGALRM in the worker, so it interrupts Python code (pdfplumber) but not a
+single long C call. If a worker process dies outright, the items it had in
+flight fail and the pool is rebuilt for the rest. Inline mode (JOB_WORKERS=0)
+applies neither limit.
+
+Configuration (environment):
+  JOB_DIR        directory for the job database and uploaded ZIPs
+                 (default: <tmp>/airezume_jobs)
+  JOB_WORKERS    worker processes per job; 0 runs items inline (default 2)
+  JOB_RUNNER     0 to leave queued jobs to another process (default 1)
+  JOB_MAX_BYTES  max size of an uploaded ZIP (default 512MB)
+  JOB_MAX_FILES  max resumes per job (default 10000)
+  JOB_ITEM_TIMEOUT  seconds per resume (default: POOL_PARSE_TIMEOUT, else 60)
+  JOB_MAX_MB     address-space limit per worker process, in MB
+                 (default: POOL_PARSE_MAX_MB, else none)
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import json
+import os
+import signal
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+
+from backend.ats_score import compile_profile, score_resume
+from backend.cache import content_hash
+from backend.documents import get_document, parse_upload, store_document
+from backend.metrics import capture_call, log, merge_capture
+from backend.parser import MAX_BYTES
+from backend.workers import init_pool_process
+
+JOB_MAX_BYTES = int(os.environ.get("JOB_MAX_BYTES", str(512 * 1024 * 1024)))
+JOB_MAX_FILES = int(os.environ.get("JOB_MAX_FILES", "10000"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    job_description TEXT NOT NULL,
+    zip_path TEXT,
+    total INTEGER NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    doc_id TEXT,
+    status TEXT NOT NULL,
+    score REAL,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS job_items_status ON job_items (job_id, status);
+CREATE INDEX IF NOT EXISTS job_items_score ON job_items (job_id, score DESC);
+"""
+
+# job states: queued -> running -> done | failed | cancelled
+ACTIVE = ("queued", "running")
+
+
+class JobError(ValueError):
+    pass
+
+
+class ItemTimeout(Exception):
+    pass
+
+
+def _timed_call(timeout: float, fn, args):
+    """Pool job: capture_call(fn, args), interrupted with ItemTimeout after `timeout` seconds."""
+    if not timeout or not hasattr(signal, "setitimer"):
+        return capture_call(fn, args)
+
+    message = f"item exceeded {timeout:g}s"
+    fired = []
+
+    def expired(signum, frame):
+        fired.append(signum)
+        raise ItemTimeout(message)
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        out = capture_call(fn, args)
+    except Exception:
+        # the parser wraps whatever pdfplumber raised; a timeout still reads as one
+        if fired:
+            raise ItemTimeout(message) from None
+        raise
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+    if fired:
+        raise ItemTimeout(message)
+    return out
+
+
+def zip_members(path: str) -> List[str]:
+    """Resume files inside a ZIP, in archive order (directories and macOS metadata skipped)."""
+    with zipfile.ZipFile(path) as zf:
+        names = []
+        for info in zf.infolist():
+            name = info.filename
+            base = os.path.basename(name)
+            if info.is_dir() or name.startswith("__MACOSX/") or not base or base.startswith("."):
+                continue
+            names.append(name)
+    return names
+
+
+def screen_item(name: str, data: Optional[bytes], doc: Optional[Dict[str, Any]], jd: str) -> Dict[str, Any]:
+    """
+    Parse (unless an already parsed doc is given) and score one resume.
+    Runs in the job pool; the JD profile is compiled once per worker process.
+    """
+    if doc is None:
+        doc = parse_upload(data, name)
+    result = score_resume(doc, compile_profile(jd))
+    return {"text": doc["text"], "model": doc["model"], "result": result}
+
+
+class JobStore:
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "jobs.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def zip_path(self, job_id: str) -> str:
+        return os.path.join(self.root, f"{job_id}.zip")
+
+    def new_job_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def create(self, job_id: str, job_description: str, names: List[str],
+               doc_ids: Optional[List[Optional[str]]] = None, zip_path: Optional[str] = None) -> Dict[str, Any]:
+        if not names:
+            raise JobError("no resumes to screen")
+        if len(names) > JOB_MAX_FILES:
+            raise JobError(f"job has {len(names)} resumes, limit is {JOB_MAX_FILES}")
+        doc_ids = doc_ids or [None] * len(names)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, status, job_description, zip_path, total, created) VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, job_description, zip_path, len(names), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_items (job_id, idx, name, doc_id, status) VALUES (?, ?, ?, ?, 'pending')",
+                [(job_id, i, n, d) for i, (n, d) in enumerate(zip(names, doc_ids))],
+            )
+            self._conn.commit()
+        return self.progress(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+            row = cur.fetchone()
+            cols = [c[0] for c in cur.description]
+        return dict(zip(cols, row)) if row else None
+
+    def progress(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        done, failed = counts.get("done", 0), counts.get("failed", 0)
+        finished = done + failed
+        out = {
+            "job_id": job_id,
+            "status": job["status"],
+            "total": job["total"],
+            "done": done,
+            "failed": failed,
+            "pending": counts.get("pending", 0),
+            "progress": round(finished / job["total"], 4) if job["total"] else 1.0,
+            "created": job["created"],
+            "started": job["started"],
+            "finished": job["finished"],
+            "error": job["error"],
+        }
+        if job["started"] and finished:
+            elapsed = (job["finished"] or time.time()) - job["started"]
+            rate = finished / elapsed * 60 if elapsed > 0 else None
+            out["resumes_per_minute"] = round(rate, 1) if rate else None
+            if rate and job["status"] == "running":
+                out["eta_seconds"] = round(out["pending"] / rate * 60, 1)
+        return out
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            if status == "running":
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started = COALESCE(started, ?) WHERE job_id = ?", (status, now, job_id)
+                )
+            else:
+                # a job cancelled while its last items ran stays cancelled
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished = ?, error = ? WHERE job_id = ? AND status = 'running'",
+                    (status, now, error, job_id),
+                )
+            self._conn.commit()
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """Mark a queued or running job failed (it will not be picked up again)."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', finished = ?, error = ? WHERE job_id = ? AND status IN (?, ?)",
+                (time.time(), error, job_id) + ACTIVE,
+            )
+            self._conn.commit()
+        return cur.rowcount > 0
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished = ? WHERE job_id = ? AND status IN (?, ?)",
+                (time.time(), job_id) + ACTIVE,
+            )
+            self._conn.commit()
+        return cur.rowcount > 0
+
+    def delete(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None:
+            return False
+        with self._lock:
+            self._conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+        if job["zip_path"]:
+            try:
+                os.remove(job["zip_path"])
+            except OSError:
+                pass
+        return True
+
+    def requeue_interrupted(self) -> int:
+        """Put jobs left 'running' by a previous process back in the queue."""
+        with self._lock:
+            cur = self._conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+            self._conn.commit()
+        return cur.rowcount
+
+    def next_job(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def pending_items(self, job_id: str) -> List[Tuple[int, str, Optional[str]]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT idx, name, doc_id FROM job_items WHERE job_id = ? AND status = 'pending' ORDER BY idx", (job_id,)
+            ).fetchall()
+
+    def finish_items(self, job_id: str, rows: List[Tuple[int, Optional[str], Optional[Dict[str, Any]], Optional[str]]]) -> None:
+        """Checkpoint finished items: (idx, doc_id, result or None, error or None)."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE job_items SET status = ?, doc_id = COALESCE(?, doc_id), score = ?, result = ?, error = ? "
+                "WHERE job_id = ? AND idx = ?",
+                [
+                    ("failed" if error else "done", doc_id,
+                     result["ats_score"] if result else None,
+                     json.dumps(result) if result else None,
+                     error, job_id, idx)
+                    for idx, doc_id, result, error in rows
+                ],
+            )
+            self._conn.commit()
+
+    def results(self, job_id: str, top_k: Optional[int] = None, include_failed: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Finished items ranked by ats_score (best first), then failed items.
+        Rows are read in pages so large jobs stream without loading every result.
+        """
+        where = "status IN ('done', 'failed')" if include_failed else "status = 'done'"
+        sql = (f"SELECT idx, name, doc_id, status, score, result, error FROM job_items "
+               f"WHERE job_id = ? AND {where} ORDER BY status = 'done' DESC, score DESC, idx LIMIT ? OFFSET ?")
+        limit = top_k if top_k is not None else -1
+        offset, rank, page = 0, 0, 500
+        while limit < 0 or rank < limit:
+            n = page if limit < 0 else min(page, limit - rank)
+            with self._lock:
+                rows = self._conn.execute(sql, (job_id, n, offset)).fetchall()
+            if not rows:
+                return
+            for idx, name, doc_id, status, score, result, error in rows:
+                rank += 1
+                item = {"rank": rank if status == "done" else None, "index": idx, "name": name,
+                        "doc_id": doc_id, "status": status}
+                if result:
+                    item.update(json.loads(result))
+                if error:
+                    item["error"] = error
+                yield item
+            offset += len(rows)
+
+
+class JobRunner:
+    """
+    Background thread that runs queued jobs, keeping up to 2 x workers
+    items in flight and checkpointing results as they complete.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 2, poll: float = 0.5,
+                 item_timeout: Optional[float] = None, max_mb: Optional[int] = None):
+        self.store = store
+        self.workers = max(0, workers)
+        self.poll = poll
+        self.item_timeout = item_timeout
+        self.max_mb = max_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.store.requeue_interrupted()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="job-runner", daemon=True)
+        self._thread.start()
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            job = None
+            try:
+                job = self.store.next_job()
+                if job is not None:
+                    self.run_job(job["job_id"])
+                    continue
+            except Exception as e:
+                # one bad job (or a database hiccup) must not stop the runner
+                log.exception("job runner error")
+                if job is not None:
+                    self._fail(job["job_id"], e)
+            self._wake.wait(self.poll)
+            self._wake.clear()
+
+    def _fail(self, job_id: str, e: Exception) -> None:
+        try:
+            self.store.fail(job_id, str(e) or type(e).__name__)
+        except Exception:
+            log.exception("could not mark job %s failed", job_id)
+
+    def _submit(self, fn, *args):
+        if self.workers == 0:
+            return None, fn(*args)
+        if self._executor is None:
+            # marked as a pool process: items parse serially, the job pool is the parallelism
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_pool_process,
+                                                 initargs=((self.max_mb or 0) * 1024 * 1024,))
+        try:
+            return self._executor.submit(_timed_call, self.item_timeout or 0, fn, args), None
+        except BrokenProcessPool:
+            self._reset()
+            return self._submit(fn, *args)
+
+    def _reset(self) -> None:
+        # a worker process died: futures still on the broken pool fail, later items get a new pool
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _item_error(self, e: BaseException) -> str:
+        if isinstance(e, MemoryError):
+            return f"item exceeded the {self.max_mb}MB worker memory limit"
+        if isinstance(e, BrokenProcessPool):
+            self._reset()
+            return "worker process died"
+        return str(e) or type(e).__name__
+
+    def run_job(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if job is None or job["status"] not in ACTIVE:
+            return
+        self.store.set_status(job_id, "running")
+        jd = job["job_description"]
+        zf = None
+        try:
+            # a missing or corrupt upload (say, of a job requeued after a restart) fails the job
+            zf = zipfile.ZipFile(job["zip_path"]) if job["zip_path"] else None
+            items = iter(self.store.pending_items(job_id))
+            inflight: Dict[Any, Tuple[int, Optional[str], str]] = {}
+            window = max(1, self.workers) * 2
+            exhausted = False
+            while True:
+                finished = []
+                # keep the pool fed
+                while not exhausted and len(inflight) < window:
+                    item = next(items, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    idx, name, doc_id = item
+                    try:
+                        args, doc_id = self._item_args(zf, name, doc_id, jd)
+                        fut, result = self._submit(screen_item, *args)
+                    except Exception as e:
+                        finished.append((idx, doc_id, None, self._item_error(e)))
+                        continue
+                    if fut is None:
+                        finished.append(self._complete(idx, doc_id, name, result))
+                    else:
+                        inflight[fut] = (idx, doc_id, name)
+                if inflight:
+                    done, _ = wait(list(inflight), timeout=self.poll, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        idx, doc_id, name = inflight.pop(fut)
+                        try:
+                            finished.append(self._complete(idx, doc_id, name, merge_capture(fut.result())))
+                        except Exception as e:
+                            finished.append((idx, doc_id, None, self._item_error(e)))
+                if finished:
+                    self.store.finish_items(job_id, finished)
+                if exhausted and not inflight:
+                    break
+                current = self.store.get(job_id)
+                if self._stop.is_set() or current is None or current["status"] != "running":
+                    # shutdown or cancel: unfinished items stay pending
+                    for fut in inflight:
+                        fut.cancel()
+                    return
+            self.store.set_status(job_id, "done")
+        except Exception as e:
+            self.store.set_status(job_id, "failed", error=str(e) or type(e).__name__)
+        finally:
+            if zf is not None:
+                zf.close()
+
+    def _item_args(self, zf: Optional[zipfile.ZipFile], name: str, doc_id: Optional[str], jd: str):
+        """Arguments for screen_item, reusing the parse cache when the document is already known."""
+        if zf is None:
+            doc = get_document(doc_id) if doc_id else None
+            if doc is None:
+                raise JobError(f"unknown doc_id: {doc_id}")
+            return (name, None, {"text": doc["text"], "model": doc["model"]}, jd), doc_id
+        info = zf.getinfo(name)
+        if info.file_size > MAX_BYTES:
+            raise JobError(f"file exceeds {MAX_BYTES} bytes")
+        data = zf.read(info)
+        doc_id = content_hash(data)
+        doc = get_document(doc_id)
+        if doc is not None:
+            return (name, None, {"text": doc["text"], "model": doc["model"]}, jd), doc_id
+        return (name, data, None, jd), doc_id
+
+    def _complete(self, idx: int, doc_id: Optional[str], name: str, out: Dict[str, Any]):
+        if doc_id and get_document(doc_id) is None:
+            store_document(doc_id, out["text"], os.path.basename(name), out["model"])
+        return idx, doc_id, out["result"], None
+
+
+_store: Optional[JobStore] = None
+_runner: Optional[JobRunner] = None
+
+
+def get_job_store() -> JobStore:
+    global _store
+    if _store is None:
+        root = os.environ.get("JOB_DIR") or os.path.join(tempfile.gettempdir(), "airezume_jobs")
+        _store = JobStore(root)
+    return _store
+
+
+def start_job_runner() -> Optional[JobRunner]:
+    global _runner
+    if os.environ.get("JOB_RUNNER", "1") == "0":
+        return None
+    if _runner is None:
+        timeout = os.environ.get("JOB_ITEM_TIMEOUT") or os.environ.get("POOL_PARSE_TIMEOUT") or "60"
+        max_mb = os.environ.get("JOB_MAX_MB") or os.environ.get("POOL_PARSE_MAX_MB")
+        _runner = JobRunner(get_job_store(), workers=int(os.environ.get("JOB_WORKERS", "2")),
+                            item_timeout=float(timeout), max_mb=int(max_mb) if max_mb else None)
+        _runner.start()
+    return _runner
+
+
+def notify_job_runner() -> None:
+    if _runner is not None:
+        _runner.notify()
+
+
+def stop_job_runner(wait: bool = True) -> None:
+    global _runner
+    if _runner is not None:
+        _runner.stop(wait=wait)
+        _runner = None
@@ -0,0 +1,304 @@
+# backend/llm.py
+"""
+Async LLM enhancement backend.
+
+Renders the templates in prompts/, rewrites resume bullets and the summary
+and asks for the skills matching the JD concurrently (bounded by a
+semaphore), coalesces prompts from concurrent requests into micro-batches
+sent over a pooled HTTP client, and caches answers by (input, JD hash,
+prompt version). Malformed answers fall back to the rule-based output and
+are not cached, so the next request asks again.
+
+The HTTP protocol is the OpenAI-compatible completions call
+(POST {LLM_URL}/v1/completions with "prompt" as a list), which vLLM,
+llama.cpp and backend/llm_stub.py all serve.
+
+Configuration (environment):
+  LLM_BACKEND        "none" (rule-based only, default) or "http"
+  LLM_URL            base URL of the completions server (default http://127.0.0.1:9000)
+  LLM_MODEL          model name sent with each request (default "resume-rewriter")
+  LLM_API_KEY        bearer token, if the server needs one
+  LLM_CONCURRENCY    max bullet rewrites in flight per request (default 8)
+  LLM_BATCH_SIZE     max prompts per upstream call (default 16)
+  LLM_BATCH_WAIT_MS  how long to wait for a batch to fill (default 10)
+  LLM_TIMEOUT        seconds per upstream call (default 60)
+  LLM_CACHE_ITEMS    cached rewrites (default 4096)
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from backend.ats_score import jd_hash
+from backend.cache import LRUCache
+from backend.enhancer import ensemble_enhance
+from backend.skills import get_skill_index
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> Tuple[str, str]:
+    """
+    Return (template, version) for prompts/<name>.txt; version is a short content hash.
+    """
+    with open(os.path.join(PROMPTS_DIR, f"{name}.txt"), encoding="utf-8") as f:
+        template = f.read().replace("\r\n", "\n").strip()
+    return template, hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+def render_prompt(template: str, **fields: str) -> str:
+    """
+    Templates are plain instructions (they contain literal JSON braces), so
+    inputs are appended as labelled blocks rather than formatted in.
+    """
+    blocks = [template]
+    for label, value in fields.items():
+        blocks.append(f"{label.replace('_', ' ').title()}:\n{value}")
+    return "\n\n".join(blocks)
+
+
+def _parse_json(output: str) -> Dict[str, Any]:
+    start, end = output.find("{"), output.rfind("}")
+    if start < 0 or end <= start:
+        return {}
+    try:
+        data = json.loads(output[start:end + 1])
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class CompletionClient:
+    """Pooled async client for an OpenAI-compatible /v1/completions endpoint."""
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None,
+                 timeout: float = 60.0, max_connections: int = 16):
+        # only needed with LLM_BACKEND=http, so not imported at module load
+        import httpx
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.model = model
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def complete(self, prompts: List[str], max_tokens: int = 256) -> List[str]:
+        r = await self._client.post(
+            "/v1/completions",
+            json={"model": self.model, "prompt": prompts, "max_tokens": max_tokens, "temperature": 0},
+        )
+        r.raise_for_status()
+        outputs = [""] * len(prompts)
+        for choice in r.json().get("choices", []):
+            outputs[choice.get("index", 0)] = choice.get("text", "")
+        return outputs
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class MicroBatcher:
+    """
+    Collects single prompts from concurrent callers and sends them upstream
+    together: a batch goes out when it reaches max_batch prompts or when the
+    oldest prompt has waited max_wait seconds.
+    """
+
+    def __init__(self, client: CompletionClient, max_batch: int = 16, max_wait: float = 0.01):
+        self.client = client
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        # in-flight sends; the loop only keeps weak references to tasks
+        self._sending: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.prompts = 0
+
+    async def submit(self, prompt: str) -> str:
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((prompt, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_later())
+        return await fut
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        self._flusher = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            task = asyncio.create_task(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.prompts += len(batch)
+        try:
+            outputs = await self.client.complete([p for p, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), out in zip(batch, outputs):
+            if not fut.done():
+                fut.set_result(out)
+
+
+class LLMEnhancer:
+    """
+    Rule-based enhancement (ensemble_enhance) refined by LLM rewrites of the
+    summary and each bullet, with the skills the LLM finds matching the JD
+    added to the parsed ones. Failed rewrites keep the original text.
+    """
+
+    def __init__(self, client: CompletionClient, concurrency: int = 8, max_batch: int = 16,
+                 max_wait: float = 0.01, cache_items: int = 4096):
+        self.client = client
+        self.batcher = MicroBatcher(client, max_batch=max_batch, max_wait=max_wait)
+        self.concurrency = concurrency
+        self.cache = LRUCache(max_items=cache_items)
+
+    async def _ask(self, kind: str, template: str, text: str, jd: str, sem: asyncio.Semaphore) -> Dict[str, Any]:
+        """The parsed JSON answer to one prompt; {} if the call fails or the output is not JSON."""
+        async with sem:
+            try:
+                out = await self.batcher.submit(render_prompt(template, job_description=jd, **{kind: text}))
+            except Exception:
+                return {}
+        return _parse_json(out)
+
+    @staticmethod
+    def _key(kind: str, version: str, text: str, jd: str) -> str:
+        return hashlib.sha256(f"{kind}\0{text}\0{jd_hash(jd)}\0{version}".encode("utf-8")).hexdigest()
+
+    async def _rewrite(self, kind: str, template: str, version: str, text: str, jd: str,
+                       sem: asyncio.Semaphore) -> str:
+        key = self._key(kind, version, text, jd)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        data = await self._ask(kind, template, text, jd, sem)
+        result = data.get("rewritten") or data.get("summary")
+        if not isinstance(result, str) or not result.strip():
+            return text
+        result = result.strip()
+        self.cache.set(key, result)
+        return result
+
+    async def _skills(self, text: str, jd: str, sem: asyncio.Semaphore) -> List[str]:
+        """Skills the LLM finds in the resume matching the JD, canonical where the taxonomy knows them."""
+        template, version = load_prompt("skills_prompt")
+        key = self._key("skills", version, text, jd)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        data = await self._ask("resume", template, text, jd, sem)
+        found = data.get("matched_skills")
+        if not isinstance(found, list):
+            return []
+        index = get_skill_index()
+        skills: List[str] = []
+        for s in found:
+            if isinstance(s, str) and s.strip():
+                s = index.lookup(s) or s.strip()
+                if s not in skills:
+                    skills.append(s)
+        self.cache.set(key, skills)
+        return skills
+
+    async def enhance(self, text: str, job_description: str, prompt: Optional[str] = None,
+                      model: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        base = ensemble_enhance(text, job_description, prompt=prompt, model=model)
+        jd = job_description or ""
+        if prompt:
+            bullet_t, bullet_v = prompt, hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        else:
+            bullet_t, bullet_v = load_prompt("rewrite_bullet")
+        summary_t, summary_v = load_prompt("summary_prompt")
+        sem = asyncio.Semaphore(self.concurrency)
+
+        # the "Target role" bullet added by the rule-based pass is kept verbatim
+        lead = base["bullets"][:1] if jd else []
+        rest = base["bullets"][len(lead):]
+        tasks = [self._rewrite("bullet", bullet_t, bullet_v, b, jd, sem) for b in rest]
+        if base["summary"]:
+            tasks.append(self._rewrite("summary", summary_t, summary_v, base["summary"], jd, sem))
+        if jd and text:
+            tasks.append(self._skills(text, jd, sem))
+        results = await asyncio.gather(*tasks)
+
+        bullets = lead + list(results[:len(rest)])
+        summary = results[len(rest)] if base["summary"] else base["summary"]
+        skills = list(base["skills"])
+        if jd and text:
+            seen = {s.lower() for s in skills}
+            skills += [s for s in results[-1] if s.lower() not in seen]
+        name = base["name"]
+        base.update(
+            summary=summary,
+            bullets=bullets,
+            skills=skills,
+            text=f"{name}\n\n{summary}\n\n" + "\n".join(f"- {b}" for b in bullets),
+            metadata={"source_enhancer": "llm-v1", "model": self.client.model,
+                      "prompt_version": bullet_v},
+        )
+        return base
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batches": self.batcher.batches, "prompts": self.batcher.prompts, "cache": self.cache.stats()}
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_enhancer: Optional[LLMEnhancer] = None
+
+
+def get_llm_enhancer() -> Optional[LLMEnhancer]:
+    """
+    The shared LLMEnhancer, or None when LLM_BACKEND is not "http".
+    Must be called from the running event loop.
+    """
+    global _enhancer
+    if os.environ.get("LLM_BACKEND", "none") != "http":
+        return None
+    if _enhancer is None:
+        concurrency = int(os.environ.get("LLM_CONCURRENCY", "8"))
+        client = CompletionClient(
+            os.environ.get("LLM_URL", "http://127.0.0.1:9000"),
+            os.environ.get("LLM_MODEL", "resume-rewriter"),
+            api_key=os.environ.get("LLM_API_KEY"),
+            timeout=float(os.environ.get("LLM_TIMEOUT", "60")),
+            max_connections=concurrency * 2,
+        )
+        _enhancer = LLMEnhancer(
+            client,
+            concurrency=concurrency,
+            max_batch=int(os.environ.get("LLM_BATCH_SIZE", "16")),
+            max_wait=float(os.environ.get("LLM_BATCH_WAIT_MS", "10")) / 1000,
+            cache_items=int(os.environ.get("LLM_CACHE_ITEMS", "4096")),
+        )
+    return _enhancer
+
+
+async def close_llm_enhancer() -> None:
+    global _enhancer
+    if _enhancer is not None:
+        await _enhancer.aclose()
+        _enhancer = None
@@ -0,0 +1,83 @@
+# backend/llm_stub.py
+"""
+Local stand-in for an LLM completions server, for tests and offline
+throughput / tail-latency measurements of backend/llm.py.
+
+Serves POST /v1/completions (OpenAI-compatible, "prompt" may be a list)
+and answers deterministically with the JSON shape the prompts/ templates
+ask for. Simulated model latency per call is
+    LLM_STUB_LATENCY_MS + LLM_STUB_PER_PROMPT_MS * len(prompts)
+so batching pays off the way it does on a real inference server.
+
+    uvicorn backend.llm_stub:app --port 9000
+"""
+from typing import Any, Dict, List, Union
+import asyncio
+import json
+import os
+import re
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from backend.skills import get_skill_index
+from backend.utils.text_cleanup import tokenize
+
+app = FastAPI(title="Resume Optimizer LLM stub", version="0.1.0")
+
+LATENCY_MS = float(os.environ.get("LLM_STUB_LATENCY_MS", "50"))
+PER_PROMPT_MS = float(os.environ.get("LLM_STUB_PER_PROMPT_MS", "2"))
+_stats = {"calls": 0, "prompts": 0}
+
+_PRONOUNS = re.compile(r"\b(i|my|me|we|our)\b\s*", re.I)
+
+
+class CompletionRequest(BaseModel):
+    model: str = "stub"
+    prompt: Union[str, List[str]]
+    max_tokens: int = 256
+    temperature: float = 0.0
+
+
+def _block(prompt: str, label: str) -> str:
+    m = re.search(rf"(?:^|\n){label}:\n(.*?)(?:\n\n[A-Z][\w ]*:\n|\Z)", prompt, re.S)
+    return m.group(1).strip() if m else ""
+
+
+def _answer(prompt: str) -> str:
+    jd = _block(prompt, "Job Description")
+    bullet = _block(prompt, "Bullet")
+    if bullet:
+        text = _PRONOUNS.sub("", bullet).strip()
+        text = (text[:1].upper() + text[1:])[:140]
+        return json.dumps({"rewritten": text, "added_keywords": [], "impact_score": 0.5})
+    summary = _block(prompt, "Summary")
+    if summary:
+        lead = f"Candidate targeting: {jd.splitlines()[0][:80]}. " if jd else ""
+        return json.dumps({"summary": (lead + _PRONOUNS.sub("", summary).strip())[:400], "added_keywords": []})
+    resume = _block(prompt, "Resume")
+    if resume:
+        index = get_skill_index()
+        have = index.split(tokenize(resume))[0]
+        want = dict.fromkeys(index.split(tokenize(jd))[0])
+        return json.dumps({"matched_skills": [s for s in want if s in have],
+                           "missing_skills": [s for s in want if s not in have]})
+    return "{}"
+
+
+@app.post("/v1/completions")
+async def completions(req: CompletionRequest) -> Dict[str, Any]:
+    prompts = [req.prompt] if isinstance(req.prompt, str) else req.prompt
+    _stats["calls"] += 1
+    _stats["prompts"] += len(prompts)
+    await asyncio.sleep((LATENCY_MS + PER_PROMPT_MS * len(prompts)) / 1000)
+    return {
+        "object": "text_completion",
+        "model": req.model,
+        "choices": [{"index": i, "text": _answer(p), "finish_reason": "stop"} for i, p in enumerate(prompts)],
+    }
+
+
+@app.get("/stats")
+def stats():
+    return _stats
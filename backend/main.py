@@ -1,114 +1,1102 @@
-# backend/main.py
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Any, Dict
-import os
-import shutil
-
-from backend.parser import parse_pdf_bytes
-from backend.ats_score import score_resume as local_ats_score
-from backend.enhancer import ensemble_enhance
-from backend.template_engine import generate_docx, generate_pdf_from_text
-
-app = FastAPI(title="Resume Optimizer API", version="0.1.0")
-
-# Allow CORS from Streamlit (usually localhost)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:8501", "http://127.0.0.1:8501", "*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-class ScoreRequest(BaseModel):
-    parsed: Dict[str, Any]
-    job_description: str
-
-
-class EnhanceRequest(BaseModel):
-    parsed: Dict[str, Any]
-    job_description: str
-    # optional prompt override
-    prompt: str = None
-
-
-class GenerateRequest(BaseModel):
-    data: Dict[str, Any]
-
-
-@app.post("/parse")
-async def parse_resume(file: UploadFile = File(...)):
-    """
-    Accepts a PDF or DOCX upload. Returns extracted text in JSON {"source":"local","text": "..."}
-    """
-    try:
-        contents = await file.read()
-        text = parse_pdf_bytes(contents, filename=file.filename)
-        return {"source": "local", "text": text}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/score")
-async def score_resume(req: ScoreRequest):
-    """
-    Accepts JSON: {"parsed": {...}, "job_description": "..."}
-    Returns ATS scoring JSON.
-    """
-    try:
-        parsed = req.parsed
-        jd = req.job_description or ""
-        result = local_ats_score(parsed, jd)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/enhance")
-async def enhance_resume(req: EnhanceRequest):
-    """
-    Accepts JSON: {"parsed": {...}, "job_description": "...", "prompt": "..."}
-    Returns enhanced resume dictionary (text + optionally structured)
-    """
-    try:
-        parsed = req.parsed
-        jd = req.job_description or ""
-        prompt = req.prompt
-        text = parsed.get("text", "") if isinstance(parsed, dict) else str(parsed)
-        enhanced = ensemble_enhance(text, jd, prompt=prompt)
-        return enhanced
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/generate/docx")
-def gen_docx(req: GenerateRequest):
-    """
-    Accepts JSON: {"data": { enhanced resume data } }
-    Returns a file response (docx)
-    """
-    try:
-        path = generate_docx(req.data)
-        return {"filename": os.path.basename(path), "path": path}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/generate/pdf")
-def gen_pdf(req: GenerateRequest):
-    """
-    Accepts JSON: {"data": { enhanced resume data } }
-    Returns JSON with file path. (Streamlit will download by requesting this file path)
-    """
-    try:
-        data = req.data
-        name = data.get("name") or data.get("full_name") or "candidate"
-        summary = data.get("summary", "")
-        body = data.get("text", summary)
-        pdf_path = generate_pdf_from_text(f"{name}\n\n{summary}\n\n{body}", name=name)
-        return {"filename": os.path.basename(pdf_path), "path": pdf_path}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+# backend/main.py
+from fastapi import FastAPI, File, Form, Header, UploadFile, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import time
+import zipfile
+
+from backend.parser import ParseError, ParseLimitError, MAX_BYTES
+from backend.documents import find_document, parse_upload, store_document, stream_upload, get_document, cache_stats
+from backend.resume_model import build_model, has_index, public_model
+from backend.ats_score import score_resume as local_ats_score, score_many, compile_profile, get_profile, profile_cache_stats
+from backend.enhancer import ensemble_enhance, ENHANCER_VERSION
+from backend.llm import get_llm_enhancer, close_llm_enhancer
+from backend.template_engine import (
+    render_docx, render_pdf_document, TEMPLATES, DEFAULT_TEMPLATE, RENDER_VERSION, DOCX_MIME, PDF_MIME,
+)
+from backend.artifacts import artifact_key, get_store
+from backend.compression import GzipRequestMiddleware
+from backend.result_cache import etag_matches, get_result_cache, result_key
+from backend.jobs import (
+    get_job_store, start_job_runner, stop_job_runner, notify_job_runner, zip_members, JobError, JOB_MAX_BYTES,
+)
+from backend.requisitions import get_requisition_index, close_requisition_index, RequisitionError, RequisitionExists
+from backend.search import get_search_index, SearchQueryError
+from backend.score_session import create_session, get_session, update_session, delete_session, SessionError, VersionConflict
+from backend.workers import get_pool, pool_stats, shutdown_pools, PoolMemoryError, PoolSaturated, PoolTimeout
+from backend.serve import worker_stats
+from backend.metrics import MetricsMiddleware, ERRORS, log, read_profile, register_collector, render as render_metrics, stage
+from backend.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # heavy libraries load on first use unless WARMUP names their subsystem
+    warm_up()
+    start_job_runner()
+    yield
+    # let in-flight pool jobs finish, drop queued ones
+    stop_job_runner(wait=True)
+    shutdown_pools(wait=True)
+    close_requisition_index()
+    await close_llm_enhancer()
+
+
+app = FastAPI(title="Resume Optimizer API", version="0.1.0", lifespan=lifespan)
+
+# Allow CORS from Streamlit (usually localhost)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:8501", "http://127.0.0.1:8501", "*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Request-Id", "X-Profile-Id", "X-Artifact-Id", "ETag"],
+)
+# gzip JSON both ways; exports are already compressed. Inside the metrics
+# middleware, so request/response sizes are what crossed the wire.
+app.add_middleware(GzipRequestMiddleware, max_bytes=MAX_BYTES)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5,
+                   exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + (PDF_MIME, DOCX_MIME))
+app.add_middleware(MetricsMiddleware)
+
+
+def _server_error(e: Exception) -> HTTPException:
+    """
+    Log an unexpected failure with its traceback, count it, and map it to a 500.
+    Call from inside the except block.
+    """
+    log.exception("request failed: %s", e)
+    ERRORS.inc(exception=type(e).__name__)
+    return HTTPException(status_code=500, detail=str(e))
+
+
+class ScoreRequest(BaseModel):
+    # either the parsed dict from /parse or its doc_id
+    parsed: Optional[Dict[str, Any]] = None
+    doc_id: Optional[str] = None
+    # either the JD text or a jd_id from /jd
+    job_description: Optional[str] = None
+    jd_id: Optional[str] = None
+
+
+class JDRequest(BaseModel):
+    job_description: str
+
+
+class ScoreBatchRequest(BaseModel):
+    # each item is a parsed dict ({"text": "...", "id": ...}) as returned by /parse
+    resumes: List[Dict[str, Any]]
+    job_description: Optional[str] = None
+    jd_id: Optional[str] = None
+    top_k: Optional[int] = 10
+
+
+class RequisitionRequest(BaseModel):
+    job_description: str
+    title: Optional[str] = None
+    # generated when omitted
+    req_id: Optional[str] = None
+
+
+class RequisitionMatchRequest(BaseModel):
+    parsed: Optional[Dict[str, Any]] = None
+    doc_id: Optional[str] = None
+    top_n: int = 10
+    # also run the full score_resume() against each returned requisition
+    details: bool = False
+
+
+class SessionRequest(BaseModel):
+    parsed: Optional[Dict[str, Any]] = None
+    doc_id: Optional[str] = None
+    job_description: Optional[str] = None
+    jd_id: Optional[str] = None
+
+
+class SessionUpdateRequest(BaseModel):
+    # each edit replaces [start, end) of the resume or JD text (code point offsets):
+    # {"target": "resume"|"jd", "start": 10, "end": 14, "text": "..."}
+    edits: List[Dict[str, Any]]
+    # optimistic concurrency: reject the edits if the session has moved on
+    version: Optional[int] = None
+
+
+class EnhanceRequest(BaseModel):
+    parsed: Optional[Dict[str, Any]] = None
+    doc_id: Optional[str] = None
+    job_description: str
+    # optional prompt override
+    prompt: str = None
+
+
+class GenerateRequest(BaseModel):
+    data: Dict[str, Any]
+    # named layout from backend.template_engine.TEMPLATES (default: $RESUME_TEMPLATE or "classic")
+    template: Optional[str] = None
+
+
+def _resolve_parsed(parsed: Optional[Dict[str, Any]], doc_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Return the parsed document from the request body, or look it up by doc_id.
+    A client-sent model never keeps its token index: API responses strip it
+    (public_model), so one in a request is forged or stale, and the stages
+    that read it rebuild the model from the text instead.
+    """
+    if parsed is not None:
+        if not isinstance(parsed.get("text", ""), str):
+            raise HTTPException(status_code=422, detail="'text' must be a string")
+        model = parsed.get("model")
+        if model is not None and not isinstance(model, dict):
+            raise HTTPException(status_code=422, detail="'model' must be an object")
+        if model is not None and "index" in model:
+            parsed = dict(parsed, model=public_model(model))
+        if parsed.get("doc_id"):
+            # reuse the cached resume model when the client echoes a /parse result
+            doc = get_document(parsed["doc_id"])
+            if doc is not None and doc["text"] == parsed.get("text"):
+                return doc
+        return parsed
+    if doc_id:
+        doc = get_document(doc_id)
+        if doc is None:
+            raise HTTPException(status_code=404, detail=f"unknown doc_id: {doc_id}")
+        return doc
+    raise HTTPException(status_code=422, detail="either 'parsed' or 'doc_id' is required")
+
+
+async def _run_pooled(pool: str, fn, *args):
+    """
+    Run a CPU-heavy call in the named process pool, mapping pool
+    back-pressure to 429, job timeouts to 504 and jobs over the worker
+    memory limit to 413.
+    """
+    try:
+        return await get_pool(pool).run(fn, *args)
+    except (PoolSaturated, PoolTimeout, PoolMemoryError) as e:
+        raise _pool_http_error(e)
+
+
+def _pool_http_error(e: Exception) -> Optional[HTTPException]:
+    if isinstance(e, PoolSaturated):
+        return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    if isinstance(e, PoolTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    if isinstance(e, PoolMemoryError):
+        return HTTPException(status_code=413, detail=str(e))
+    return None
+
+
+UPLOAD_CHUNK = 256 * 1024
+
+
+async def _read_upload(file: UploadFile):
+    """
+    Read an upload in chunks, hashing as we go and rejecting it with 413
+    as soon as it passes MAX_BYTES. Returns (contents, doc_id).
+    """
+    h = hashlib.sha256()
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"upload exceeds {MAX_BYTES} bytes")
+        h.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), h.hexdigest()
+
+
+def _resolve_profile(job_description: Optional[str], jd_id: Optional[str]):
+    """
+    Return the compiled JobProfile for a jd_id, or compile (and cache) the JD text.
+    """
+    if jd_id:
+        profile = get_profile(jd_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail=f"unknown jd_id: {jd_id}")
+        return profile
+    return compile_profile(job_description or "")
+
+
+async def _parse_contents(contents: bytes, doc_id: str, filename: str) -> Dict[str, Any]:
+    """
+    Return the cached document for an upload, parsing it in the parse pool on a miss.
+    """
+    doc_id, doc = find_document(contents, doc_id)
+    if doc is None:
+        result = await _run_pooled("parse", parse_upload, contents, filename)
+        doc = store_document(doc_id, result["text"], filename, result["model"])
+    return doc
+
+
+@app.post("/parse")
+async def parse_resume(file: UploadFile = File(...)):
+    """
+    Accepts a PDF, DOCX or plain-text upload (format sniffed from content). Returns extracted text in JSON
+    {"source":"local","text": "...","doc_id": "...","cached": bool,"model": {...}}
+    where model is the structured resume (contact, summary, sections, experience,
+    education, skills). The doc_id can be passed to /score and /enhance instead of the text.
+    """
+    try:
+        contents, doc_id = await _read_upload(file)
+        doc = await _parse_contents(contents, doc_id, file.filename)
+        return {
+            "source": "local",
+            "text": doc["text"],
+            "doc_id": doc["doc_id"],
+            "cached": doc["cached"],
+            "model": public_model(doc["model"]),
+        }
+    except HTTPException:
+        raise
+    except ParseLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ParseError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise _server_error(e)
+
+
+def _ndjson(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record) + "\n").encode()
+
+
+async def _stream_pages(contents: bytes, doc_id: str, filename: str, events):
+    """
+    Yield NDJSON records while the parse pool extracts a PDF page by page,
+    then store the full text in the parse cache. events is the pool's
+    stream of stream_upload() items, already started by the caller.
+    """
+    pages = 0
+    try:
+        async for kind, value in events:
+            if kind == "page":
+                pages += 1
+                yield _ndjson({"event": "page", "page": pages, "text": value})
+                continue
+            doc = store_document(doc_id, value["text"], filename, value["model"])
+            if not value["pages"]:
+                # DOCX / plain text parse in one step
+                yield _ndjson({"event": "text", "text": value["text"]})
+            yield _ndjson({"event": "done", "doc_id": doc_id, "pages": value["pages"], "cached": False,
+                           "model": public_model(doc["model"])})
+    except Exception as e:
+        # one error record, never a partial document: clients drop the pages seen so far
+        err = _parse_error(e)
+        yield _ndjson({"event": "error", "status": err.status_code, "detail": err.detail})
+
+
+def _parse_error(e: Exception) -> HTTPException:
+    """
+    The HTTPException /parse answers a failed parse with. Call from inside the except block.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, ParseLimitError):
+        return HTTPException(status_code=413, detail=str(e))
+    if isinstance(e, ParseError):
+        return HTTPException(status_code=422, detail=str(e))
+    return _pool_http_error(e) or _server_error(e)
+
+
+@app.post("/parse/stream")
+async def parse_resume_stream(file: UploadFile = File(...)):
+    """
+    Streaming variant of /parse. Returns application/x-ndjson, one record per line:
+      {"event": "page", "page": n, "text": "..."}   as each page is extracted
+      {"event": "text", "text": "..."}              whole text (cache hits, non-PDF input)
+      {"event": "done", "doc_id": "...", "pages": n, "cached": bool, "model": {...}}
+      {"event": "error", "status": 413, "detail": "..."}
+    Extraction runs in the parse pool, under its queue limit, timeout and memory cap.
+    A failure after pages were sent ends the stream with a single error record and
+    no "done"; failures before the first record are plain HTTP errors, as in /parse.
+    """
+    contents, doc_id = await _read_upload(file)
+    doc_id, doc = find_document(contents, doc_id)
+    if doc is not None:
+        body = iter([
+            _ndjson({"event": "text", "text": doc["text"]}),
+            _ndjson({"event": "done", "doc_id": doc_id, "pages": 0, "cached": True,
+                     "model": public_model(doc["model"])}),
+        ])
+        return StreamingResponse(body, media_type="application/x-ndjson")
+    events = get_pool("parse").stream(stream_upload, contents, file.filename)
+    try:
+        # admission (429) and failures before the first page become the response status
+        first = await events.__anext__()
+    except Exception as e:
+        raise _parse_error(e)
+
+    async def _events():
+        yield first
+        async for item in events:
+            yield item
+
+    return StreamingResponse(_stream_pages(contents, doc_id, file.filename, _events()), media_type="application/x-ndjson")
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Hit/miss/eviction counters for the parse, JD profile, enhance/export result and LLM rewrite caches.
+    """
+    stats = {"parse": cache_stats(), "jd": profile_cache_stats(), "results": get_result_cache().stats()}
+    llm = get_llm_enhancer()
+    if llm is not None:
+        stats["llm"] = llm.stats()
+    return stats
+
+
+@app.delete("/cache/results")
+def invalidate_results(artifacts: bool = False):
+    """
+    Drop every memoized /enhance and /generate result (memory and disk tier);
+    artifacts=true also deletes the exports stored under ARTIFACT_DIR.
+    """
+    out = {"results": get_result_cache().invalidate()}
+    if artifacts:
+        store = get_store()
+        out["artifacts"] = store.clear() if store is not None else 0
+    return out
+
+
+def _not_modified(etag: str) -> Response:
+    get_result_cache().not_modified += 1
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+@app.post("/jd")
+def create_jd(req: JDRequest):
+    """
+    Accepts JSON: {"job_description": "..."}
+    Compiles the JD once and returns {"jd_id", "keywords", "weights", "total_keywords"}.
+    Pass jd_id to /score and /score/batch instead of the JD text.
+    """
+    return compile_profile(req.job_description or "").to_dict()
+
+
+@app.get("/jd/{jd_id}")
+def read_jd(jd_id: str):
+    return _resolve_profile(None, jd_id).to_dict()
+
+
+def _cache_metrics():
+    families = []
+    caches = {"parse": cache_stats(), "jd": profile_cache_stats(), "results": get_result_cache().stats()}
+    llm = get_llm_enhancer()
+    if llm is not None:
+        caches["llm"] = llm.stats()["cache"]
+    store = get_store()
+    if store is not None:
+        caches["artifacts"] = store.stats()
+    for key, kind, help in (
+        ("hits", "counter", "Cache hits"),
+        ("misses", "counter", "Cache misses"),
+        ("evictions", "counter", "Cache evictions"),
+        ("items", "gauge", "Entries held in memory"),
+        ("bytes", "gauge", "Approximate bytes held in memory"),
+    ):
+        samples = [({"cache": name}, st[key]) for name, st in caches.items() if key in st]
+        name = f"airezume_cache_{key}" + ("_total" if kind == "counter" else "")
+        families.append((name, kind, help, samples))
+    return families
+
+
+def _pool_metrics():
+    pools = pool_stats()
+    return [
+        (f"airezume_pool_{key}", kind, help, [({"pool": name}, st[key]) for name, st in pools.items()])
+        for key, kind, help in (
+            ("inflight", "gauge", "Jobs admitted (running or queued) per worker pool"),
+            ("queue_size", "gauge", "Admission limit per worker pool"),
+            ("workers", "gauge", "Worker processes per pool"),
+        )
+    ] + [
+        (f"airezume_pool_{key}_total", "counter", help, [({"pool": name}, st[key]) for name, st in pools.items()])
+        for key, help in (
+            ("completed", "Jobs finished per worker pool"),
+            ("rejected", "Jobs rejected with 429 per worker pool"),
+            ("timeouts", "Jobs that exceeded the pool timeout"),
+            ("memory_errors", "Jobs that exceeded the pool memory limit"),
+            ("restarts", "Pools rebuilt after a worker process died"),
+        )
+    ]
+
+
+def _worker_metrics():
+    workers = worker_stats()["workers"]
+    return [
+        (f"airezume_worker_{key}" + ("_total" if kind == "counter" else ""), kind, help,
+         [({"slot": str(w["slot"])}, w[key]) for w in workers])
+        for key, kind, help in (
+            ("rss_bytes", "gauge", "Resident memory per API worker process"),
+            ("pool_rss_bytes", "gauge", "Resident memory of each API worker's pool processes"),
+            ("inflight", "gauge", "Requests in progress per API worker"),
+            ("served", "counter", "Requests served per API worker slot"),
+            ("timeouts", "counter", "Requests answered 504 at the deadline per API worker"),
+            ("recycles", "counter", "API worker processes replaced per slot"),
+        )
+    ]
+
+
+register_collector(_cache_metrics)
+register_collector(_pool_metrics)
+register_collector(_worker_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus text exposition: request latency/size histograms per route,
+    stage latency histograms, cache and worker pool counters.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/profiles/{request_id}")
+def get_profile_report(request_id: str, top: int = 30):
+    """
+    Stage breakdown and top functions for a request profiled with
+    "X-Profile: 1" (requires PROFILE_REQUESTS=1). The raw pstats file is
+    <PROFILE_DIR>/<request_id>.prof.
+    """
+    report = read_profile(request_id, top=top)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"no profile for request: {request_id}")
+    return report
+
+
+@app.get("/pool/stats")
+def get_pool_stats():
+    """
+    In-flight, completed, rejected and timed-out job counts per worker pool.
+    """
+    return pool_stats()
+
+
+@app.get("/workers/stats")
+def get_worker_stats():
+    """
+    Per API worker: pid, uptime, requests served, in-flight requests,
+    request timeouts, RSS of the worker and of its pool processes, and how
+    often the slot was recycled and why. Under backend.serve this covers
+    every worker; under plain uvicorn, just this process.
+    """
+    return worker_stats()
+
+
+@app.post("/score")
+async def score_resume(req: ScoreRequest):
+    """
+    Accepts JSON: {"parsed": {...}, "job_description": "..."}
+    with "doc_id" in place of "parsed" and/or "jd_id" in place of "job_description".
+    Returns ATS scoring JSON.
+    """
+    parsed = _resolve_parsed(req.parsed, req.doc_id)
+    profile = _resolve_profile(req.job_description, req.jd_id)
+    try:
+        result = await _run_pooled("score", local_ats_score, parsed, profile)
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _server_error(e)
+
+
+@app.post("/score/batch")
+async def score_resume_batch(req: ScoreBatchRequest):
+    """
+    Accepts JSON: {"resumes": [{...}, ...], "job_description": "...", "top_k": 10}
+    Scores every resume against the JD (compiled once) and returns the ranked top-k.
+    Items may carry a "doc_id" from /parse instead of "text"; "jd_id" may replace the JD.
+    """
+    resumes = [_resolve_parsed(r, None) if "text" in r else _resolve_parsed(None, r.get("doc_id")) for r in req.resumes]
+    profile = _resolve_profile(req.job_description, req.jd_id)
+    try:
+        ranked = await _run_pooled("score", score_many, resumes, profile, req.top_k)
+        return {"total": len(req.resumes), "results": ranked}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _server_error(e)
+
+
+@app.post("/score/sessions", status_code=201)
+def create_score_session(req: SessionRequest):
+    """
+    Accepts JSON: {"parsed": {...} | "doc_id": "...", "job_description": "..." | "jd_id": "..."}
+    Opens an incremental scoring session for live editing; returns {"session_id", "version", "score"}.
+    """
+    parsed = _resolve_parsed(req.parsed, req.doc_id)
+    profile = _resolve_profile(req.job_description, req.jd_id)
+    try:
+        return create_session(parsed, profile.job_description).to_dict()
+    except Exception as e:
+        raise _server_error(e)
+
+
+@app.patch("/score/sessions/{session_id}")
+def update_score_session(session_id: str, req: SessionUpdateRequest):
+    """
+    Accepts JSON: {"edits": [{"target": "resume"|"jd", "start": 10, "end": 14, "text": "..."}], "version": 3}
+    Applies the edits in order and returns the updated score; only the edited regions are re-read.
+    """
+    try:
+        result = update_session(session_id, req.edits, req.version)
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except SessionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise _server_error(e)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"unknown session: {session_id}")
+    return result
+
+
+@app.get("/score/sessions/{session_id}")
+def read_score_session(session_id: str, texts: bool = False):
+    """
+    Current version and score; texts=true also returns the edited resume text and JD.
+    """
+    session = get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"unknown session: {session_id}")
+    return session.to_dict(texts=texts)
+
+
+@app.delete("/score/sessions/{session_id}")
+def delete_score_session(session_id: str):
+    if not delete_session(session_id):
+        raise HTTPException(status_code=404, detail=f"unknown session: {session_id}")
+    return {"session_id": session_id, "deleted": True}
+
+
+def _search_index():
+    index = get_search_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="search index disabled (set SEARCH_DB)")
+    return index
+
+
+@app.get("/search")
+def search_resumes(q: str, mode: str = "ranked", since_days: Optional[float] = None, limit: int = 20, offset: int = 0):
+    """
+    Recruiter search over every parsed resume, e.g. ?q=kubernetes AND golang&since_days=90
+    AND / OR / NOT, parentheses and "quoted phrases"; adjacent terms are ANDed and skill
+    aliases match their canonical skill. mode=ranked (BM25) or boolean (newest first, with total).
+    """
+    index = _search_index()
+    try:
+        return index.search(q, mode=mode, since_days=since_days, limit=max(0, min(limit, 200)), offset=max(0, offset))
+    except SearchQueryError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise _server_error(e)
+
+
+@app.get("/search/stats")
+def search_stats():
+    return _search_index().stats()
+
+
+@app.delete("/search/documents/{doc_id}")
+def delete_search_document(doc_id: str):
+    """
+    Remove a resume from the search index (the parse cache is unaffected).
+    """
+    if not _search_index().delete(doc_id):
+        raise HTTPException(status_code=404, detail=f"unknown doc_id: {doc_id}")
+    return {"doc_id": doc_id, "deleted": True}
+
+
+@app.post("/search/compact")
+def compact_search_index():
+    """
+    Merge the index into a single segment and truncate its write-ahead log.
+    """
+    try:
+        return _search_index().compact()
+    except Exception as e:
+        raise _server_error(e)
+
+
+REQ_MATCH_MAX = 100
+
+
+@app.post("/requisitions", status_code=201)
+def create_requisition(req: RequisitionRequest):
+    """
+    Accepts JSON: {"job_description": "...", "title": "...", "req_id": "..."}
+    Adds an open requisition to the index used by /requisitions/match.
+    """
+    try:
+        return get_requisition_index().add(req.job_description, title=req.title, req_id=req.req_id)
+    except RequisitionExists as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except RequisitionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise _server_error(e)
+
+
+@app.get("/requisitions")
+def list_requisitions(status: Optional[str] = "open", limit: int = 100, offset: int = 0):
+    """
+    Requisitions by creation time: {"total", "requisitions": [...]} (status=open|closed, or empty for all).
+    """
+    return get_requisition_index().list_requisitions(status or None, limit=max(0, min(limit, 1000)), offset=max(0, offset))
+
+
+@app.get("/requisitions/{req_id}")
+def read_requisition(req_id: str):
+    req = get_requisition_index().get(req_id)
+    if req is None:
+        raise HTTPException(status_code=404, detail=f"unknown requisition: {req_id}")
+    return req
+
+
+@app.post("/requisitions/{req_id}/close")
+def close_requisition(req_id: str):
+    """
+    Close a requisition; it stops appearing in matches.
+    """
+    index = get_requisition_index()
+    if index.get(req_id) is None:
+        raise HTTPException(status_code=404, detail=f"unknown requisition: {req_id}")
+    index.close(req_id)
+    return index.get(req_id)
+
+
+@app.post("/requisitions/match")
+def match_requisitions(req: RequisitionMatchRequest):
+    """
+    Accepts JSON: {"parsed": {...} | "doc_id": "...", "top_n": 10, "details": false}
+    Ranks every open requisition for the resume with one sparse matrix product and
+    returns {"total", "matches": [{"rank", "req_id", "title", "score", "coverage", "semantic"}]}.
+    """
+    parsed = _resolve_parsed(req.parsed, req.doc_id)
+    try:
+        return get_requisition_index().match(parsed, top_n=max(0, min(req.top_n, REQ_MATCH_MAX)), details=req.details)
+    except Exception as e:
+        raise _server_error(e)
+
+
+def _enhance_fingerprint(model: Dict[str, Any]) -> Dict[str, Any]:
+    # the model fields ensemble_enhance uses; a client-supplied model may differ from build_model(text)
+    return {"name": model["contact"]["name"], "summary": model["summary"], "skills": model.get("skills") or [],
+            "sentences": model["index"]["sentences"]}
+
+
+async def _enhance_with_etag(parsed: Dict[str, Any], jd: str, prompt: Optional[str] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Enhance a resume; returns (result, ETag). Rule-based results are memoized in the
+    result cache; LLM rewrites are not deterministic (their bullets are cached by the
+    client in backend/llm.py), so they come without an ETag.
+    """
+    text = parsed.get("text", "") if isinstance(parsed, dict) else str(parsed)
+    model = parsed.get("model") if isinstance(parsed, dict) else None
+    if not has_index(model):
+        # the enhancer reads name, summary and skills off the model: always have one, so
+        # {"parsed": {"text"}} and {"doc_id"} for the same resume enhance the same way
+        model = build_model(text)
+    llm = get_llm_enhancer()
+    with stage("enhance"):
+        if llm is not None:
+            return await llm.enhance(text, jd, prompt=prompt, model=model), None
+        cache = get_result_cache()
+        key = result_key("enhance", ENHANCER_VERSION, {"text": text, "job_description": jd, "prompt": prompt,
+                                                       "model": _enhance_fingerprint(model)})
+        hit = cache.lookup(key)
+        if hit is not None:
+            return hit[1], hit[0]
+        result = ensemble_enhance(text, jd, prompt=prompt, model=model)
+        return result, cache.store(key, result)
+
+
+async def _enhance(parsed: Dict[str, Any], jd: str, prompt: Optional[str] = None) -> Dict[str, Any]:
+    return (await _enhance_with_etag(parsed, jd, prompt))[0]
+
+
+@app.post("/enhance")
+async def enhance_resume(req: EnhanceRequest, response: Response, if_none_match: Optional[str] = Header(None)):
+    """
+    Accepts JSON: {"parsed": {...} | "doc_id": "...", "job_description": "...", "prompt": "..."}
+    Returns enhanced resume dictionary (text + optionally structured).
+    With LLM_BACKEND=http the summary and bullets are rewritten by the LLM (see backend/llm.py).
+    Rule-based results carry an ETag; send it back as If-None-Match to get 304 when unchanged.
+    """
+    parsed = _resolve_parsed(req.parsed, req.doc_id)
+    try:
+        result, etag = await _enhance_with_etag(parsed, req.job_description or "", req.prompt)
+    except Exception as e:
+        raise _server_error(e)
+    if etag is not None:
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        response.headers["ETag"] = etag
+    return result
+
+
+EXPORT_CHUNK = 64 * 1024
+
+
+def _export_filename(data: Dict[str, Any], ext: str) -> str:
+    name = data.get("name") or data.get("full_name") or "candidate"
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "candidate"
+    return f"{slug}_resume.{ext}"
+
+
+def _export_response(content: bytes, media_type: str, filename: str, artifact_id: Optional[str] = None,
+                     etag: Optional[str] = None):
+    """
+    Stream an in-memory export in chunks with download headers.
+    """
+    view = memoryview(content)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Content-Length": str(len(content)),
+    }
+    if artifact_id:
+        headers["X-Artifact-Id"] = artifact_id
+    if etag:
+        headers["ETag"] = etag
+    body = (bytes(view[i:i + EXPORT_CHUNK]) for i in range(0, len(content), EXPORT_CHUNK))
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+def _render_export(fmt: str, data: Dict[str, Any], template: Optional[str] = None):
+    """
+    Render an export, or fetch it from the result cache or the artifact store
+    (when enabled). Returns (bytes, ETag, artifact_id or None).
+    """
+    if template is not None and template not in TEMPLATES:
+        raise HTTPException(status_code=422, detail=f"unknown template: {template}")
+    inputs = {"data": data, "template": template or DEFAULT_TEMPLATE}
+    cache = get_result_cache()
+    key = result_key(fmt, RENDER_VERSION, inputs)
+    store = get_store()
+    artifact_id = artifact_key(fmt, dict(inputs, version=RENDER_VERSION)) if store is not None else None
+    hit = cache.lookup(key)
+    if hit is not None and (store is None or store.has(artifact_id)):
+        return hit[1], hit[0], artifact_id
+    content = store.get(artifact_id) if store is not None else None
+    if content is None:
+        content = render_docx(data, template) if fmt == "docx" else render_pdf_document(data, template)
+        if store is not None:
+            store.put(artifact_id, content)
+    return content, cache.store(key, content), artifact_id
+
+
+@app.post("/generate/docx")
+def gen_docx(req: GenerateRequest, if_none_match: Optional[str] = Header(None)):
+    """
+    Accepts JSON: {"data": { enhanced resume data }, "template": "classic"}
+    Returns the .docx as an attachment (rendered in memory).
+    Identical requests return identical bytes and ETag; If-None-Match with it gets 304.
+    """
+    try:
+        content, etag, artifact_id = _render_export("docx", req.data, req.template)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        return _export_response(content, DOCX_MIME, _export_filename(req.data, "docx"), artifact_id, etag)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _server_error(e)
+
+
+@app.post("/generate/pdf")
+def gen_pdf(req: GenerateRequest, if_none_match: Optional[str] = Header(None)):
+    """
+    Accepts JSON: {"data": { enhanced resume data }, "template": "classic"}
+    Returns the PDF as an attachment, laid out like the DOCX (rendered in memory).
+    Identical requests return identical bytes and ETag; If-None-Match with it gets 304.
+    """
+    try:
+        content, etag, artifact_id = _render_export("pdf", req.data, req.template)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        return _export_response(content, PDF_MIME, _export_filename(req.data, "pdf"), artifact_id, etag)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _server_error(e)
+
+
+@app.get("/artifacts/{artifact_id}")
+def get_artifact(artifact_id: str):
+    """
+    Re-download a stored export by the X-Artifact-Id returned from /generate/*.
+    Requires ARTIFACT_DIR to be set.
+    """
+    store = get_store()
+    content = store.get(artifact_id) if store is not None else None
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"unknown or expired artifact: {artifact_id}")
+    ext = artifact_id.rsplit(".", 1)[-1]
+    return _export_response(content, DOCX_MIME if ext == "docx" else PDF_MIME, f"resume.{ext}", artifact_id)
+
+
+ANALYZE_STAGES = ("score", "enhance", "render")
+EXPORT_MIMES = {"docx": DOCX_MIME, "pdf": PDF_MIME}
+
+
+def _ms(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+
+@app.post("/analyze")
+async def analyze_resume(
+    file: Optional[UploadFile] = File(None),
+    doc_id: Optional[str] = Form(None),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+    stages: str = Form("score,enhance"),
+    render: str = Form("docx"),
+    template: Optional[str] = Form(None),
+    prompt: Optional[str] = Form(None),
+    include_text: bool = Form(True),
+):
+    """
+    Parse, score, enhance and optionally render in one request (multipart form).
+    Pass either "file" or the "doc_id" of an earlier upload, and either
+    "job_description" or "jd_id". "stages" is a comma list of score, enhance,
+    render (render implies enhance; "render" picks docx or pdf). The parsed
+    document, compiled JD and enhanced data stay in memory between stages.
+    Returns {"doc_id", "cached", "text", "model", "score", "enhanced",
+    "export": {"format", "filename", "media_type", "artifact_id", "content_base64"},
+    "timings": {"parse": ms, "score": ms, ..., "total": ms}}; skipped stages are omitted.
+    """
+    t_start = time.perf_counter()
+    selected = {s.strip() for s in (stages or "").split(",") if s.strip()}
+    unknown = selected - set(ANALYZE_STAGES)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"unknown stages: {', '.join(sorted(unknown))}")
+    if "render" in selected:
+        selected.add("enhance")
+        if render not in EXPORT_MIMES:
+            raise HTTPException(status_code=422, detail=f"unknown render format: {render}")
+        if template is not None and template not in TEMPLATES:
+            raise HTTPException(status_code=422, detail=f"unknown template: {template}")
+    timings: Dict[str, float] = {}
+    try:
+        t0 = time.perf_counter()
+        if file is not None:
+            contents, upload_id = await _read_upload(file)
+            doc = await _parse_contents(contents, upload_id, file.filename)
+        else:
+            doc = _resolve_parsed(None, doc_id)
+        timings["parse"] = _ms(t0)
+
+        profile = None
+        if "score" in selected or jd_id:
+            profile = _resolve_profile(job_description, jd_id)
+        jd = profile.job_description if profile is not None else (job_description or "")
+
+        async def _score_stage():
+            t = time.perf_counter()
+            result = await _run_pooled("score", local_ats_score, doc, profile)
+            timings["score"] = _ms(t)
+            return result
+
+        async def _enhance_stage():
+            t = time.perf_counter()
+            result = await _enhance(doc, jd, prompt)
+            timings["enhance"] = _ms(t)
+            return result
+
+        # scoring runs in the score pool while enhancement runs here
+        jobs = {}
+        if "score" in selected:
+            jobs["score"] = _score_stage()
+        if "enhance" in selected:
+            jobs["enhanced"] = _enhance_stage()
+        results = dict(zip(jobs, await asyncio.gather(*jobs.values())))
+
+        response: Dict[str, Any] = {
+            "doc_id": doc.get("doc_id"),
+            "cached": doc.get("cached", True),
+            "model": public_model(doc.get("model") or {}),
+        }
+        if include_text:
+            response["text"] = doc["text"]
+        response.update(results)
+
+        if "render" in selected:
+            t0 = time.perf_counter()
+            enhanced = results["enhanced"]
+            content, _, artifact_id = _render_export(render, enhanced, template)
+            response["export"] = {
+                "format": render,
+                "filename": _export_filename(enhanced, render),
+                "media_type": EXPORT_MIMES[render],
+                "artifact_id": artifact_id,
+                "content_base64": base64.b64encode(content).decode("ascii"),
+            }
+            timings["render"] = _ms(t0)
+
+        timings["total"] = _ms(t_start)
+        response["timings"] = timings
+        return response
+    except HTTPException:
+        raise
+    except ParseLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ParseError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise _server_error(e)
+
+
+async def _save_upload(file: UploadFile, path: str, limit: int) -> int:
+    """
+    Stream an upload to disk in chunks, removing it and raising 413 past `limit` bytes.
+    """
+    size = 0
+    try:
+        with open(path, "wb") as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise HTTPException(status_code=413, detail=f"upload exceeds {limit} bytes")
+                f.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return size
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    file: Optional[UploadFile] = File(None),
+    doc_ids: Optional[str] = Form(None),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+):
+    """
+    Queue a bulk screening job (multipart form): a ZIP of resumes as "file",
+    or comma-separated "doc_ids" from /parse, plus "job_description" or "jd_id".
+    Returns the job progress record; poll GET /jobs/{job_id} and read
+    GET /jobs/{job_id}/results.
+    """
+    profile = _resolve_profile(job_description, jd_id)
+    store = get_job_store()
+    job_id = store.new_job_id()
+    try:
+        if file is not None:
+            path = store.zip_path(job_id)
+            await _save_upload(file, path, JOB_MAX_BYTES)
+            try:
+                names = zip_members(path)
+                job = store.create(job_id, profile.job_description, names, zip_path=path)
+            except Exception:
+                os.remove(path)
+                raise
+        elif doc_ids:
+            ids = [d.strip() for d in doc_ids.split(",") if d.strip()]
+            job = store.create(job_id, profile.job_description, ids, doc_ids=ids)
+        else:
+            raise HTTPException(status_code=422, detail="either 'file' (ZIP) or 'doc_ids' is required")
+    except HTTPException:
+        raise
+    except (JobError, zipfile.BadZipFile) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise _server_error(e)
+    notify_job_runner()
+    return job
+
+
+def _job_or_404(job_id: str) -> Dict[str, Any]:
+    job = get_job_store().progress(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"unknown job: {job_id}")
+    return job
+
+
+@app.get("/jobs/{job_id}")
+def read_job(job_id: str):
+    """
+    Progress: {"status", "total", "done", "failed", "pending", "progress",
+    "resumes_per_minute", "eta_seconds", ...}.
+    """
+    return _job_or_404(job_id)
+
+
+JOB_CSV_FIELDS = ["rank", "index", "name", "doc_id", "status", "ats_score", "semantic", "coverage",
+                  "weighted_coverage", "matched_keywords", "missing_keywords", "error"]
+
+
+def _job_csv(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(JOB_CSV_FIELDS)
+    for row in rows:
+        writer.writerow([
+            ";".join(v) if isinstance(v, list) else ("" if v is None else v)
+            for v in (row.get(k) for k in JOB_CSV_FIELDS)
+        ])
+        if buf.tell() >= EXPORT_CHUNK:
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode()
+
+
+@app.get("/jobs/{job_id}/results")
+def read_job_results(job_id: str, format: str = "ndjson", top_k: Optional[int] = None):
+    """
+    Stream the ranked results finished so far (best first, failed items last)
+    as NDJSON (default) or CSV (?format=csv). top_k limits the rows.
+    """
+    _job_or_404(job_id)
+    rows = get_job_store().results(job_id, top_k=top_k)
+    if format == "csv":
+        headers = {"Content-Disposition": f'attachment; filename="job_{job_id}.csv"'}
+        return StreamingResponse(_job_csv(rows), media_type="text/csv", headers=headers)
+    if format != "ndjson":
+        raise HTTPException(status_code=422, detail=f"unknown format: {format}")
+    return StreamingResponse((_ndjson(r) for r in rows), media_type="application/x-ndjson")
+
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    """
+    Stop a queued or running job; finished results are kept.
+    """
+    _job_or_404(job_id)
+    get_job_store().cancel(job_id)
+    return _job_or_404(job_id)
+
+
+@app.delete("/jobs/{job_id}")
+def delete_job(job_id: str):
+    """
+    Cancel a job and remove its results and uploaded ZIP.
+    """
+    store = get_job_store()
+    store.cancel(job_id)
+    if not store.delete(job_id):
+        raise HTTPException(status_code=404, detail=f"unknown job: {job_id}")
+    return {"job_id": job_id, "deleted": True}
@@ -0,0 +1,380 @@
+# backend/metrics.py
+"""
+In-process metrics in Prometheus text format, stage timers and opt-in
+per-request profiling. No client library needed.
+
+  stage("pdf_extract")      context manager timing one pipeline stage into
+                            airezume_stage_seconds{stage=...}
+  capture_call(fn, args)    run fn in a pool worker and ship the stage
+                            timings (and profile, if the request asked for
+                            one) back to the parent with the result;
+                            merge_capture() records them there
+  MetricsMiddleware         per-route latency and request/response sizes,
+                            X-Request-Id on every response, and cProfile
+                            runs for requests sent with "X-Profile: 1"
+  render()                  the /metrics page
+
+Profiling (environment):
+  PROFILE_REQUESTS  1 to honour the X-Profile request header (default off)
+  PROFILE_DIR       where <request_id>.prof (pstats) and .json (stage
+                    breakdown) are written (default: <tmp>/airezume_profiles)
+
+A profile covers the event-loop thread and any pool workers the request
+used; sync endpoints running in Starlette's threadpool show up in the
+stage breakdown only. Other requests served concurrently on the event loop
+also appear in the profile. Only one request per process is profiled at a
+time (one profiler can be active); a request asking for a profile while
+another is being taken is served without one and answered "X-Profile: busy".
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+log = logging.getLogger("airezume")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: Any) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, v in items:
+            yield f"{self.name}{_fmt_labels(self.labels, key)} {_fmt_value(v)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(k, list(s[0]), s[1]) for k, s in self._series.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = f'le="{_fmt_value(bound) if bound != float("inf") else "+Inf"}"'
+                yield f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_fmt_labels(self.labels, key)} {_fmt_value(total)}"
+            yield f"{self.name}_count{_fmt_labels(self.labels, key)} {cumulative}"
+
+
+REQUEST_SECONDS = Histogram("airezume_http_request_duration_seconds", "HTTP request latency by route",
+                            ("method", "route", "status"))
+REQUEST_BYTES = Histogram("airezume_http_request_size_bytes", "HTTP request body size by route",
+                          ("method", "route"), SIZE_BUCKETS)
+RESPONSE_BYTES = Histogram("airezume_http_response_size_bytes", "HTTP response body size by route",
+                           ("method", "route"), SIZE_BUCKETS)
+STAGE_SECONDS = Histogram("airezume_stage_seconds", "Pipeline stage latency", ("stage",))
+ERRORS = Counter("airezume_errors_total", "Requests that failed with an unexpected exception", ("exception",))
+
+_METRICS = [REQUEST_SECONDS, REQUEST_BYTES, RESPONSE_BYTES, STAGE_SECONDS, ERRORS]
+# callables returning [(name, type, help, [(labels dict, value), ...]), ...] at scrape time
+_collectors: List[Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, Any], float]]]]]] = []
+
+
+def register_collector(fn: Callable) -> None:
+    _collectors.append(fn)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for m in _METRICS:
+        lines.append(f"# HELP {m.name} {m.help}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(m.samples())
+    for collect in _collectors:
+        try:
+            families = collect()
+        except Exception:
+            log.exception("metrics collector failed")
+            continue
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                names = tuple(labels)
+                lines.append(f"{name}{_fmt_labels(names, tuple(labels[n] for n in names))} {_fmt_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# -- stages ------------------------------------------------------------------
+
+# per-request list of (stage, seconds) while a profile is being taken
+_request_stages: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_stages", default=None)
+_profiling: ContextVar[bool] = ContextVar("profiling", default=False)
+# profile stats shipped back from pool workers during a profiled request
+_extra_profiles: ContextVar[Optional[List[Dict]]] = ContextVar("extra_profiles", default=None)
+# set inside capture_call: stage timings are shipped back to the parent instead.
+# A context variable, so concurrent calls in executor threads keep their own lists.
+_captured: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("captured", default=None)
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    captured = _captured.get()
+    if captured is not None:
+        captured.append((name, seconds))
+        return
+    STAGE_SECONDS.observe(seconds, stage=name)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages.append((name, seconds))
+
+
+@contextmanager
+def stage(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - t0)
+
+
+class _Stats:
+    """Adapter so pstats.Stats accepts a raw stats dict shipped from another process."""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def capture_call(fn: Callable, args: Tuple, profile: bool = False):
+    """
+    Run fn(*args), returning (result, stage timings, profile stats or None).
+    Used as the pool job so worker-side stages reach the parent's metrics.
+    """
+    captured: List[Tuple[str, float]] = []
+    token = _captured.set(captured)
+    prof = cProfile.Profile() if profile else None
+    try:
+        if prof is not None:
+            prof.enable()
+        try:
+            result = fn(*args)
+        finally:
+            if prof is not None:
+                prof.disable()
+        stats = None
+        if prof is not None:
+            prof.create_stats()
+            stats = prof.stats
+        return result, captured, stats
+    finally:
+        _captured.reset(token)
+
+
+def merge_capture(captured) -> Any:
+    """Record what capture_call brought back and return fn's result."""
+    result, stages, stats = captured
+    for name, seconds in stages:
+        observe_stage(name, seconds)
+    if stats:
+        extra = _extra_profiles.get()
+        if extra is not None:
+            extra.append(stats)
+    return result
+
+
+def profiling() -> bool:
+    """True while serving a request that asked for a profile."""
+    return _profiling.get()
+
+
+# -- middleware --------------------------------------------------------------
+
+PROFILE_ENABLED = os.environ.get("PROFILE_REQUESTS", "0").lower() in ("1", "true", "yes")
+_ID_RE = re.compile(r"[A-Za-z0-9-]{1,64}")
+# held while a request is profiled: cProfile allows one active profiler at a time
+_profile_lock = threading.Lock()
+
+
+def profile_dir() -> str:
+    return os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "airezume_profiles")
+
+
+def _route_of(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (so streamed bodies are measured as they are sent).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        request_id = None
+        want_profile = False
+        for k, v in scope.get("headers", []):
+            if k == b"x-request-id":
+                request_id = v.decode("latin-1")[:64]
+            elif k == b"x-profile" and v in (b"1", b"true"):
+                want_profile = PROFILE_ENABLED
+        if not request_id or not _valid_id(request_id):
+            # client-supplied ids name profile files: never let one escape PROFILE_DIR
+            request_id = uuid.uuid4().hex
+        busy = want_profile and not _profile_lock.acquire(blocking=False)
+        if busy:
+            want_profile = False
+        sizes = {"in": 0, "out": 0}
+        status = {"code": 500}
+
+        async def _receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["in"] += len(message.get("body", b""))
+            return message
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                if want_profile:
+                    headers.append((b"x-profile-id", request_id.encode("latin-1")))
+                elif busy:
+                    headers.append((b"x-profile", b"busy"))
+                message = dict(message, headers=headers)
+            elif message["type"] == "http.response.body":
+                sizes["out"] += len(message.get("body", b""))
+            await send(message)
+
+        prof = None
+        tokens = []
+        if want_profile:
+            stages: List[Tuple[str, float]] = []
+            tokens = [(_request_stages, _request_stages.set(stages)), (_profiling, _profiling.set(True)),
+                      (_extra_profiles, _extra_profiles.set([]))]
+            prof = cProfile.Profile()
+            prof.enable()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, _receive, _send)
+        except Exception as e:
+            ERRORS.inc(exception=type(e).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            route = _route_of(scope)
+            method = scope.get("method", "")
+            REQUEST_SECONDS.observe(elapsed, method=method, route=route, status=str(status["code"]))
+            REQUEST_BYTES.observe(sizes["in"], method=method, route=route)
+            RESPONSE_BYTES.observe(sizes["out"], method=method, route=route)
+            if prof is not None:
+                prof.disable()
+                try:
+                    _write_profile(request_id, prof, stages, _extra_profiles.get() or [], method, route, elapsed)
+                except Exception:
+                    log.exception("could not write profile %s", request_id)
+                for var, token in reversed(tokens):
+                    var.reset(token)
+                _profile_lock.release()
+
+
+def _valid_id(request_id: str) -> bool:
+    return bool(_ID_RE.fullmatch(request_id))
+
+
+def _write_profile(request_id: str, prof: cProfile.Profile, stages, extra: List[Dict],
+                   method: str, route: str, elapsed: float) -> None:
+    root = profile_dir()
+    os.makedirs(root, exist_ok=True)
+    stats = pstats.Stats(prof)
+    for s in extra:
+        stats.add(pstats.Stats(_Stats(s)))
+    stats.dump_stats(os.path.join(root, f"{request_id}.prof"))
+    summary = {
+        "request_id": request_id,
+        "method": method,
+        "route": route,
+        "seconds": round(elapsed, 6),
+        "stages": [{"stage": n, "seconds": round(s, 6)} for n, s in stages],
+    }
+    with open(os.path.join(root, f"{request_id}.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f)
+
+
+def read_profile(request_id: str, top: int = 30) -> Optional[Dict[str, Any]]:
+    """Stage breakdown plus the top functions by cumulative time, or None."""
+    if not _valid_id(request_id):
+        return None
+    root = profile_dir()
+    try:
+        with open(os.path.join(root, f"{request_id}.json"), encoding="utf-8") as f:
+            summary = json.load(f)
+    except OSError:
+        return None
+    buf = io.StringIO()
+    pstats.Stats(os.path.join(root, f"{request_id}.prof"), stream=buf).sort_stats("cumulative").print_stats(top)
+    summary["top"] = buf.getvalue()
+    return summary
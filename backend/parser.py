@@ -1,38 +1,237 @@
-# backend/parser.py
-import pdfplumber
-import tempfile
-import os
-from typing import Optional
-
-def parse_pdf_bytes(pdf_bytes: bytes, filename: Optional[str] = "upload.pdf") -> str:
-    """
-    Given bytes of a PDF (or other binary), write to temp file and extract text using pdfplumber.
-    Returns plain text.
-    """
-    # detect .pdf
-    lower = (filename or "").lower()
-    if lower.endswith(".pdf") or True:  # we'll attempt PDF extraction; if it's docx bytes, user can convert separately
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        try:
-            tmp.write(pdf_bytes)
-            tmp.flush()
-            tmp.close()
-            text = ""
-            try:
-                with pdfplumber.open(tmp.name) as pdf:
-                    for p in pdf.pages:
-                        txt = p.extract_text()
-                        if txt:
-                            text += txt + "\n"
-            except Exception:
-                # fallback: return bytes decoded maybe plain text
-                try:
-                    text = pdf_bytes.decode(errors="ignore")
-                except Exception:
-                    text = ""
-            return text.strip()
-        finally:
-            try:
-                os.unlink(tmp.name)
-            except Exception:
-                pass
+# backend/parser.py
+import atexit
+import io
+import os
+import zipfile
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+from backend.metrics import capture_call, merge_capture, stage
+from backend.workers import in_pool_process
+from backend.utils.text_cleanup import normalize_text
+
+# Guards against pathological uploads (override via environment)
+MAX_BYTES = int(os.environ.get("PARSE_MAX_BYTES", str(20 * 1024 * 1024)))
+MAX_PAGES = int(os.environ.get("PARSE_MAX_PAGES", "50"))
+# decompressed size of a DOCX's word/document.xml (zip bombs)
+MAX_XML_BYTES = int(os.environ.get("PARSE_MAX_XML_BYTES", str(10 * MAX_BYTES)))
+# documents with at least this many pages are split across PAGE_WORKERS processes,
+# unless extraction already runs in a pool process (parse pool, bulk jobs)
+PARALLEL_MIN_PAGES = int(os.environ.get("PARSE_PARALLEL_MIN_PAGES", "12"))
+PAGE_WORKERS = int(os.environ.get("PARSE_PAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+
+
+class ParseLimitError(ValueError):
+    """Upload exceeds MAX_BYTES or MAX_PAGES."""
+
+
+class ParseError(ValueError):
+    """Upload looks like a PDF or DOCX but cannot be read (damaged or truncated)."""
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    if _page_pool is None:
+        _page_pool = ProcessPoolExecutor(max_workers=PAGE_WORKERS)
+        atexit.register(_page_pool.shutdown, wait=False, cancel_futures=True)
+    return _page_pool
+
+
+def _pdfplumber():
+    # pdfplumber pulls in pdfminer, the slowest import in the API; workers
+    # that never see a PDF (e.g. /score only) never load it
+    import pdfplumber
+    return pdfplumber
+
+
+def load_pdf_backend() -> None:
+    """Import the PDF library now rather than on the first PDF (startup warm-up)."""
+    _pdfplumber()
+
+
+def _page_text(page) -> str:
+    with stage("pdf_page"):
+        # ligatures and line-break hyphenation are repaired per page, in the worker
+        return normalize_text(page.extract_text() or "", dehyphenate=True)
+
+
+def _extract_pages(pdf_bytes: bytes, page_numbers: Optional[List[int]] = None) -> List[str]:
+    # page_numbers are 1-based, as pdfplumber expects
+    with _pdfplumber().open(io.BytesIO(pdf_bytes), pages=page_numbers) as pdf:
+        return [_page_text(p) for p in pdf.pages]
+
+
+def _chunks(n_pages: int, n_chunks: int) -> List[List[int]]:
+    size = -(-n_pages // n_chunks)
+    return [list(range(s + 1, min(s + size, n_pages) + 1)) for s in range(0, n_pages, size)]
+
+
+def iter_pdf_pages(pdf_bytes: bytes, max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each page as soon as it is extracted (serial, in memory).
+    Raises ParseLimitError before yielding anything if the PDF is too long,
+    and ParseError if pdfplumber cannot read it.
+    """
+    if len(pdf_bytes) > MAX_BYTES:
+        raise ParseLimitError(f"upload is {len(pdf_bytes)} bytes (limit {MAX_BYTES})")
+    max_pages = MAX_PAGES if max_pages is None else max_pages
+    try:
+        with _pdfplumber().open(io.BytesIO(pdf_bytes)) as pdf:
+            n_pages = len(pdf.pages)
+            if max_pages and n_pages > max_pages:
+                raise ParseLimitError(f"PDF has {n_pages} pages (limit {max_pages})")
+            for p in pdf.pages:
+                yield _page_text(p)
+                # release per-page layout objects as we go
+                p.close()
+    except (ParseLimitError, MemoryError):
+        raise
+    except Exception as e:
+        raise ParseError(f"unreadable PDF: {e}") from e
+
+
+def extract_pdf_pages(pdf_bytes: bytes, max_pages: Optional[int] = None, workers: Optional[int] = None) -> List[str]:
+    """
+    Extract text per page from PDF bytes held in memory.
+    Long documents are split into contiguous page ranges extracted in parallel,
+    except in pool worker processes, where extraction is serial.
+    Raises ParseLimitError when the document has more than max_pages pages.
+    """
+    max_pages = MAX_PAGES if max_pages is None else max_pages
+    if workers is None:
+        workers = 1 if in_pool_process() else PAGE_WORKERS
+    if workers < 2:
+        return list(iter_pdf_pages(pdf_bytes, max_pages=max_pages))
+    with _pdfplumber().open(io.BytesIO(pdf_bytes)) as pdf:
+        n_pages = len(pdf.pages)
+        if max_pages and n_pages > max_pages:
+            raise ParseLimitError(f"PDF has {n_pages} pages (limit {max_pages})")
+        if n_pages < PARALLEL_MIN_PAGES:
+            return [_page_text(p) for p in pdf.pages]
+
+    pool = _get_page_pool()
+    futures = [pool.submit(capture_call, _extract_pages, (pdf_bytes, chunk)) for chunk in _chunks(n_pages, workers)]
+    pages: List[str] = []
+    for f in futures:
+        pages.extend(merge_capture(f.result()))
+    return pages
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def sniff_format(data: bytes) -> str:
+    """
+    Detect the upload format from its magic bytes: 'pdf', 'docx', 'text' or 'unknown'.
+    """
+    head = data[:1024]
+    if b"%PDF-" in head:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                if "word/document.xml" in zf.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            pass
+        return "unknown"
+    if b"\x00" not in head:
+        try:
+            head.decode("utf-8")
+            return "text"
+        except UnicodeDecodeError as e:
+            # a multi-byte character cut at the 1024-byte boundary is still text
+            if e.start >= len(head) - 3:
+                return "text"
+    return "unknown"
+
+
+class _CappedReader:
+    """Read-only file wrapper raising ParseLimitError once more than limit bytes were read."""
+
+    def __init__(self, f, limit: int):
+        self._f = f
+        self._limit = self._left = limit
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size if size is not None and size >= 0 else self._left + 1)
+        self._left -= len(data)
+        if self._left < 0:
+            raise ParseLimitError(f"DOCX document.xml exceeds {self._limit} bytes uncompressed")
+        return data
+
+
+def extract_docx_text(data: bytes) -> str:
+    """
+    Stream word/document.xml out of the DOCX zip and collect paragraph text,
+    without building a python-docx object model. Raises ParseLimitError when
+    the XML inflates past MAX_XML_BYTES (by its header or while reading).
+    """
+    paragraphs = []
+    parts = []
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        size = zf.getinfo("word/document.xml").file_size
+        if size > MAX_XML_BYTES:
+            raise ParseLimitError(f"DOCX document.xml is {size} bytes uncompressed (limit {MAX_XML_BYTES})")
+        with zf.open("word/document.xml") as raw:
+            for event, el in ElementTree.iterparse(_CappedReader(raw, MAX_XML_BYTES), events=("end",)):
+                tag = el.tag
+                if tag == _W + "t":
+                    parts.append(el.text or "")
+                elif tag == _W + "tab":
+                    parts.append("\t")
+                elif tag in (_W + "br", _W + "cr"):
+                    parts.append("\n")
+                elif tag == _W + "p":
+                    paragraphs.append("".join(parts))
+                    parts = []
+                    el.clear()
+    return "\n".join(p for p in paragraphs if p.strip())
+
+
+def _extract_pdf_text(pdf_bytes: bytes, max_pages: Optional[int], workers: Optional[int]) -> str:
+    pages = extract_pdf_pages(pdf_bytes, max_pages=max_pages, workers=workers)
+    return "\n".join(p for p in pages if p)
+
+
+def parse_pdf_bytes(pdf_bytes: bytes, filename: Optional[str] = "upload.pdf",
+                    max_pages: Optional[int] = None, workers: Optional[int] = None) -> str:
+    """
+    Given bytes of an upload, extract plain text using the cheapest path for
+    its format (sniffed from magic bytes; filename is informational only):
+      - PDF: pdfplumber, in memory
+      - DOCX: direct read of word/document.xml
+      - plain text: decoded as UTF-8
+    The text is normalized (backend/utils/text_cleanup.normalize_text).
+    Raises ParseLimitError for uploads over MAX_BYTES / MAX_PAGES, ParseError
+    for PDFs and DOCX files that cannot be read, and MemoryError when
+    extraction runs into the process's memory limit.
+    """
+    if len(pdf_bytes) > MAX_BYTES:
+        raise ParseLimitError(f"upload is {len(pdf_bytes)} bytes (limit {MAX_BYTES})")
+    fmt = sniff_format(pdf_bytes)
+    if fmt == "docx":
+        with stage("docx_extract"):
+            try:
+                text = extract_docx_text(pdf_bytes)
+            except (zipfile.BadZipFile, ElementTree.ParseError) as e:
+                raise ParseError(f"unreadable DOCX: {e}") from e
+            return normalize_text(text).strip()
+    if fmt == "text":
+        return normalize_text(pdf_bytes.decode("utf-8-sig", errors="replace")).strip()
+    try:
+        with stage("pdf_extract"):
+            text = _extract_pdf_text(pdf_bytes, max_pages, workers)
+    except (ParseLimitError, MemoryError):
+        raise
+    except Exception as e:
+        if fmt == "pdf":
+            if isinstance(e, ParseError):
+                raise
+            raise ParseError(f"unreadable PDF: {e}") from e
+        # unrecognised format: best-effort decode
+        text = pdf_bytes.decode(errors="ignore")
+    return text.strip()
@@ -0,0 +1,429 @@
+# backend/requisitions.py
+"""
+Open requisitions: match one resume against every active JD at once.
+
+Requisitions (title, JD text, open/closed) live in a local SQLite database.
+Each process keeps a term matrix with one row per requisition and two
+blocks of columns:
+  - keyword terms (stems and canonical skills, as in JobProfile.terms)
+    weighted KEYWORD_WEIGHT / len(keywords), so a row dotted with the
+    resume's 0/1 term vector is the weighted keyword coverage;
+  - L2-normalised sublinear TF-IDF over the similarity tokenizer, scaled
+    by SEMANTIC_WEIGHT, so the same row dotted with the resume's
+    normalised TF-IDF vector adds the weighted cosine.
+Ranking every open JD is therefore one sparse matrix-vector product and a
+partial sort, instead of one score_resume() call per JD.
+
+Adding a JD tokenizes only that JD and appends a row; closing one masks its
+row. The matrix is rebuilt (closed rows dropped, IDF refitted) once closed
+or newly added rows pass REQ_REFIT_FRACTION of it. Every change bumps a
+sequence number in the database and each process applies changes newer
+than its last sync before answering, so several API workers share one set
+of requisitions. The matrix is snapshotted next to the database at
+shutdown; a restart loads it and only tokenizes JDs changed since.
+
+Index scores approximate score_resume(): IDF comes from the requisition
+corpus rather than from each (JD, resume) pair. match(details=True)
+re-scores the top matches exactly. Rows are weighted with the IDF current
+when the matrix was last rebuilt (or, for rows added since, when they were
+appended), so as requisitions come and go, index scores drift from a fresh
+fit until the next rebuild; REQ_REFIT_FRACTION bounds how far.
+
+Configuration (environment):
+  REQUISITION_DIR     directory for the database and matrix snapshot
+                      (default: <tmp>/airezume_requisitions)
+  REQ_REFIT_FRACTION  share of closed or newly added rows that triggers a
+                      rebuild (default 0.2)
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from collections import Counter
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+from scipy import sparse
+
+from backend.ats_score import KEYWORD_WEIGHT, SEMANTIC_WEIGHT, JobProfile, resume_terms, score_resume
+from backend.metrics import stage
+from backend.resume_model import build_model, has_index
+from backend.similarity import tokenize as semantic_tokens
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requisitions (
+    req_id TEXT PRIMARY KEY,
+    title TEXT,
+    job_description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    closed REAL,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requisitions_seq ON requisitions (seq);
+CREATE INDEX IF NOT EXISTS requisitions_status ON requisitions (status, created);
+"""
+_SNAPSHOT_VERSION = 1
+# column keys: keyword terms and similarity tokens share one vocabulary
+_KW, _SEM = "k:", "s:"
+
+
+class RequisitionError(ValueError):
+    pass
+
+
+class RequisitionExists(RequisitionError):
+    pass
+
+
+class RequisitionIndex:
+    def __init__(self, root: str, refit_fraction: float = 0.2):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.refit_fraction = refit_fraction
+        self._snapshot_path = os.path.join(root, "index.npz")
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(root, "requisitions.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._reset()
+        self._load_snapshot()
+        self._dirty = False
+
+    def _reset(self) -> None:
+        self._seq = 0
+        self._vocab: Dict[str, int] = {}
+        self._df: List[int] = []            # per column; similarity columns only
+        self._ids: List[str] = []           # row -> req_id
+        self._pos: Dict[str, int] = {}      # req_id -> row
+        self._kw: List[np.ndarray] = []     # row -> keyword columns
+        self._sem: List[Tuple[np.ndarray, np.ndarray]] = []  # row -> (similarity columns, term counts)
+        self._closed: Set[int] = set()
+        self._matrix: Optional[sparse.csr_matrix] = None
+        self._fit_rows = 0
+
+    # --- database -----------------------------------------------------------
+
+    def add_many(self, items: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Insert requisitions ({"job_description", optional "title" / "req_id"})
+        and index them. Raises RequisitionExists if a req_id already exists
+        and RequisitionError for an invalid item.
+        """
+        rows = []
+        now = time.time()
+        for item in items:
+            jd = (item.get("job_description") or "").strip()
+            if not jd:
+                raise RequisitionError("job_description is required")
+            rows.append((item.get("req_id") or uuid.uuid4().hex, item.get("title"), jd, now))
+        with self._lock:
+            seq = self._begin()
+            try:
+                self._conn.executemany(
+                    "INSERT INTO requisitions (req_id, title, job_description, status, created, seq) "
+                    "VALUES (?, ?, ?, 'open', ?, ?)",
+                    [(r, t, jd, created, seq + i) for i, (r, t, jd, created) in enumerate(rows, start=1)],
+                )
+            except sqlite3.IntegrityError as e:
+                self._conn.rollback()
+                raise RequisitionExists(f"requisition already exists: {e}")
+            self._conn.commit()
+            self._sync()
+        return [r[0] for r in rows]
+
+    def add(self, job_description: str, title: Optional[str] = None, req_id: Optional[str] = None) -> Dict[str, Any]:
+        (req_id,) = self.add_many([{"job_description": job_description, "title": title, "req_id": req_id}])
+        return self.get(req_id)
+
+    def close(self, req_id: str) -> bool:
+        with self._lock:
+            seq = self._begin()
+            cur = self._conn.execute(
+                "UPDATE requisitions SET status = 'closed', closed = ?, seq = ? WHERE req_id = ? AND status = 'open'",
+                (time.time(), seq + 1, req_id),
+            )
+            self._conn.commit()
+            self._sync()
+        return cur.rowcount > 0
+
+    def get(self, req_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT req_id, title, job_description, status, created, closed FROM requisitions WHERE req_id = ?",
+                (req_id,),
+            )
+            row = cur.fetchone()
+            cols = [c[0] for c in cur.description]
+        return dict(zip(cols, row)) if row else None
+
+    def list_requisitions(self, status: Optional[str] = "open", limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+        where, args = ("WHERE status = ?", (status,)) if status else ("", ())
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM requisitions {where}", args).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT req_id, title, status, created, closed FROM requisitions {where} "
+                "ORDER BY created, req_id LIMIT ? OFFSET ?", args + (limit, offset),
+            ).fetchall()
+        keys = ("req_id", "title", "status", "created", "closed")
+        return {"total": total, "requisitions": [dict(zip(keys, r)) for r in rows]}
+
+    def _max_seq(self) -> int:
+        return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM requisitions").fetchone()[0]
+
+    def _begin(self) -> int:
+        """Start a write transaction and return the current sequence number."""
+        # IMMEDIATE takes the write lock now, so processes cannot hand out the same seq
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._max_seq()
+
+    def _titles(self, req_ids: List[str]) -> Dict[str, Optional[str]]:
+        marks = ",".join("?" * len(req_ids))
+        return dict(self._conn.execute(f"SELECT req_id, title FROM requisitions WHERE req_id IN ({marks})", req_ids))
+
+    # --- index ---------------------------------------------------------------
+
+    def _sync(self) -> None:
+        """Apply requisitions added or closed (by any process) since the last sync."""
+        changes = self._conn.execute(
+            "SELECT req_id, job_description, status, seq FROM requisitions WHERE seq > ? ORDER BY seq", (self._seq,)
+        ).fetchall()
+        if not changes:
+            return
+        with stage("requisition_sync"):
+            for req_id, jd, status, seq in changes:
+                if status == "open" and req_id not in self._pos:
+                    self._append(req_id, jd)
+                elif status == "closed" and req_id in self._pos:
+                    self._close_row(self._pos.pop(req_id))
+                self._seq = seq
+            self._dirty = True
+            stale = len(self._closed) + len(self._ids) - self._fit_rows
+            if self._matrix is None or stale > self.refit_fraction * max(self._fit_rows, 1):
+                self._rebuild()
+
+    def _column(self, key: str) -> int:
+        col = self._vocab.get(key)
+        if col is None:
+            col = self._vocab[key] = len(self._vocab)
+            self._df.append(0)
+        return col
+
+    def _append(self, req_id: str, job_description: str) -> None:
+        kw = np.array([self._column(_KW + t) for t in JobProfile(job_description).terms], dtype=np.int64)
+        counts = Counter(semantic_tokens(job_description))
+        cols = np.array([self._column(_SEM + t) for t in counts], dtype=np.int64)
+        for c in cols:
+            self._df[c] += 1
+        self._pos[req_id] = len(self._ids)
+        self._ids.append(req_id)
+        self._kw.append(kw)
+        self._sem.append((cols, np.fromiter(counts.values(), dtype=np.float64, count=len(counts))))
+
+    def _close_row(self, row: int) -> None:
+        self._closed.add(row)
+        for c in self._sem[row][0]:
+            self._df[c] -= 1
+
+    def _idf(self) -> np.ndarray:
+        n = len(self._ids) - len(self._closed)
+        df = np.asarray(self._df, dtype=np.float64)
+        # smoothed, as in TfidfEngine
+        return np.log((1.0 + n) / (1.0 + df)) + 1.0
+
+    def _rows_matrix(self, start: int, idf: np.ndarray) -> sparse.csr_matrix:
+        indptr, indices, data = [0], [], []
+        for kw, (cols, tf) in zip(self._kw[start:], self._sem[start:]):
+            w = (1.0 + np.log(tf)) * idf[cols]
+            norm = np.sqrt(w @ w) or 1.0
+            indices += [kw, cols]
+            data += [np.full(len(kw), KEYWORD_WEIGHT / max(len(kw), 1)), w * (SEMANTIC_WEIGHT / norm)]
+            indptr.append(indptr[-1] + len(kw) + len(cols))
+        n_rows = len(indptr) - 1
+        if not n_rows:
+            return sparse.csr_matrix((0, len(self._vocab)))
+        return sparse.csr_matrix((np.concatenate(data), np.concatenate(indices), np.array(indptr)),
+                                 shape=(n_rows, len(self._vocab)))
+
+    def _rebuild(self) -> None:
+        """Drop closed rows and re-weight every row with the current IDF."""
+        with stage("requisition_rebuild"):
+            if self._closed:
+                keep = [i for i in range(len(self._ids)) if i not in self._closed]
+                self._ids = [self._ids[i] for i in keep]
+                self._kw = [self._kw[i] for i in keep]
+                self._sem = [self._sem[i] for i in keep]
+                self._pos = {r: i for i, r in enumerate(self._ids)}
+                self._closed = set()
+            self._matrix = self._rows_matrix(0, self._idf())
+            self._fit_rows = len(self._ids)
+
+    def _current_matrix(self) -> sparse.csr_matrix:
+        """The matrix with rows appended since the last rebuild (weighted with the current IDF)."""
+        if self._matrix is None:
+            self._rebuild()
+        m = self._matrix
+        n_cols = len(self._vocab)
+        if m.shape[0] < len(self._ids) or m.shape[1] < n_cols:
+            m.resize((m.shape[0], n_cols))
+            if m.shape[0] < len(self._ids):
+                m = sparse.vstack([m, self._rows_matrix(m.shape[0], self._idf())], format="csr")
+            self._matrix = m
+        return m
+
+    def _query(self, terms: Set[int], text: str) -> np.ndarray:
+        """The resume (its keyword-term columns and text) as a vector over the index columns."""
+        v = np.zeros(len(self._vocab))
+        v[list(terms)] = 1.0
+        counts = Counter(semantic_tokens(text))
+        if counts:
+            idf = self._idf()
+            unseen = np.log(1.0 + len(self._ids) - len(self._closed)) + 1.0
+            cols = np.array([self._vocab.get(_SEM + t, -1) for t in counts])
+            w = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts))))
+            w *= np.where(cols >= 0, idf[cols], unseen)
+            # terms the index has never seen still count towards the resume's norm
+            w /= np.sqrt(w @ w) or 1.0
+            known = cols >= 0
+            v[cols[known]] = w[known]
+        return v
+
+    def match(self, parsed: Dict[str, Any], top_n: int = 10, details: bool = False) -> Dict[str, Any]:
+        """
+        Rank open requisitions for one resume (a parsed dict with 'text' and
+        optionally its 'model'). Each match has the index score (0..100, an
+        estimate of ats_score) with its coverage / semantic parts; details
+        adds the exact score_resume() result for each returned requisition.
+        """
+        text = parsed.get("text", "") or ""
+        model = parsed.get("model")
+        if not has_index(model):
+            model = build_model(text)
+        tokens = model["index"]["tokens"]
+        with self._lock:
+            self._sync()
+            n_open = len(self._ids) - len(self._closed)
+            if not n_open or top_n <= 0:
+                return {"total": n_open, "matches": []}
+            with stage("requisition_match"):
+                m = self._current_matrix()
+                terms = {c for c in (self._vocab.get(_KW + t) for t in resume_terms(tokens)) if c is not None}
+                v = self._query(terms, text)
+                scores = m @ v
+                if self._closed:
+                    scores[list(self._closed)] = -np.inf
+                k = min(top_n, n_open)
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.lexsort((top, -scores[top]))]
+                hits = [(self._ids[r], float(scores[r]), self._kw[r]) for r in top]
+            titles = self._titles([h[0] for h in hits])
+        matches = []
+        for rank, (req_id, score, kw) in enumerate(hits, start=1):
+            coverage = sum(1 for c in kw if c in terms) / len(kw) if len(kw) else 0.0
+            semantic = max(0.0, score - coverage * KEYWORD_WEIGHT) / SEMANTIC_WEIGHT
+            matches.append({
+                "rank": rank,
+                "req_id": req_id,
+                "title": titles.get(req_id),
+                "score": round(score * 100, 2),
+                "coverage": round(coverage, 3),
+                "semantic": round(semantic, 3),
+            })
+        if details:
+            for match in matches:
+                req = self.get(match["req_id"])
+                if req is not None:
+                    match["detail"] = score_resume({"text": text, "model": model}, req["job_description"])
+        return {"total": n_open, "matches": matches}
+
+    def refresh(self) -> None:
+        """Load changes made since the last sync (and build the matrix) now rather than on the next match."""
+        with self._lock:
+            self._sync()
+            self._current_matrix()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            m = self._matrix
+            return {
+                "open": len(self._ids) - len(self._closed),
+                "rows": len(self._ids),
+                "terms": len(self._vocab),
+                "nnz": int(m.nnz) if m is not None else 0,
+                "seq": self._seq,
+            }
+
+    # --- snapshot ------------------------------------------------------------
+
+    def save(self) -> None:
+        """Write the matrix inputs (compacted) next to the database."""
+        with self._lock:
+            self._sync()
+            if self._closed:
+                self._rebuild()
+            meta = {"version": _SNAPSHOT_VERSION, "seq": self._seq, "ids": self._ids, "vocab": list(self._vocab)}
+            kw_len = [len(k) for k in self._kw]
+            sem_len = [len(c) for c, _ in self._sem]
+            empty = np.zeros(0, dtype=np.int64)
+            tmp = self._snapshot_path + f".{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+                    df=np.asarray(self._df, dtype=np.int64),
+                    kw_len=np.asarray(kw_len, dtype=np.int64),
+                    kw=np.concatenate(self._kw) if self._kw else empty,
+                    sem_len=np.asarray(sem_len, dtype=np.int64),
+                    sem_cols=np.concatenate([c for c, _ in self._sem]) if self._sem else empty,
+                    sem_tf=np.concatenate([t for _, t in self._sem]) if self._sem else empty.astype(np.float64),
+                )
+            os.replace(tmp, self._snapshot_path)
+            self._dirty = False
+
+    def _load_snapshot(self) -> None:
+        try:
+            with np.load(self._snapshot_path) as z:
+                meta = json.loads(z["meta"].tobytes().decode("utf-8"))
+                if meta.get("version") != _SNAPSHOT_VERSION or meta["seq"] > self._max_seq():
+                    # written by another version, or for a database that has since been replaced
+                    return
+                kw = np.split(z["kw"], np.cumsum(z["kw_len"])[:-1]) if len(z["kw_len"]) else []
+                cuts = np.cumsum(z["sem_len"])[:-1]
+                sem = list(zip(np.split(z["sem_cols"], cuts), np.split(z["sem_tf"], cuts))) if len(z["sem_len"]) else []
+                df = z["df"].tolist()
+        except (OSError, ValueError, KeyError):
+            return
+        self._seq = meta["seq"]
+        self._ids = meta["ids"]
+        self._pos = {r: i for i, r in enumerate(self._ids)}
+        self._vocab = {key: i for i, key in enumerate(meta["vocab"])}
+        self._df = df
+        self._kw = list(kw)
+        self._sem = sem
+
+
+_index: Optional[RequisitionIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_requisition_index() -> RequisitionIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                root = os.environ.get("REQUISITION_DIR") or os.path.join(tempfile.gettempdir(), "airezume_requisitions")
+                _index = RequisitionIndex(root, refit_fraction=float(os.environ.get("REQ_REFIT_FRACTION", "0.2")))
+    return _index
+
+
+def close_requisition_index() -> None:
+    """Snapshot the index if it changed (called at shutdown)."""
+    global _index
+    if _index is not None:
+        if _index._dirty:
+            _index.save()
+        _index = None
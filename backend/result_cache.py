@@ -0,0 +1,109 @@
+# backend/result_cache.py
+"""
+Memoized results of the deterministic endpoints: /enhance with the
+rule-based enhancer, and /generate/docx|pdf.
+
+A result is keyed by a hash of everything that determines it: its kind,
+the producing code's version (ENHANCER_VERSION, RENDER_VERSION) and the
+inputs (resume text, JD and prompt; or export data and template), so a
+version bump retires every entry made by the old code. Each entry carries
+the hash of its content, served as the ETag: a request whose If-None-Match
+names it gets 304 Not Modified without the result being recomputed or
+sent. DELETE /cache/results drops every entry (e.g. after editing a
+template without bumping RENDER_VERSION).
+
+Enhancement results go to the memory LRU and, when RESULT_CACHE_DB is set,
+an SQLite tier that survives restarts. Exports are kept in memory only;
+ARTIFACT_DIR (backend/artifacts.py) is their on-disk store.
+
+Configuration (environment):
+  RESULT_CACHE_ITEMS   max results kept in memory (default 1024)
+  RESULT_CACHE_BYTES   max approximate bytes kept in memory (default 64MB)
+  RESULT_CACHE_TTL     seconds before an entry expires (default: no expiry)
+  RESULT_CACHE_DB      path of an SQLite file for the on-disk tier (default: disabled)
+"""
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import os
+
+from backend.cache import LRUCache, SQLiteTier, TieredCache
+
+
+def result_key(kind: str, version: str, inputs: Dict[str, Any]) -> str:
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return f"{kind}:" + hashlib.sha256(f"{kind}\0{version}\0{payload}".encode("utf-8")).hexdigest()
+
+
+def content_etag(value: Any) -> str:
+    """Quoted strong ETag for a result: bytes as they are, anything else as canonical JSON."""
+    if not isinstance(value, (bytes, bytearray)):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return '"' + hashlib.sha256(value).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 prescribes for this header)."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+class ResultCache(TieredCache):
+    """TieredCache of {"etag", "value"} entries; bytes values stay out of the disk tier."""
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteTier] = None):
+        super().__init__(memory, disk)
+        self.not_modified = 0
+
+    def lookup(self, key: str) -> Optional[Tuple[str, Any]]:
+        entry = self.get(key)
+        return (entry["etag"], entry["value"]) if entry is not None else None
+
+    def store(self, key: str, value: Any) -> str:
+        """Cache a result and return its ETag."""
+        entry = {"etag": content_etag(value), "value": value}
+        if isinstance(value, (bytes, bytearray)):
+            self.memory.set(key, entry)
+        else:
+            self.set(key, entry)
+        return entry["etag"]
+
+    def invalidate(self) -> Dict[str, int]:
+        """Drop every entry; returns how many were held in memory and on disk."""
+        removed = {"memory": len(self.memory), "disk": len(self.disk) if self.disk is not None else 0}
+        self.clear()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        s = super().stats()
+        s["not_modified"] = self.not_modified
+        return s
+
+
+def _env_float(name: str) -> Optional[float]:
+    v = os.environ.get(name)
+    return float(v) if v else None
+
+
+def _build_cache() -> ResultCache:
+    ttl = _env_float("RESULT_CACHE_TTL")
+    memory = LRUCache(
+        max_items=int(os.environ.get("RESULT_CACHE_ITEMS", "1024")),
+        max_bytes=int(os.environ.get("RESULT_CACHE_BYTES", str(64 * 1024 * 1024))),
+        ttl=ttl,
+    )
+    db = os.environ.get("RESULT_CACHE_DB")
+    disk = SQLiteTier(db, table="results", ttl=ttl) if db else None
+    return ResultCache(memory, disk)
+
+
+_cache = _build_cache()
+
+
+def get_result_cache() -> ResultCache:
+    return _cache
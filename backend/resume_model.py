@@ -0,0 +1,204 @@
+# backend/resume_model.py
+"""
+Structured resume model built once at parse time.
+
+build_model(text) scans the text a single time and returns a JSON-friendly
+dict that later stages read instead of re-splitting the raw string:
+
+    {
+      "contact": {"name", "email", "phone", "links"},
+      "summary": "...",
+      "sections": [{"name", "title", "start", "body", "end"}],   # char offsets into text
+      "experience": [{"title", "details", "bullets", "start", "end"}],
+      "education": [{"title", "details", "bullets", "start", "end"}],
+      "skills": ["python", ...],
+      "index": {"tokens": [...], "offsets": [...], "sentences": [[start, end], ...]},
+    }
+
+"index" holds the precomputed token and sentence arrays (index_text() in
+backend/utils/text_cleanup.py; offsets are an array('I')); it is kept in the
+parse cache but stripped from API responses (see public_model).
+"""
+from typing import Any, Dict, List, Optional
+import bisect
+import re
+
+from backend.metrics import stage
+from backend.utils.text_cleanup import clean_whitespace, index_text
+
+SECTION_ALIASES = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about", "about me"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship experience"],
+    "education": ["education", "academic background", "academics", "education and training"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "technologies",
+               "skills and tools", "tools and technologies"],
+    "projects": ["projects", "personal projects", "academic projects", "selected projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications"],
+    "awards": ["awards", "achievements", "honors", "honors and awards"],
+}
+_HEADER_MAX = 1500
+_HEADINGS = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+_BULLET_RE = re.compile(r"^\s*[•▪●‣⁃–—\-\*·o]\s+")
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_LINK_RE = re.compile(r"(?:https?://|www\.)\S+|(?:linkedin\.com|github\.com)/\S+", re.I)
+_SKILL_SPLIT_RE = re.compile(r"[,;|•\n]+|\s{2,}")
+
+
+def section_heading(line: str) -> Optional[str]:
+    """Canonical section name if the line is a section heading ("Work Experience:" -> "experience")."""
+    key = clean_whitespace(line.strip().rstrip(":")).lower()
+    if not key or len(key) > 40:
+        return None
+    return _HEADINGS.get(key)
+
+
+def _lines(text: str):
+    # (start, end) offsets of each line, end excluding the newline
+    start = 0
+    for m in re.finditer(r"\n", text):
+        yield start, m.start()
+        start = m.end()
+    if start < len(text):
+        yield start, len(text)
+
+
+def _entries(text: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """
+    Group a section's lines into entries: a non-bullet line after bullets
+    (or at the top) starts a new entry; bullets attach to the current one.
+    """
+    entries: List[Dict[str, Any]] = []
+    cur = None
+    prev_bullet = False
+    for ls, le in _lines(text[start:end]):
+        line = text[start + ls:start + le]
+        if not line.strip():
+            continue
+        m = _BULLET_RE.match(line)
+        if m:
+            if cur is None:
+                cur = {"title": "", "details": [], "bullets": [], "start": start + ls, "end": start + le}
+                entries.append(cur)
+            cur["bullets"].append(line[m.end():].strip())
+            prev_bullet = True
+        elif prev_bullet and (line[:1].isspace() or line.lstrip()[:1].islower()):
+            # wrapped continuation of the previous bullet
+            cur["bullets"][-1] += " " + line.strip()
+        elif cur is None or prev_bullet:
+            cur = {"title": line.strip(), "details": [], "bullets": [], "start": start + ls, "end": start + le}
+            entries.append(cur)
+            prev_bullet = False
+        else:
+            cur["details"].append(line.strip())
+        cur["end"] = start + le
+    return entries
+
+
+def _skills(section_text: str) -> List[str]:
+    seen = set()
+    out = []
+    for part in _SKILL_SPLIT_RE.split(section_text):
+        s = _BULLET_RE.sub("", part).strip(" .:")
+        # drop "Languages:" style labels
+        if ":" in s:
+            s = s.split(":", 1)[1].strip()
+        key = s.lower()
+        if s and len(s) <= 40 and key not in seen:
+            seen.add(key)
+            out.append(s)
+    return out
+
+
+def build_model(text: str) -> Dict[str, Any]:
+    text = text or ""
+    sections: List[Dict[str, Any]] = []
+    name = ""
+    for i, (ls, le) in enumerate(_lines(text)):
+        line = text[ls:le]
+        sec = section_heading(line)
+        if sec is not None:
+            if sections:
+                sections[-1]["end"] = ls
+            sections.append({"name": sec, "title": line.strip(), "start": ls, "body": min(le + 1, len(text)), "end": len(text)})
+        elif not name and i < 6:
+            # first short line near the top, same heuristic as the enhancer
+            t = line.strip()
+            if t and len(t) < 60 and len(t.split()) <= 4:
+                name = t
+
+    # contact details live at the top; cap the scan for heading-less text
+    header_end = sections[0]["start"] if sections else len(text)
+    header = text[:min(header_end, _HEADER_MAX)]
+    email = _EMAIL_RE.search(header) if "@" in header else None
+    if email is None and "@" in text:
+        email = _EMAIL_RE.search(text)
+    phone = _PHONE_RE.search(header)
+    links = [m.group().rstrip(".,;") for m in _LINK_RE.finditer(header)]
+
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for s in sections:
+        by_name.setdefault(s["name"], s)
+
+    if "summary" in by_name:
+        s = by_name["summary"]
+        summary = text[s["body"]:s["end"]].strip()
+    else:
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+        summary = paragraphs[0] if paragraphs else text[:200]
+
+    def entries(sec):
+        s = by_name.get(sec)
+        return _entries(text, s["body"], s["end"]) if s else []
+
+    skills = _skills(text[by_name["skills"]["body"]:by_name["skills"]["end"]]) if "skills" in by_name else []
+    with stage("tokenize"):
+        index = index_text(text)
+
+    return {
+        "contact": {
+            "name": name,
+            "email": email.group() if email else "",
+            "phone": phone.group().strip() if phone else "",
+            "links": links,
+        },
+        "summary": summary,
+        "sections": sections,
+        "experience": entries("experience"),
+        "education": entries("education"),
+        "skills": skills,
+        "index": index,
+    }
+
+
+def public_model(model: Dict[str, Any]) -> Dict[str, Any]:
+    """Model without the precomputed index, for API responses."""
+    return {k: v for k, v in model.items() if k != "index"}
+
+
+def has_index(model: Optional[Dict[str, Any]]) -> bool:
+    return isinstance(model, dict) and isinstance(model.get("index"), dict)
+
+
+def section_at(model: Dict[str, Any], offset: int) -> str:
+    """Name of the section containing a character offset ('header' before the first heading)."""
+    sections = model.get("sections") or []
+    starts = [s["start"] for s in sections]
+    i = bisect.bisect_right(starts, offset) - 1
+    return sections[i]["name"] if i >= 0 else "header"
+
+
+def token_sections(model: Dict[str, Any]) -> List[str]:
+    """Section name for every token in the index, in one merge pass."""
+    sections = model.get("sections") or []
+    offsets = model["index"]["offsets"]
+    out = []
+    j = -1
+    for off in offsets:
+        while j + 1 < len(sections) and sections[j + 1]["start"] <= off:
+            j += 1
+        out.append(sections[j]["name"] if j >= 0 else "header")
+    return out
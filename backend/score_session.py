@@ -0,0 +1,680 @@
+# backend/score_session.py
+"""
+Incremental scoring sessions for live editing of a resume or JD.
+
+A session holds one (resume, JD) pair together with what score_resume()
+would otherwise rebuild on every keystroke:
+  - the resume tokens, split into "units" (a skill alias span or a single
+    token, as SkillIndex.scan() sees them) and, per matching term, how many
+    units offer it, overall and per section;
+  - the term frequencies of both texts for the TF-IDF cosine, with its dot
+    product and both squared norms kept as running sums.
+
+An edit replaces a character range [start, end) of either text (offsets in
+code points). A resume edit re-tokenizes only the whitespace-bounded window
+around it, restarts the skill scan as far before the window as a match can
+look ahead (SkillIndex.reach: one alias length, more with context aliases)
+and stops once the unit boundaries line up with the old ones again past
+the context window; the
+counts and cosine sums are adjusted for what changed. Token offsets sit in
+blocks whose bases shift lazily (_Offsets), so the tokens after an edit are
+not rewritten. An edit touching a section heading line re-assigns sections
+over the whole resume. A JD edit recompiles the (short) JD profile and adjusts the cosine for the JD terms
+that changed. Coverage and matched/missing keywords are then read off in
+O(keywords). Results equal score_resume() on the edited texts, up to float
+rounding in 'semantic'; section_matches lists sections in document order.
+The semantic score is maintained incrementally for the tfidf engine; other
+engines rescore the pair on every update.
+
+Sessions live in process memory (LRU, expiring when idle). With
+SCORE_SESSION_DB set, every update also records the session's texts and
+version in SQLite, so API workers behind one port (backend/serve.py) share
+sessions: a worker whose copy is missing or behind rebuilds it from the
+record before applying edits, and a write based on a stale copy is
+rejected as a version conflict.
+
+Configuration (environment):
+  SCORE_SESSION_ITEMS  max sessions kept (default 1024)
+  SCORE_SESSION_TTL    seconds a session survives without updates (default 3600)
+  SCORE_SESSION_DB     path of an SQLite file shared by API workers (default: disabled)
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from collections import Counter
+import bisect
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from backend.ats_score import KEYWORD_WEIGHT, SEMANTIC_WEIGHT, JobProfile, _resume_text, _stems
+from backend.cache import LRUCache
+from backend.metrics import stage
+from backend.resume_model import has_index, section_heading
+from backend.similarity import TfidfEngine, get_engine, tokenize as sim_tokenize
+from backend.skills import get_skill_index
+from backend.utils.text_cleanup import stem, tokenize_with_offsets
+
+
+class SessionError(ValueError):
+    pass
+
+
+class VersionConflict(SessionError):
+    pass
+
+
+def _bump(counter: Dict[Any, int], key: Any, n: int) -> None:
+    v = counter.get(key, 0) + n
+    if v:
+        counter[key] = v
+    else:
+        del counter[key]
+
+
+def _headings(text: str, lo: int, hi: int) -> List[Tuple[int, str]]:
+    """(line start, section) for every heading line starting in [lo, hi]; lo is a line start."""
+    out = []
+    start = lo
+    while start <= hi:
+        end = text.find("\n", start)
+        if end < 0:
+            end = len(text)
+        name = section_heading(text[start:end])
+        if name is not None:
+            out.append((start, name))
+        if end >= len(text):
+            break
+        start = end + 1
+    return out
+
+
+def _fw_build(values: List[int]) -> List[int]:
+    # Fenwick tree (1-based) over values
+    tree = [0] + values
+    for i in range(1, len(tree)):
+        j = i + (i & -i)
+        if j < len(tree):
+            tree[j] += tree[i]
+    return tree
+
+
+def _fw_add(tree: List[int], i: int, v: int) -> None:
+    i += 1
+    while i < len(tree):
+        tree[i] += v
+        i += i & -i
+
+
+def _fw_sum(tree: List[int], i: int) -> int:
+    """Sum of values[0..i] (0 for i < 0)."""
+    i += 1
+    total = 0
+    while i > 0:
+        total += tree[i]
+        i -= i & -i
+    return total
+
+
+def _fw_find(tree: List[int], k: int) -> Tuple[int, int]:
+    """For non-negative values: (first j whose prefix sum exceeds k, k minus the sum before j)."""
+    pos = 0
+    step = 1 << (len(tree) - 1).bit_length()
+    while step:
+        nxt = pos + step
+        if nxt < len(tree) and tree[nxt] <= k:
+            pos = nxt
+            k -= tree[nxt]
+        step >>= 1
+    return pos, k
+
+
+class _Offsets:
+    """
+    Token start offsets, in blocks of about BLOCK entries stored relative to a
+    per-block base; the bases and block sizes are prefix sums in Fenwick trees.
+    replace() rewrites the one block an edit falls in and moves every later
+    block with a single O(log blocks) update, so an edit costs O(BLOCK +
+    log tokens) wherever it is. Blocks are re-cut when one grows past twice
+    BLOCK, empties, or an edit spans several of them.
+    """
+    BLOCK = 256
+
+    def __init__(self, offsets: Sequence[int]):
+        offsets = list(offsets)
+        self._blocks = [offsets[i:i + self.BLOCK] for i in range(0, len(offsets), self.BLOCK)]
+        self._reshape([0] * len(self._blocks))
+
+    def _reshape(self, bases: List[int]) -> None:
+        blocks, kept = [], []
+        for blk, base in zip(self._blocks, bases):
+            for i in range(0, len(blk), self.BLOCK):
+                blocks.append(blk[i:i + self.BLOCK])
+                kept.append(base)
+        self._blocks = blocks or [[]]
+        kept = kept or [0]
+        self._n = sum(len(b) for b in self._blocks)
+        self._sizes = _fw_build([len(b) for b in self._blocks])
+        self._bases = _fw_build([kept[0]] + [kept[i] - kept[i - 1] for i in range(1, len(kept))])
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _locate(self, i: int) -> Tuple[int, int]:
+        # (block, position in block) of entry i; i == len(self) is the end of the last block
+        if i >= self._n:
+            return len(self._blocks) - 1, len(self._blocks[-1])
+        return _fw_find(self._sizes, i)
+
+    def __getitem__(self, i: int) -> int:
+        j, p = self._locate(i)
+        return self._blocks[j][p] + _fw_sum(self._bases, j)
+
+    def __iter__(self) -> Iterator[int]:
+        for j, blk in enumerate(self._blocks):
+            base = _fw_sum(self._bases, j)
+            for o in blk:
+                yield o + base
+
+    def slice(self, lo: int, hi: int) -> List[int]:
+        """Offsets of entries [lo, hi), read block by block."""
+        out: List[int] = []
+        j, p = self._locate(lo)
+        while len(out) < hi - lo and j < len(self._blocks):
+            base = _fw_sum(self._bases, j)
+            out.extend(o + base for o in self._blocks[j][p:p + hi - lo - len(out)])
+            j, p = j + 1, 0
+        return out
+
+    def bisect_left(self, x: int) -> int:
+        """Index of the first offset >= x, like bisect.bisect_left on the plain list."""
+        blocks = self._blocks
+        lo, hi = 0, len(blocks) if self._n else 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if blocks[mid][-1] + _fw_sum(self._bases, mid) >= x:
+                hi = mid
+            else:
+                lo = mid + 1
+        if lo >= len(blocks) or not self._n:
+            return self._n
+        return _fw_sum(self._sizes, lo - 1) + bisect.bisect_left(blocks[lo], x - _fw_sum(self._bases, lo))
+
+    def replace(self, a: int, b: int, new: List[int], shift: int) -> None:
+        """Put the offsets new in place of entries [a, b) and add shift to the entries after them."""
+        ja, pa = self._locate(a)
+        jb, pb = self._locate(b) if b > a else (ja, pa)
+        base = _fw_sum(self._bases, ja)
+        if ja == jb:
+            blk = self._blocks[ja]
+            blk[pa:pb] = [o - base for o in new]
+            for i in range(pa + len(new), len(blk)):
+                blk[i] += shift
+            self._n += len(new) - (pb - pa)
+            _fw_add(self._sizes, ja, len(new) - (pb - pa))
+            if ja + 1 < len(self._blocks):
+                _fw_add(self._bases, ja + 1, shift)
+            if len(blk) > 2 * self.BLOCK or (not blk and len(self._blocks) > 1):
+                self._reshape([_fw_sum(self._bases, j) for j in range(len(self._blocks))])
+            return
+        # the replaced range spans blocks: merge them into one
+        bases = [_fw_sum(self._bases, j) for j in range(len(self._blocks))]
+        merged = self._blocks[ja][:pa] + [o - base for o in new] + \
+            [o + bases[jb] - base + shift for o in self._blocks[jb][pb:]]
+        self._blocks[ja:jb + 1] = [merged]
+        self._reshape(bases[:ja + 1] + [x + shift for x in bases[jb + 1:]])
+
+
+class _Semantic:
+    """TF-IDF cosine of two texts kept as running sums over per-term contributions."""
+
+    def __init__(self, engine: TfidfEngine, jd: str, resume: str):
+        self.engine = engine
+        self.tf = (Counter(sim_tokenize(jd)), Counter(sim_tokenize(resume)))
+        self.dot = self.norm_jd = self.norm_resume = 0.0
+        self._add(set(self.tf[0]) | set(self.tf[1]), 1)
+
+    def _add(self, terms: Iterable[str], sign: int) -> None:
+        jd_tf, res_tf = self.tf
+        for t in terms:
+            a, b = jd_tf.get(t, 0), res_tf.get(t, 0)
+            idf = self.engine.pair_idf(t, (a > 0) + (b > 0))
+            wa = (1.0 + math.log(a)) * idf if a else 0.0
+            wb = (1.0 + math.log(b)) * idf if b else 0.0
+            self.norm_jd += sign * wa * wa
+            self.norm_resume += sign * wb * wb
+            self.dot += sign * wa * wb
+
+    def update(self, side: int, delta: Counter) -> None:
+        """Apply a term-frequency delta (negative counts remove) to one side (0 = JD, 1 = resume)."""
+        delta = {t: n for t, n in delta.items() if n}
+        if not delta:
+            return
+        self._add(delta, -1)
+        tf = self.tf[side]
+        for t, n in delta.items():
+            _bump(tf, t, n)
+        self._add(delta, 1)
+
+    def value(self) -> float:
+        norm = math.sqrt(max(self.norm_jd, 0.0)) * math.sqrt(max(self.norm_resume, 0.0))
+        return self.dot / norm if norm > 1e-12 else 0.0
+
+
+class ScoreSession:
+    """
+    One resume/JD pair scored incrementally. apply() takes edits of either
+    text and score() returns the same fields as score_resume().
+    """
+
+    def __init__(self, parsed: Any, job_description: str, session_id: Optional[str] = None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.version = 0
+        self._lock = threading.Lock()
+        self._skills = get_skill_index()
+        self.jd = job_description or ""
+        self.profile = JobProfile(self.jd)
+        self.text = _resume_text(parsed)
+        model = parsed.get("model") if isinstance(parsed, dict) else None
+        if has_index(model):
+            self.tokens = list(model["index"]["tokens"])
+            self.offsets = _Offsets(model["index"]["offsets"])
+        else:
+            self.tokens, offsets = tokenize_with_offsets(self.text)
+            self.offsets = _Offsets(offsets)
+        self.headings = _headings(self.text, 0, len(self.text))
+        self._starts = [h[0] for h in self.headings]
+        # per token: length of the unit starting there (0 inside a unit) and its skill, if any
+        self.ulen: List[int] = []
+        self.ucanon: List[Optional[str]] = []
+        self.counts: Dict[str, int] = {}
+        self.sec_primary: Dict[str, Dict[str, int]] = {}
+        self.sec_secondary: Dict[str, Dict[Tuple[str, str], int]] = {}
+        for i, j, canon in self._scan(0):
+            self.ulen += [j - i] + [0] * (j - i - 1)
+            self.ucanon += [canon] + [None] * (j - i - 1)
+        self._count_units()
+        engine = get_engine()
+        self._semantic = _Semantic(engine, self.jd, self.text) if type(engine) is TfidfEngine else None
+
+    # --- units -------------------------------------------------------------
+
+    def _scan(self, i: int) -> Iterable[Tuple[int, int, Optional[str]]]:
+        """(start, end, canonical or None) for each unit from token i on, like SkillIndex.scan() plus gaps."""
+        tokens, match_at = self.tokens, self._skills.match_at
+        while i < len(tokens):
+            m = match_at(tokens, i)
+            j, canon = m if m is not None else (i + 1, None)
+            yield i, j, canon
+            i = j
+
+    def _section(self, offset: int, headings: Optional[List[Tuple[int, str]]] = None) -> str:
+        if headings is None:
+            headings, starts = self.headings, self._starts
+        else:
+            starts = [h[0] for h in headings]
+        i = bisect.bisect_right(starts, offset) - 1
+        return headings[i][1] if i >= 0 else "header"
+
+    def _apply_unit(self, token: str, canon: Optional[str], sec: Optional[str], sign: int,
+                    counts: bool = True) -> None:
+        # mirrors _terms() for counts and JobProfile.match_sections() per section (sec None: counts only)
+        variants = (canon,) if canon is not None else _stems((token,))
+        if counts:
+            for t in variants:
+                _bump(self.counts, t, sign)
+        if sec is None:
+            return
+        primary = canon if canon is not None else stem(token)
+        _bump(self.sec_primary.setdefault(primary, {}), sec, sign)
+        if canon is None and ("." in token or "-" in token):
+            for v in variants:
+                if v != primary:
+                    _bump(self.sec_secondary.setdefault(v, {}), (sec, primary), sign)
+
+    def _count_units(self) -> None:
+        for i, (n, off) in enumerate(zip(self.ulen, self.offsets)):
+            if n:
+                self._apply_unit(self.tokens[i], self.ucanon[i], self._section(off), 1)
+
+    # --- edits -------------------------------------------------------------
+
+    def apply(self, edits: List[Dict[str, Any]], version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply edits in order ({"target": "resume"|"jd", "start", "end", "text"};
+        offsets refer to the text as left by the previous edit) and return the
+        new score. version, if given, must match the session's current one.
+        """
+        with self._lock:
+            if version is not None and version != self.version:
+                raise VersionConflict(f"session is at version {self.version}, not {version}")
+            # validate everything first so a bad edit leaves the session untouched
+            lengths = {"resume": len(self.text), "jd": len(self.jd)}
+            for e in edits:
+                target = e.get("target", "resume")
+                if target not in lengths:
+                    raise SessionError(f"unknown edit target: {target!r}")
+                start, end, text = e.get("start"), e.get("end"), e.get("text") or ""
+                if not isinstance(start, int) or not isinstance(end, int) or not 0 <= start <= end <= lengths[target]:
+                    raise SessionError(f"bad range [{start}, {end}) for {target} of length {lengths[target]}")
+                lengths[target] += len(text) - (end - start)
+            with stage("session_update"):
+                for e in edits:
+                    if e.get("target", "resume") == "jd":
+                        self._edit_jd(e["start"], e["end"], e.get("text") or "")
+                    else:
+                        self._edit_resume(e["start"], e["end"], e.get("text") or "")
+                self.version += 1
+                return self._score()
+
+    def _edit_jd(self, start: int, end: int, text: str) -> None:
+        old = self.jd
+        self.jd = old[:start] + text + old[end:]
+        self.profile = JobProfile(self.jd)
+        if self._semantic is not None:
+            delta = Counter(sim_tokenize(self.jd))
+            delta.subtract(self._semantic.tf[0])
+            self._semantic.update(0, delta)
+
+    def _edit_resume(self, start: int, end: int, text: str) -> None:
+        old = self.text
+        n_old = len(self.tokens)
+        shift_chars = len(text) - (end - start)
+        # token-safe window: neither tokenizer crosses whitespace
+        ws = start
+        while ws > 0 and not old[ws - 1].isspace():
+            ws -= 1
+        we = end
+        while we < len(old) and not old[we].isspace():
+            we += 1
+        new_window = old[ws:start] + text + old[end:we]
+        a = self.offsets.bisect_left(ws)
+        b = self.offsets.bisect_left(we)
+        ntoks, noffs = tokenize_with_offsets(new_window)
+        noffs = [ws + o for o in noffs]
+
+        if self._semantic is not None:
+            delta = Counter(sim_tokenize(new_window))
+            delta.subtract(Counter(sim_tokenize(old[ws:we])))
+            self._semantic.update(1, delta)
+
+        # does the edit add, remove or change a heading line?
+        line_lo = old.rfind("\n", 0, start) + 1
+        line_hi = old.find("\n", end)
+        line_hi = len(old) if line_hi < 0 else line_hi
+        new = old[:start] + text + old[end:]
+        relabel = bool(_headings(old, line_lo, line_hi) or _headings(new, line_lo, line_hi + shift_chars))
+
+        # first unit whose alias lookahead (or context window) may reach the window
+        r = max(0, a - max(self._skills.reach, 1))
+        while 0 < r < n_old and self.ulen[r] == 0:
+            r -= 1
+        old_tokens_mid = self.tokens[a:b]
+        self.tokens[a:b] = ntoks
+        shift_toks = len(ntoks) - (b - a)
+        self.text = new
+
+        # rescan until a unit ends on an old unit boundary past the window and
+        # past the context window that looks back into it
+        reach_end = a + len(ntoks) + self._skills.context
+        new_units: List[Tuple[int, int, Optional[str]]] = []
+        q_old = n_old
+        for i, j, canon in self._scan(r):
+            new_units.append((i, j, canon))
+            k = j - shift_toks
+            if j >= reach_end and (k >= n_old or self.ulen[k] > 0):
+                q_old = k
+                break
+
+        # remove old units in [r, q_old); offsets are still the old ones here
+        k = r
+        while k < q_old:
+            if k < a:
+                tok = self.tokens[k]
+            elif k < b:
+                tok = old_tokens_mid[k - a]
+            else:
+                tok = self.tokens[k + shift_toks]
+            self._apply_unit(tok, self.ucanon[k], self._section(self.offsets[k]), -1)
+            k += self.ulen[k]
+        self.offsets.replace(a, b, noffs, shift_chars)
+
+        old_headings = self.headings
+        self.headings = [(s, name) for s, name in old_headings if s < line_lo]
+        if relabel:
+            self.headings += _headings(new, line_lo, line_hi + shift_chars)
+        self.headings += [(s + shift_chars, name) for s, name in old_headings if s > line_hi]
+        self._starts = [h[0] for h in self.headings]
+
+        ulen: List[int] = []
+        ucanon: List[Optional[str]] = []
+        for i, j, canon in new_units:
+            ulen.append(j - i)
+            ucanon.append(canon)
+            ulen.extend([0] * (j - i - 1))
+            ucanon.extend([None] * (j - i - 1))
+            self._apply_unit(self.tokens[i], canon, self._section(self.offsets[i]), 1)
+        self.ulen[r:q_old] = ulen
+        self.ucanon[r:q_old] = ucanon
+        if relabel:
+            # units outside the rescan that start between the edited line and the next
+            # heading after it may now belong to another section
+            nxt = [s for s, _ in old_headings if s > line_hi]
+            stop = self.offsets.bisect_left(nxt[0] + shift_chars if nxt else len(new) + 1)
+            lo = self.offsets.bisect_left(line_lo)
+            for i, hi, shift in ((lo, r, 0), (max(lo, q_old + shift_toks), stop, shift_chars)):
+                first, offsets = i, self.offsets.slice(i, hi)
+                while i < hi:
+                    if self.ulen[i]:
+                        was = self._section(offsets[i - first] - shift, old_headings)
+                        now = self._section(offsets[i - first])
+                        if was != now:
+                            self._apply_unit(self.tokens[i], self.ucanon[i], was, -1, counts=False)
+                            self._apply_unit(self.tokens[i], self.ucanon[i], now, 1, counts=False)
+                    i += self.ulen[i] or 1
+
+    # --- results -----------------------------------------------------------
+
+    def _section_matches(self, terms: Set[str]) -> Dict[str, List[str]]:
+        hits: Dict[str, Set[str]] = {}
+        for t in terms:
+            for sec in self.sec_primary.get(t, ()):
+                hits.setdefault(sec, set()).add(t)
+            for sec, primary in self.sec_secondary.get(t, ()):
+                if primary not in terms:
+                    hits.setdefault(sec, set()).add(t)
+        order = {"header": -1}
+        for i, (_, name) in enumerate(self.headings):
+            order.setdefault(name, i)
+        profile = self.profile
+        return {
+            sec: [k for k, t in zip(profile.keywords, profile.terms) if t in hits[sec]]
+            for sec in sorted(hits, key=order.get)
+        }
+
+    def _score(self) -> Dict[str, Any]:
+        profile = self.profile
+        keywords = profile.keywords
+        found = [k for k, t in zip(keywords, profile.terms) if t in self.counts]
+        found_set = set(found)
+        total_keywords = len(keywords)
+        coverage = (len(found) / total_keywords) if total_keywords > 0 else 0.0
+        total_weight = sum(profile.weights.values())
+        weighted_coverage = (sum(profile.weights[k] for k in found) / total_weight) if total_weight > 0 else 0.0
+        if not self.jd or not self.text:
+            semantic = 0.0
+        elif self._semantic is not None:
+            semantic = self._semantic.value()
+        else:
+            with stage("similarity"):
+                semantic = get_engine().similarity(self.jd, self.text)
+        ats_score = (coverage * KEYWORD_WEIGHT + semantic * SEMANTIC_WEIGHT) * 100
+        return {
+            "ats_score": round(float(ats_score), 2),
+            "semantic": round(float(semantic), 3),
+            "coverage": round(float(coverage), 3),
+            "weighted_coverage": round(float(weighted_coverage), 3),
+            "matched_keywords": found,
+            "missing_keywords": [k for k in keywords if k not in found_set],
+            "total_keywords": total_keywords,
+            "section_matches": self._section_matches(set(profile.terms)) if found else {},
+        }
+
+    def score(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._score()
+
+    def to_dict(self, texts: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            out = {"session_id": self.session_id, "version": self.version, "score": self._score()}
+            if texts:
+                out["resume_text"] = self.text
+                out["job_description"] = self.jd
+            return out
+
+    def snapshot(self) -> Tuple[int, str, str]:
+        """(version, resume text, JD) as of the last applied update."""
+        with self._lock:
+            return self.version, self.text, self.jd
+
+    def approx_bytes(self) -> int:
+        # text, JD, token strings and the per-token lists dominate
+        return 2 * (len(self.text) + len(self.jd)) + 120 * len(self.tokens) + 64 * len(self.counts)
+
+
+class SharedSessions:
+    """
+    Texts and version of each session in an SQLite file, for workers that
+    serve the same sessions. A save only moves a session forward.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, version INTEGER NOT NULL, "
+            "resume_text TEXT NOT NULL, job_description TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl if self.ttl is not None else 0.0
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM sessions WHERE session_id = ? AND updated >= ?", (session_id, self._cutoff())
+            ).fetchone()
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[Tuple[int, str, str]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT version, resume_text, job_description FROM sessions WHERE session_id = ? AND updated >= ?",
+                (session_id, self._cutoff()),
+            ).fetchone()
+
+    def create(self, session_id: str, version: int, text: str, jd: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE updated < ?", (self._cutoff(),))
+            self._conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                               (session_id, version, text, jd, time.time()))
+            self._conn.commit()
+
+    def save(self, session_id: str, version: int, text: str, jd: str) -> bool:
+        """Record a newer version; False if the stored one is already at or past it (or gone)."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE sessions SET version = ?, resume_text = ?, job_description = ?, updated = ? "
+                "WHERE session_id = ? AND version < ?",
+                (version, text, jd, time.time(), session_id, version),
+            )
+            self._conn.commit()
+        return cur.rowcount > 0
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+        return cur.rowcount > 0
+
+
+_SESSION_TTL = float(os.environ.get("SCORE_SESSION_TTL", "3600"))
+_sessions = LRUCache(
+    max_items=int(os.environ.get("SCORE_SESSION_ITEMS", "1024")),
+    max_bytes=512 * 1024 * 1024,
+    ttl=_SESSION_TTL,
+    sizeof=lambda s: s.approx_bytes(),
+)
+_shared = SharedSessions(os.environ["SCORE_SESSION_DB"], ttl=_SESSION_TTL) if os.environ.get("SCORE_SESSION_DB") else None
+_rebuilt = 0
+
+
+def create_session(parsed: Any, job_description: str) -> ScoreSession:
+    with stage("session_create"):
+        session = ScoreSession(parsed, job_description)
+    _sessions.set(session.session_id, session)
+    if _shared is not None:
+        _shared.create(session.session_id, *session.snapshot())
+    return session
+
+
+def _current(session_id: str) -> Optional[ScoreSession]:
+    """This process's copy of a session, rebuilt from the shared record when it is missing or behind."""
+    global _rebuilt
+    session = _sessions.get(session_id)
+    if _shared is None:
+        return session
+    version = _shared.version(session_id)
+    if version is None:
+        _sessions.delete(session_id)
+        return None
+    if session is not None and session.version == version:
+        return session
+    row = _shared.load(session_id)
+    if row is None:
+        return None
+    with stage("session_create"):
+        session = ScoreSession({"text": row[1]}, row[2], session_id=session_id)
+    session.version = row[0]
+    _rebuilt += 1
+    _sessions.set(session_id, session)
+    return session
+
+
+def get_session(session_id: str) -> Optional[ScoreSession]:
+    return _current(session_id)
+
+
+def update_session(session_id: str, edits: List[Dict[str, Any]], version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Apply edits to a session; returns {"session_id", "version", "score"} or None if unknown."""
+    session = _current(session_id)
+    if session is None:
+        return None
+    score = session.apply(edits, version)
+    if _shared is not None and not _shared.save(session_id, *session.snapshot()):
+        # another worker updated the same version first: this copy has diverged
+        _sessions.delete(session_id)
+        raise VersionConflict(f"session {session_id} was updated concurrently; fetch it and retry")
+    # re-store so the idle timeout restarts and the size estimate follows the text
+    _sessions.set(session_id, session)
+    return {"session_id": session_id, "version": session.version, "score": score}
+
+
+def delete_session(session_id: str) -> bool:
+    removed = _sessions.delete(session_id)
+    if _shared is not None:
+        removed = _shared.delete(session_id) or removed
+    return removed
+
+
+def session_stats() -> Dict[str, Any]:
+    s = _sessions.stats()
+    s["shared"] = _shared is not None
+    s["rebuilt"] = _rebuilt
+    return s
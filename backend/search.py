@@ -0,0 +1,329 @@
+# backend/search.py
+"""
+Recruiter search over parsed resumes: an on-disk SQLite FTS5 inverted index
+filled as documents are parsed (store_document() in backend/documents.py).
+
+Each resume is indexed with two columns: its text (porter-stemmed words)
+and its canonical skills from the taxonomy (backend/skills.py), stored as
+single tokens so "C++", "k8s" or "machine learning" match exactly. Queries
+are written recruiter-style and translated to an FTS5 expression:
+
+    kubernetes AND (golang OR rust) NOT php
+    "data pipelines" python          (adjacent terms are ANDed)
+
+Terms that name a skill (any alias) search the skills column, everything
+else the text. Results come back ranked by BM25 (skills weighted above
+text) or, in boolean mode, newest first with a total count; since_days
+keeps documents indexed within the last N days.
+
+Inserting or deleting a document is one small transaction; FTS5 keeps
+merging its segments in the background of writes, and compact() runs a
+full merge and truncates the WAL.
+
+Configuration (environment):
+  SEARCH_DB   path of the SQLite index file (default: disabled; resumes
+              are only stored on disk when this is set)
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from backend.metrics import log, stage
+from backend.resume_model import has_index
+from backend.skills import get_skill_index
+from backend.utils.text_cleanup import tokenize
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    indexed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_indexed ON documents (indexed);
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+    text, skills, tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+# bm25() column weights: text, skills
+_BM25 = "bm25(resume_fts, 1.0, 4.0)"
+_QUERY_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"?|([^\s()"]+))')
+_OPERATORS = ("AND", "OR", "NOT")
+
+
+class SearchQueryError(ValueError):
+    pass
+
+
+def skill_token(canonical: str) -> str:
+    """A canonical skill as one alphanumeric FTS token: 'c++' -> 'skillcpp', 'node.js' -> 'skillnodedotjs'."""
+    s = canonical.replace("+", "p").replace("#", "sharp").replace(".", "dot")
+    return "skill" + re.sub(r"[^a-z0-9]", "", s)
+
+
+def _terms(tokens: List[str]) -> List[str]:
+    """FTS terms for a run of query words: skills column for taxonomy hits, text otherwise."""
+    skills, rest = get_skill_index().split(tokens)
+    out = [f"skills:{skill_token(s)}" for s in skills]
+    out += [f'text:"{t}"' for t in rest if t.strip(".-")]
+    return out
+
+
+def _group(terms: List[str]) -> str:
+    return terms[0] if len(terms) == 1 else "(" + " AND ".join(terms) + ")"
+
+
+class _QueryParser:
+    """
+    Recursive descent over the recruiter query, emitting FTS5 syntax:
+      or  := and (OR and)*
+      and := not ([AND] not)*
+      not := primary (NOT primary)*
+      primary := '(' or ')' | "phrase" | word+
+    """
+
+    def __init__(self, query: str):
+        self.items: List[Tuple[str, str]] = []
+        pos = 0
+        query = query.strip()
+        while pos < len(query):
+            m = _QUERY_RE.match(query, pos)
+            if not m or m.end() == pos:
+                break
+            pos = m.end()
+            lparen, rparen, phrase, word = m.groups()
+            if lparen:
+                self.items.append(("(", lparen))
+            elif rparen:
+                self.items.append((")", rparen))
+            elif phrase is not None:
+                self.items.append(("phrase", phrase))
+            elif word.upper() in _OPERATORS:
+                self.items.append((word.upper(), word))
+            else:
+                self.items.append(("word", word))
+        self.i = 0
+
+    def parse(self) -> str:
+        if not self.items:
+            raise SearchQueryError("empty query")
+        expr = self._or()
+        if self.i < len(self.items):
+            raise SearchQueryError(f"unexpected {self.items[self.i][1]!r}")
+        return expr
+
+    def _peek(self) -> Optional[str]:
+        return self.items[self.i][0] if self.i < len(self.items) else None
+
+    def _or(self) -> str:
+        parts = [self._and()]
+        while self._peek() == "OR":
+            self.i += 1
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else "(" + " OR ".join(parts) + ")"
+
+    def _and(self) -> str:
+        parts = [self._not()]
+        while self._peek() in ("AND", "(", "phrase", "word"):
+            if self._peek() == "AND":
+                self.i += 1
+            parts.append(self._not())
+        return parts[0] if len(parts) == 1 else "(" + " AND ".join(parts) + ")"
+
+    def _not(self) -> str:
+        expr = self._primary()
+        while self._peek() == "NOT":
+            self.i += 1
+            expr = f"({expr} NOT {self._primary()})"
+        return expr
+
+    def _primary(self) -> str:
+        kind = self._peek()
+        if kind == "(":
+            self.i += 1
+            expr = self._or()
+            if self._peek() != ")":
+                raise SearchQueryError("missing ')'")
+            self.i += 1
+            return expr
+        if kind == "phrase":
+            tokens = tokenize(self.items[self.i][1])
+            self.i += 1
+            skills, rest = get_skill_index().split(tokens)
+            if len(skills) == 1 and not rest:
+                return f"skills:{skill_token(skills[0])}"
+            if not tokens:
+                raise SearchQueryError("empty phrase")
+            return 'text:"' + " ".join(tokens) + '"'
+        if kind == "word":
+            words = []
+            while self._peek() == "word":
+                words.append(self.items[self.i][1])
+                self.i += 1
+            terms = _terms(tokenize(" ".join(words)))
+            if not terms:
+                raise SearchQueryError(f"nothing searchable in {' '.join(words)!r}")
+            return _group(terms)
+        if kind is None:
+            raise SearchQueryError("query ends early")
+        if kind == "NOT":
+            raise SearchQueryError("NOT needs a term before it, e.g. 'python NOT php'")
+        raise SearchQueryError(f"unexpected {self.items[self.i][1]!r}")
+
+
+def translate_query(query: str) -> str:
+    """The FTS5 MATCH expression for a recruiter query (raises SearchQueryError)."""
+    return _QueryParser(query).parse()
+
+
+def document_skills(text: str, model: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Canonical skills mentioned in a resume, in first-seen order."""
+    tokens = model["index"]["tokens"] if has_index(model) else tokenize(text)
+    skills, _ = get_skill_index().split(tokens)
+    return list(dict.fromkeys(skills))
+
+
+class SearchIndex:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def add_many(self, docs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index documents ({"doc_id", "text", optional "filename", "model",
+        "indexed" timestamp}). A doc_id already present is re-indexed.
+        Returns the number written.
+        """
+        n = 0
+        with self._lock:
+            for doc in docs:
+                skills = " ".join(skill_token(s) for s in document_skills(doc["text"], doc.get("model")))
+                self._delete(doc["doc_id"])
+                cur = self._conn.execute(
+                    "INSERT INTO documents (doc_id, filename, indexed) VALUES (?, ?, ?)",
+                    (doc["doc_id"], doc.get("filename"), doc.get("indexed") or time.time()),
+                )
+                self._conn.execute("INSERT INTO resume_fts (rowid, text, skills) VALUES (?, ?, ?)",
+                                   (cur.lastrowid, doc["text"], skills))
+                n += 1
+            self._conn.commit()
+        return n
+
+    def add(self, doc_id: str, text: str, filename: Optional[str] = None,
+            model: Optional[Dict[str, Any]] = None) -> None:
+        self.add_many([{"doc_id": doc_id, "text": text, "filename": filename, "model": model}])
+
+    def _delete(self, doc_id: str) -> bool:
+        row = self._conn.execute("SELECT id FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM resume_fts WHERE rowid = ?", row)
+        self._conn.execute("DELETE FROM documents WHERE id = ?", row)
+        return True
+
+    def delete(self, doc_id: str) -> bool:
+        with self._lock:
+            found = self._delete(doc_id)
+            self._conn.commit()
+        return found
+
+    def __contains__(self, doc_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)).fetchone() is not None
+
+    def search(self, query: str, mode: str = "ranked", since_days: Optional[float] = None,
+               limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """
+        Run a recruiter query. mode "ranked" orders by BM25; "boolean" returns
+        every match newest first, with the total count.
+        """
+        if mode not in ("ranked", "boolean"):
+            raise SearchQueryError(f"unknown mode: {mode}")
+        fts = translate_query(query)
+        where, args = "resume_fts MATCH ?", [fts]
+        if since_days is not None:
+            where += " AND d.indexed >= ?"
+            args.append(time.time() - since_days * 86400)
+        order = "score" if mode == "ranked" else "d.indexed DESC, d.id DESC"
+        sql = (
+            f"SELECT d.doc_id, d.filename, d.indexed, {_BM25} AS score, "
+            "snippet(resume_fts, 0, '[', ']', '...', 12) "
+            f"FROM resume_fts JOIN documents d ON d.id = resume_fts.rowid WHERE {where} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?"
+        )
+        with stage("search"), self._lock:
+            try:
+                rows = self._conn.execute(sql, args + [limit, offset]).fetchall()
+                total = None
+                if mode == "boolean":
+                    total = self._conn.execute(
+                        f"SELECT COUNT(*) FROM resume_fts JOIN documents d ON d.id = resume_fts.rowid WHERE {where}", args
+                    ).fetchone()[0]
+            except sqlite3.OperationalError as e:
+                raise SearchQueryError(f"invalid query: {e}")
+        out = {
+            "query": query,
+            "fts": fts,
+            "mode": mode,
+            "results": [
+                {"doc_id": d, "filename": f, "indexed": ts, "score": round(-s, 4), "snippet": snip}
+                for d, f, ts, s, snip in rows
+            ],
+        }
+        if total is not None:
+            out["total"] = total
+        return out
+
+    def compact(self) -> Dict[str, Any]:
+        """Merge all FTS segments into one and truncate the WAL."""
+        with stage("search_compact"), self._lock:
+            self._conn.execute("INSERT INTO resume_fts (resume_fts) VALUES ('optimize')")
+            self._conn.commit()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            docs = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            segments = self._conn.execute("SELECT COUNT(*) FROM resume_fts_data").fetchone()[0]
+        size = sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p))
+        return {"documents": docs, "fts_blocks": segments, "bytes": size}
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """The process-wide index, or None when SEARCH_DB is not set."""
+    global _index
+    path = os.environ.get("SEARCH_DB")
+    if not path:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex(path)
+    return _index
+
+
+def index_document(doc_id: str, text: str, filename: Optional[str] = None,
+                   model: Optional[Dict[str, Any]] = None) -> None:
+    """Add a freshly parsed document to the search index, if enabled. Never raises."""
+    index = get_search_index()
+    if index is None:
+        return
+    try:
+        with stage("search_index"):
+            index.add(doc_id, text, filename, model)
+    except sqlite3.Error as e:
+        log.warning("search indexing failed for %s: %s", doc_id, e)
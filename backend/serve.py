@@ -0,0 +1,444 @@
+# backend/serve.py
+"""
+Multi-worker launcher for the API:
+
+    python -m backend.serve [--host 0.0.0.0] [--port 8000] [--workers 4]
+
+The supervisor binds the listening socket once and starts the workers,
+each a process running uvicorn with backend.main:app on that socket, so
+the kernel spreads connections across them. A worker is recycled (it stops
+accepting, finishes its in-flight requests and exits, and a new process
+takes its slot) after SERVE_MAX_REQUESTS requests, plus up to
+SERVE_MAX_REQUESTS_JITTER more so workers do not restart together, or when
+its RSS is above SERVE_MAX_RSS_MB after a request. A worker that dies is
+replaced the same way, with a growing delay if it keeps failing at startup.
+
+A request that runs past SERVE_REQUEST_TIMEOUT seconds is answered with
+504. Async handlers are cancelled at the deadline. Work already handed to
+a thread or pool process keeps running, bounded by the pool's own timeout
+and memory limit (POOL_<NAME>_TIMEOUT / _MAX_MB, backend/workers.py). A
+streamed response that passes the deadline is cut off.
+
+State the workers must agree on lives in files under SERVE_STATE_DIR.
+PARSE_CACHE_DB, RESULT_CACHE_DB and SCORE_SESSION_DB point there unless
+already set, and each worker keeps its memory LRU in front of them. Jobs,
+requisitions, artifacts and the search index are already shared through
+JOB_DIR, REQUISITION_DIR, ARTIFACT_DIR and SEARCH_DB. Only worker 0 runs
+bulk jobs (JOB_RUNNER=0 in the others). Every worker writes its counters
+to <SERVE_STATE_DIR>/workers.db every SERVE_HEARTBEAT seconds, and GET
+/workers/stats returns them.
+
+Each worker has its own process pools, so the host can run up to workers x
+(POOL_PARSE_WORKERS + POOL_SCORE_WORKERS) pool processes. Lower those
+settings when raising --workers.
+
+Configuration (environment; command-line flags take precedence):
+  SERVE_WORKERS              worker processes (default: CPU count, at most 8)
+  SERVE_MAX_REQUESTS         requests before a worker is recycled (default: never)
+  SERVE_MAX_REQUESTS_JITTER  extra requests allowed, random per worker (default: 10% of the above)
+  SERVE_MAX_RSS_MB           RSS above which a worker is recycled (default: none)
+  SERVE_REQUEST_TIMEOUT      seconds per request before a 504 (default: none)
+  SERVE_GRACEFUL_TIMEOUT     seconds a recycled or stopping worker gets to finish (default 30)
+  SERVE_HEARTBEAT            seconds between worker stats reports (default 2)
+  SERVE_STATE_DIR            shared caches and worker stats (default: <tmp>/airezume_serve)
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+log = logging.getLogger("airezume")
+
+# worker exit codes (uvicorn itself exits with 3 when startup fails)
+EXIT_MAX_REQUESTS = 64
+EXIT_RSS = 65
+_EXIT_REASONS = {0: "stopped", 3: "startup_failed", EXIT_MAX_REQUESTS: "max_requests", EXIT_RSS: "rss"}
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _env_float(name: str) -> Optional[float]:
+    v = os.environ.get(name)
+    return float(v) if v else None
+
+
+def _rss(pid: Any = "self") -> int:
+    """Resident set size of a process in bytes (0 where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _pool_rss() -> int:
+    # process pools started by this worker (parse, score, job runner)
+    return sum(_rss(p.pid) for p in multiprocessing.active_children())
+
+
+def _exit_reason(code: Optional[int]) -> str:
+    if code is not None and code < 0:
+        return f"signal {-code}"
+    return _EXIT_REASONS.get(code, f"exit {code}")
+
+
+class WorkerRegistry:
+    """Per-slot worker counters in SQLite, written by the workers and the supervisor."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS workers (slot INTEGER PRIMARY KEY, pid INTEGER, started REAL, updated REAL, "
+            "requests INTEGER NOT NULL DEFAULT 0, served INTEGER NOT NULL DEFAULT 0, inflight INTEGER NOT NULL DEFAULT 0, "
+            "timeouts INTEGER NOT NULL DEFAULT 0, rss_bytes INTEGER NOT NULL DEFAULT 0, "
+            "pool_rss_bytes INTEGER NOT NULL DEFAULT 0, recycles INTEGER NOT NULL DEFAULT 0, last_exit TEXT)"
+        )
+        self._conn.commit()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM workers")
+            self._conn.commit()
+
+    def report(self, row: Dict[str, Any]) -> None:
+        cols = ("slot", "pid", "started", "updated", "requests", "inflight", "timeouts", "rss_bytes", "pool_rss_bytes")
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO workers ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+                f"ON CONFLICT(slot) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in cols[1:])}",
+                [row[c] for c in cols],
+            )
+            self._conn.commit()
+
+    def recycled(self, slot: int, reason: str) -> None:
+        """Fold the exited process's requests into the slot's total and record why it exited."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO workers (slot, recycles, last_exit) VALUES (?, 1, ?) ON CONFLICT(slot) DO UPDATE SET "
+                "recycles = recycles + 1, last_exit = excluded.last_exit, served = served + requests, "
+                "requests = 0, inflight = 0, rss_bytes = 0, pool_rss_bytes = 0",
+                (slot, reason),
+            )
+            self._conn.commit()
+
+    def rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM workers ORDER BY slot")
+            names = [d[0] for d in cur.description]
+            rows = [dict(zip(names, r)) for r in cur.fetchall()]
+        now = time.time()
+        for r in rows:
+            started, updated = r.pop("started"), r.pop("updated")
+            r["uptime"] = round(now - started, 1) if started else 0.0
+            r["heartbeat_age"] = round(now - updated, 1) if updated else None
+            r["served"] += r["requests"]
+        return rows
+
+
+class WorkerState:
+    """Counters of the worker process serving requests here."""
+
+    def __init__(self, slot: int, max_rss: Optional[int] = None):
+        self.slot = slot
+        self.pid = os.getpid()
+        self.started = time.time()
+        self.max_rss = max_rss
+        self.requests = 0
+        self.inflight = 0
+        self.timeouts = 0
+        self.recycle_reason: Optional[str] = None
+        self.server = None
+
+    def row(self) -> Dict[str, Any]:
+        return {
+            "slot": self.slot, "pid": self.pid, "started": self.started, "updated": time.time(),
+            "requests": self.requests, "inflight": self.inflight, "timeouts": self.timeouts,
+            "rss_bytes": _rss(), "pool_rss_bytes": _pool_rss(),
+        }
+
+    def recycle(self, reason: str) -> None:
+        # uvicorn notices should_exit within a tick, then drains in-flight requests
+        if self.recycle_reason is None and self.server is not None:
+            self.recycle_reason = reason
+            self.server.should_exit = True
+            log.info("worker %d (pid %d) recycling: %s", self.slot, self.pid, reason)
+
+    def after_request(self) -> None:
+        self.requests += 1
+        if self.max_rss and _rss() > self.max_rss:
+            self.recycle("rss")
+
+    def exit_code(self) -> int:
+        if self.recycle_reason == "rss":
+            return EXIT_RSS
+        server = self.server
+        limit = getattr(server, "limit_max_requests", None)
+        if limit is not None and server.server_state.total_requests >= limit:
+            return EXIT_MAX_REQUESTS
+        return 0
+
+
+class WorkerApp:
+    """
+    Pure ASGI wrapper around the app a worker serves: request deadline,
+    in-flight and request counters, RSS check after each request.
+    """
+
+    def __init__(self, app, state: WorkerState, timeout: Optional[float] = None):
+        self.app = app
+        self.state = state
+        self.timeout = timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        state = self.state
+        started = False
+
+        async def _send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        state.inflight += 1
+        try:
+            if self.timeout is None:
+                await self.app(scope, receive, _send)
+                return
+            try:
+                await asyncio.wait_for(self.app(scope, receive, _send), self.timeout)
+            except asyncio.TimeoutError:
+                state.timeouts += 1
+                if started:
+                    raise
+                body = json.dumps({"detail": f"request exceeded {self.timeout}s"}).encode()
+                await send({"type": "http.response.start", "status": 504,
+                            "headers": [(b"content-type", b"application/json"),
+                                        (b"content-length", str(len(body)).encode())]})
+                await send({"type": "http.response.body", "body": body})
+        finally:
+            state.inflight -= 1
+            state.after_request()
+
+
+_state: Optional[WorkerState] = None
+_registry: Optional[WorkerRegistry] = None
+_STARTED = time.time()
+
+
+def _state_dir() -> str:
+    return os.environ.get("SERVE_STATE_DIR") or os.path.join(tempfile.gettempdir(), "airezume_serve")
+
+
+def worker_stats() -> Dict[str, Any]:
+    """
+    {"workers": [...], "current": slot}: every worker of a backend.serve
+    deployment, or just this process when the API runs without it.
+    """
+    if _state is None:
+        row = WorkerState(0).row()
+        del row["started"], row["updated"]
+        row.update(uptime=round(time.time() - _STARTED, 1), heartbeat_age=0.0, served=0, recycles=0, last_exit=None)
+        return {"workers": [row], "current": None}
+    _registry.report(_state.row())
+    return {"workers": _registry.rows(), "current": _state.slot}
+
+
+def _heartbeat(state: WorkerState, registry: WorkerRegistry, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        try:
+            registry.report(state.row())
+        except sqlite3.Error as e:
+            log.warning("worker %d: stats report failed: %s", state.slot, e)
+
+
+def _run_worker(slot: int, sockets: List[socket.socket], options: Dict[str, Any]) -> None:
+    """Entry point of a worker process."""
+    global _state, _registry
+    import uvicorn
+    from uvicorn.importer import import_from_string
+
+    os.environ["SERVE_WORKER"] = str(slot)
+    if slot != 0:
+        os.environ["JOB_RUNNER"] = "0"
+    max_rss = options["max_rss_mb"] * 1024 * 1024 if options["max_rss_mb"] else None
+    _state = state = WorkerState(slot, max_rss=max_rss)
+    _registry = registry = WorkerRegistry(os.path.join(_state_dir(), "workers.db"))
+    app = WorkerApp(import_from_string(options["app"]), state, timeout=options["request_timeout"])
+    config = uvicorn.Config(
+        app,
+        host=options["host"],
+        port=options["port"],
+        log_level=options["log_level"],
+        lifespan="on",
+        limit_max_requests=options["max_requests"],
+        limit_max_requests_jitter=options["max_requests_jitter"],
+        timeout_graceful_shutdown=options["graceful_timeout"],
+    )
+    state.server = server = uvicorn.Server(config)
+    registry.report(state.row())
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(state, registry, options["heartbeat"], stop),
+                     name="worker-heartbeat", daemon=True).start()
+    try:
+        server.run(sockets=sockets)
+    finally:
+        stop.set()
+        registry.report(state.row())
+    sys.exit(state.exit_code())
+
+
+class Supervisor:
+    """Starts the workers, replaces those that exit, and stops them all on SIGINT/SIGTERM."""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        self.workers = options["workers"]
+        self.registry = WorkerRegistry(os.path.join(_state_dir(), "workers.db"))
+        self._ctx = multiprocessing.get_context("spawn")
+        self._procs: Dict[int, Any] = {}
+        self._spawned: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._due: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self._sockets: List[socket.socket] = []
+
+    def _spawn(self, slot: int) -> None:
+        proc = self._ctx.Process(target=_run_worker, args=(slot, self._sockets, self.options),
+                                 name=f"airezume-worker-{slot}")
+        proc.start()
+        self._procs[slot] = proc
+        self._spawned[slot] = time.monotonic()
+        log.info("worker %d started (pid %d)", slot, proc.pid)
+
+    def _reap(self, slot: int, proc) -> None:
+        del self._procs[slot]
+        reason = _exit_reason(proc.exitcode)
+        self.registry.recycled(slot, reason)
+        delay = 0.0
+        if proc.exitcode not in (0, EXIT_MAX_REQUESTS, EXIT_RSS) and time.monotonic() - self._spawned[slot] < 5:
+            # failing at startup: back off instead of spinning
+            self._failures[slot] = self._failures.get(slot, 0) + 1
+            delay = min(30.0, 0.5 * 2 ** self._failures[slot])
+        else:
+            self._failures.pop(slot, None)
+        self._due[slot] = time.monotonic() + delay
+        level = logging.INFO if proc.exitcode in (EXIT_MAX_REQUESTS, EXIT_RSS) else logging.WARNING
+        log.log(level, "worker %d (pid %d) exited: %s; replacing%s", slot, proc.pid, reason,
+                f" in {delay:.1f}s" if delay else "")
+
+    def _handle_signal(self, signum, frame) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        import uvicorn
+
+        opts = self.options
+        config = uvicorn.Config(opts["app"], host=opts["host"], port=opts["port"], log_level=opts["log_level"])
+        self._sockets = [config.bind_socket()]
+        self.registry.reset()
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        log.info("serving %s on http://%s:%d with %d workers (state in %s)",
+                 opts["app"], opts["host"], opts["port"], self.workers, _state_dir())
+        for slot in range(self.workers):
+            self._spawn(slot)
+        try:
+            while not self._stop.is_set():
+                sentinels = [p.sentinel for p in self._procs.values()]
+                if sentinels:
+                    multiprocessing.connection.wait(sentinels, timeout=0.5)
+                else:
+                    self._stop.wait(0.5)
+                for slot, proc in list(self._procs.items()):
+                    if proc.exitcode is not None:
+                        self._reap(slot, proc)
+                now = time.monotonic()
+                for slot, due in list(self._due.items()):
+                    if due <= now and not self._stop.is_set():
+                        del self._due[slot]
+                        self._spawn(slot)
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        log.info("stopping %d workers", len(self._procs))
+        for proc in self._procs.values():
+            if proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + self.options["graceful_timeout"] + 5
+        for proc in self._procs.values():
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+        for sock in self._sockets:
+            sock.close()
+
+
+def _share_state(state_dir: str) -> None:
+    # set before the workers start so every one of them opens the same files
+    os.environ["SERVE_STATE_DIR"] = state_dir
+    for var, name in (("PARSE_CACHE_DB", "parse_cache.db"), ("RESULT_CACHE_DB", "result_cache.db"),
+                      ("SCORE_SESSION_DB", "sessions.db")):
+        os.environ.setdefault(var, os.path.join(state_dir, name))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m backend.serve", description="Run the API with several worker processes.")
+    ap.add_argument("app", nargs="?", default="backend.main:app")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8000")))
+    ap.add_argument("--workers", type=int, default=int(os.environ.get("SERVE_WORKERS", min(8, os.cpu_count() or 1))))
+    ap.add_argument("--max-requests", type=int, default=int(os.environ.get("SERVE_MAX_REQUESTS", "0")) or None)
+    ap.add_argument("--max-requests-jitter", type=int, default=None)
+    ap.add_argument("--max-rss-mb", type=int, default=int(os.environ.get("SERVE_MAX_RSS_MB", "0")) or None)
+    ap.add_argument("--request-timeout", type=float, default=_env_float("SERVE_REQUEST_TIMEOUT"))
+    ap.add_argument("--graceful-timeout", type=int, default=int(os.environ.get("SERVE_GRACEFUL_TIMEOUT", "30")))
+    ap.add_argument("--heartbeat", type=float, default=float(os.environ.get("SERVE_HEARTBEAT", "2")))
+    ap.add_argument("--state-dir", default=_state_dir())
+    ap.add_argument("--log-level", default="info")
+    args = ap.parse_args(argv)
+
+    jitter = args.max_requests_jitter
+    if jitter is None:
+        env_jitter = os.environ.get("SERVE_MAX_REQUESTS_JITTER")
+        jitter = int(env_jitter) if env_jitter else (args.max_requests or 0) // 10
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s supervisor %(levelname)s %(message)s")
+    _share_state(os.path.abspath(args.state_dir))
+    Supervisor({
+        "app": args.app,
+        "host": args.host,
+        "port": args.port,
+        "workers": max(1, args.workers),
+        "max_requests": args.max_requests,
+        "max_requests_jitter": jitter,
+        "max_rss_mb": args.max_rss_mb,
+        "request_timeout": args.request_timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "heartbeat": args.heartbeat,
+        "log_level": args.log_level,
+    }).run()
+
+
+if __name__ == "__main__":
+    # run main() from the importable module so the spawned workers and
+    # backend.main share one copy of it (and its worker state)
+    from backend import serve
+    serve.main()
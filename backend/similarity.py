@@ -0,0 +1,282 @@
+# backend/similarity.py
+"""
+Pluggable text similarity engines used for the ATS 'semantic' score.
+
+Engines turn texts into sparse term-weight vectors and score one query
+against many documents with a single sparse matrix-vector product.
+IDF can be fitted on a deployment's own resumes and JDs, persisted, and
+loaded by the shared engines at creation:
+
+    python -m backend.similarity --out idf.json DIR_OR_FILE [...]
+
+Without a table, IDF is estimated per (query, doc) pair from those two
+texts, exactly as similarity(a, b) does. Either way a resume scores the
+same alone (/score) as in any batch (/score/batch).
+
+Configuration (environment):
+  ATS_SIMILARITY_ENGINE  tfidf (default), bm25 or sequence
+  ATS_IDF_PATH           fitted table to load (default: none, per-pair IDF)
+"""
+from typing import Dict, List, Optional, Sequence
+from collections import Counter
+import argparse
+import json
+import math
+import os
+from difflib import SequenceMatcher
+
+import numpy as np
+from scipy import sparse
+
+from backend.utils.text_cleanup import tokenize_terms
+
+def tokenize(text: str) -> List[str]:
+    """The engines' tokenizer: lowercase runs of letters, digits, '+' and '#'."""
+    return tokenize_terms(text)
+
+
+class SimilarityEngine:
+    """
+    Base engine. Subclasses implement score(query, docs) -> np.ndarray of
+    one score per doc. similarity(a, b) is the one-vs-one convenience form.
+    """
+    name = "base"
+
+    def score(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def similarity(self, a: str, b: str) -> float:
+        if not a or not b:
+            return 0.0
+        return float(self.score(a, [b])[0])
+
+
+class SequenceEngine(SimilarityEngine):
+    """Legacy character-overlap ratio (difflib). Kept for comparison only."""
+    name = "sequence"
+
+    def score(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        return np.array([SequenceMatcher(None, query, d).ratio() if query and d else 0.0 for d in docs])
+
+
+class TfidfEngine(SimilarityEngine):
+    """
+    Cosine similarity over sublinear TF-IDF vectors.
+    Call fit()/partial_fit() with a corpus, or load() a saved table, to
+    cache document frequencies; when unfitted, each doc is scored with the
+    IDF of its (query, doc) pair.
+    """
+    name = "tfidf"
+
+    def __init__(self):
+        self._df: Counter = Counter()
+        self._n_docs = 0
+        self._n_tokens = 0
+
+    @property
+    def fitted(self) -> bool:
+        return self._n_docs > 0
+
+    def fit(self, corpus: Sequence[str]) -> "TfidfEngine":
+        self._df = Counter()
+        self._n_docs = 0
+        self._n_tokens = 0
+        return self.partial_fit(corpus)
+
+    def partial_fit(self, corpus: Sequence[str]) -> "TfidfEngine":
+        for doc in corpus:
+            toks = tokenize_terms(doc)
+            self._df.update(set(toks))
+            self._n_docs += 1
+            self._n_tokens += len(toks)
+        return self
+
+    def save(self, path: str) -> None:
+        """Write the fitted statistics as JSON (see load())."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"n_docs": self._n_docs, "n_tokens": self._n_tokens,
+                       "df": dict(sorted(self._df.items()))}, f, ensure_ascii=False, separators=(",", ":"))
+
+    def load(self, path: str) -> "TfidfEngine":
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+        self._df = Counter(table["df"])
+        self._n_docs = int(table["n_docs"])
+        self._n_tokens = int(table.get("n_tokens", 0))
+        return self
+
+    def pair_idf(self, term: str, df: int) -> float:
+        """
+        The IDF similarity(a, b) gives a term found in df (0-2) of the two
+        texts, for callers that maintain the cosine incrementally.
+        """
+        if self.fitted:
+            return math.log((1.0 + self._n_docs) / (1.0 + self._df.get(term, 0))) + 1.0
+        return math.log(3.0 / (1.0 + df)) + 1.0
+
+    def _idf(self, vocab: Dict[str, int], cols: np.ndarray, n_rows: int) -> np.ndarray:
+        if self.fitted:
+            n = self._n_docs
+            df = np.fromiter((self._df.get(t, 0) for t in vocab), dtype=np.float64, count=len(vocab))
+        else:
+            # each (row, term) pair appears once in cols
+            n = n_rows
+            df = np.bincount(cols, minlength=len(vocab)).astype(np.float64)
+        # smoothed idf, always > 0
+        return np.log((1.0 + n) / (1.0 + df)) + 1.0
+
+    def _weights(self, tf: np.ndarray, lengths: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return 1.0 + np.log(tf)
+
+    def _counts(self, texts: Sequence[str]):
+        """Term counts of texts as (rows, cols, tf, lengths, vocab); rows is None if all are empty."""
+        vocab: Dict[str, int] = {}
+        rows, cols, tf = [], [], []
+        lengths = np.zeros(len(texts), dtype=np.float64)
+        for i, text in enumerate(texts):
+            toks = tokenize_terms(text)
+            if not toks:
+                continue
+            ids = np.fromiter((vocab.setdefault(t, len(vocab)) for t in toks), dtype=np.int64, count=len(toks))
+            uniq, counts = np.unique(ids, return_counts=True)
+            rows.append(np.full(len(uniq), i, dtype=np.int64))
+            cols.append(uniq)
+            tf.append(counts)
+            lengths[i] = len(toks)
+        if not rows:
+            return None, None, None, lengths, vocab
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(tf).astype(np.float64), lengths, vocab
+
+    def _matrix(self, texts: Sequence[str]):
+        rows, cols, tf, lengths, vocab = self._counts(texts)
+        if rows is None:
+            return sparse.csr_matrix((len(texts), 1)), np.zeros(1)
+        idf = self._idf(vocab, cols, len(texts))
+        vals = self._weights(tf, lengths, rows) * idf[cols]
+        return sparse.csr_matrix((vals, (rows, cols)), shape=(len(texts), len(vocab))), idf
+
+    def score(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        if not docs:
+            return np.zeros(0)
+        if not self.fitted:
+            return self._pair_scores(query, docs)
+        return self._scores(query, docs)
+
+    def _pair_scores(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        """
+        Cosine of the query with each doc under that pair's IDF (see pair_idf()):
+        shared terms get idf 1, terms in only one of the two log(3/2) + 1. The
+        query's norm then depends on the doc, so it is summed per row.
+        """
+        rows, cols, tf, _, vocab = self._counts([query] + list(docs))
+        if rows is None:
+            return np.zeros(len(docs))
+        m = sparse.csr_matrix((1.0 + np.log(tf), (rows, cols)), shape=(len(docs) + 1, len(vocab)))
+        q = m[0].toarray().ravel()
+        d = m[1:]
+        u2 = (math.log(1.5) + 1.0) ** 2
+        dot = d @ q
+        d_sq = d.multiply(d)
+        d_shared = d_sq @ (q > 0).astype(np.float64)
+        d_total = np.asarray(d_sq.sum(axis=1)).ravel()
+        q_shared = (d > 0).astype(np.float64) @ (q * q)
+        q_total = float(q @ q)
+        norms = np.sqrt((d_shared + u2 * (d_total - d_shared)) * (q_shared + u2 * (q_total - q_shared)))
+        return np.divide(dot, norms, out=np.zeros(len(docs)), where=norms > 0)
+
+    def _scores(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        m, _ = self._matrix([query] + list(docs))
+        norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        m = sparse.diags(1.0 / norms) @ m
+        q = m[0].T
+        return np.asarray((m[1:] @ q).todense()).ravel()
+
+
+class BM25Engine(TfidfEngine):
+    """
+    Okapi BM25 with the query as a bag of terms. Scores are normalised by
+    the query's score against itself so they fall roughly in 0..1.
+    """
+    name = "bm25"
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        super().__init__()
+        self.k1 = k1
+        self.b = b
+
+    def _weights(self, tf: np.ndarray, lengths: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        if self.fitted and self._n_tokens:
+            avgdl = self._n_tokens / self._n_docs
+        else:
+            avgdl = lengths.mean() if len(lengths) else 1.0
+        dl = lengths[rows] / (avgdl or 1.0)
+        return tf * (self.k1 + 1.0) / (tf + self.k1 * (1.0 - self.b + self.b * dl))
+
+    def _pair_scores(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        return np.array([self._scores(query, [d])[0] for d in docs])
+
+    def _scores(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        m, idf = self._matrix([query] + list(docs))
+        q = (m[0] > 0).astype(np.float64).T
+        scores = np.asarray((m @ q).todense()).ravel()
+        top = scores[0] or 1.0
+        return np.clip(scores[1:] / top, 0.0, 1.0)
+
+
+_ENGINES = {
+    "tfidf": TfidfEngine,
+    "bm25": BM25Engine,
+    "sequence": SequenceEngine,
+}
+_instances: Dict[str, SimilarityEngine] = {}
+
+def register_engine(name: str, cls) -> None:
+    _ENGINES[name] = cls
+    _instances.pop(name, None)
+
+def get_engine(name: Optional[str] = None) -> SimilarityEngine:
+    """
+    Return the shared engine instance for name (default: $ATS_SIMILARITY_ENGINE or 'tfidf').
+    """
+    name = name or os.environ.get("ATS_SIMILARITY_ENGINE", "tfidf")
+    if name not in _ENGINES:
+        raise ValueError(f"unknown similarity engine: {name}")
+    if name not in _instances:
+        engine = _ENGINES[name]()
+        if isinstance(engine, TfidfEngine):
+            path = os.environ.get("ATS_IDF_PATH")
+            if path and path.lower() != "none":
+                engine.load(path)
+        _instances[name] = engine
+    return _instances[name]
+
+
+def _corpus_texts(paths: Sequence[str]):
+    from backend.parser import parse_pdf_bytes
+
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(os.path.join(path, n) for n in os.listdir(path))
+            yield from _corpus_texts([n for n in names if n.endswith((".txt", ".pdf", ".docx"))])
+            continue
+        with open(path, "rb") as f:
+            text = parse_pdf_bytes(f.read(), filename=os.path.basename(path))
+        if text:
+            yield text
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fit IDF statistics on resumes/JDs (.txt, .pdf, .docx) for ATS_IDF_PATH.")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("paths", nargs="+", help="files, or directories of files")
+    args = ap.parse_args()
+    engine = TfidfEngine().fit(_corpus_texts(args.paths))
+    if not engine.fitted:
+        raise SystemExit("no documents found")
+    engine.save(args.out)
+    print(f"fitted {engine._n_docs} documents, {len(engine._df)} terms -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
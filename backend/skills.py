@@ -0,0 +1,213 @@
+# backend/skills.py
+"""
+Skill taxonomy lookup: maps aliases ("sklearn", "JS", "k8s", "CI/CD") to a
+canonical skill name so JD and resume tokens meet on the same term.
+
+The taxonomy (SKILL_ALIASES in backend/utils/constants.py, plus an optional
+JSON file) is compiled once into a token trie of nested dicts. scan() walks
+a token list left to right taking the longest alias at each position, so
+the cost is one dict lookup per token (a few more at the start of a
+multi-word alias) no matter how many skills the taxonomy holds.
+
+Context aliases (SKILL_CONTEXT_ALIASES, e.g. "go" for golang) are words
+that name the skill only in technical prose. They count when another
+skill, or a word such as "language" or "developer", lies within
+CONTEXT_WINDOW tokens on either side, so "Python, Go and Rust" credits
+golang and "ready to go" does not.
+
+Configuration (environment):
+  SKILL_TAXONOMY_PATH  JSON file {"canonical": ["alias", ...], ...} merged
+                       over the bundled taxonomy (default: none)
+"""
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+import json
+import os
+import threading
+
+from backend.utils.constants import SKILL_ALIASES, SKILL_CONTEXT_ALIASES, SKILL_CONTEXT_WORDS
+from backend.utils.text_cleanup import tokenize
+
+# trie node keys marking the end of an alias / a context alias; tokens never contain them
+_END = "\0"
+_CTX = "\1"
+CONTEXT_WINDOW = 3
+
+
+def _key(token: str) -> str:
+    # "python." at the end of a sentence is "python"; ".net" keeps its dot
+    return token.rstrip(".-") if token[-1] in ".-" else token
+
+
+class SkillIndex:
+    def __init__(self, taxonomy: Mapping[str, Iterable[str]],
+                 context_aliases: Optional[Mapping[str, Iterable[str]]] = None,
+                 context_words: Iterable[str] = ()):
+        self._root: Dict[str, dict] = {}
+        self.max_len = 0
+        self.size = 0
+        for canonical, aliases in taxonomy.items():
+            canon = canonical.lower()
+            for form in (canonical, *aliases):
+                self._add([_key(t) for t in tokenize(form)], canon)
+            self.size += 1
+        for canonical, aliases in (context_aliases or {}).items():
+            for form in aliases:
+                self._add([_key(t) for t in tokenize(form)], canonical.lower(), _CTX)
+        self._context_words = frozenset(context_words)
+        # tokens before a match that can decide it (0: no context aliases), and
+        # tokens from its start on that can: the alias, then the window and a
+        # skill starting in it
+        self.context = CONTEXT_WINDOW if context_aliases else 0
+        self.reach = self.max_len + (self.context + self.max_len if self.context else 0)
+
+    def _add(self, tokens: List[str], canonical: str, marker: str = _END) -> None:
+        tokens = [t for t in tokens if t]
+        if not tokens:
+            return
+        node = self._root
+        for t in tokens:
+            node = node.setdefault(t, {})
+        # first definition wins, so an alias cannot silently move between skills
+        node.setdefault(marker, canonical)
+        self.max_len = max(self.max_len, len(tokens))
+
+    def _longest(self, tokens: List[str], i: int, node: dict) -> Optional[Tuple[int, str]]:
+        """(end, canonical) of the longest alias starting at tokens[i] (node: its first trie node)."""
+        end, canon, ctx_end, ctx = 0, None, 0, None
+        j, n = i, len(tokens)
+        while True:
+            j += 1
+            c = node.get(_END)
+            if c is not None:
+                end, canon = j, c
+            elif self.context:
+                c = node.get(_CTX)
+                if c is not None:
+                    ctx_end, ctx = j, c
+            if j >= n:
+                break
+            node = node.get(_key(tokens[j]))
+            if node is None:
+                break
+        if ctx is not None and ctx_end > end and self._in_context(tokens, i, ctx_end):
+            return ctx_end, ctx
+        return (end, canon) if canon is not None else None
+
+    def _in_context(self, tokens: List[str], i: int, j: int) -> bool:
+        """Is another skill or a context word within the window around tokens[i:j]?"""
+        lo, hi = max(0, i - self.context), min(len(tokens), j + self.context)
+        for k in (*range(lo, i), *range(j, hi)):
+            t = tokens[k]
+            if t in self._context_words or _key(t) in self._context_words:
+                return True
+            node = self._root.get(t) or (self._root.get(_key(t)) if t[-1] in ".-" else None)
+            if node is not None and self._plain_match(tokens, k, node):
+                return True
+        return False
+
+    def _plain_match(self, tokens: List[str], i: int, node: dict) -> bool:
+        j, n = i, len(tokens)
+        while True:
+            j += 1
+            if _END in node:
+                return True
+            if j >= n:
+                return False
+            node = node.get(_key(tokens[j]))
+            if node is None:
+                return False
+
+    def __len__(self) -> int:
+        return self.size
+
+    def lookup(self, text: str) -> Optional[str]:
+        """Canonical skill for a whole alias string, or None."""
+        tokens = tokenize(text)
+        for i, j, canon in self.scan(tokens):
+            if i == 0 and j == len(tokens):
+                return canon
+        return None
+
+    def scan(self, tokens: List[str]) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (start, end, canonical) for each skill found in tokens,
+        longest alias first, spans not overlapping.
+        """
+        root = self._root
+        n = len(tokens)
+        i = 0
+        while i < n:
+            node = root.get(tokens[i])
+            if node is None:
+                t = tokens[i]
+                if t[-1] not in ".-":
+                    i += 1
+                    continue
+                node = root.get(_key(t))
+                if node is None:
+                    i += 1
+                    continue
+            m = self._longest(tokens, i, node)
+            if m is None:
+                i += 1
+                continue
+            yield i, m[0], m[1]
+            i = m[0]
+
+    def match_at(self, tokens: List[str], i: int) -> Optional[Tuple[int, str]]:
+        """
+        (end, canonical) of the longest alias starting at tokens[i], or None.
+        scan() is this applied left to right, skipping past each match.
+        """
+        t = tokens[i]
+        node = self._root.get(t)
+        if node is None:
+            if t[-1] not in ".-":
+                return None
+            node = self._root.get(_key(t))
+            if node is None:
+                return None
+        return self._longest(tokens, i, node)
+
+    def split(self, tokens: List[str]) -> Tuple[List[str], List[str]]:
+        """Return (canonical skills in order, the tokens not part of any skill)."""
+        skills: List[str] = []
+        rest: List[str] = []
+        last = 0
+        for i, j, canon in self.scan(tokens):
+            rest.extend(tokens[last:i])
+            skills.append(canon)
+            last = j
+        rest.extend(tokens[last:])
+        return skills, rest
+
+
+_index: Optional[SkillIndex] = None
+_lock = threading.Lock()
+
+
+def load_taxonomy(path: Optional[str] = None) -> Dict[str, Tuple[str, ...]]:
+    taxonomy = dict(SKILL_ALIASES)
+    path = path or os.environ.get("SKILL_TAXONOMY_PATH")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            extra = json.load(f)
+        for canonical, aliases in extra.items():
+            taxonomy[canonical] = tuple(aliases or ())
+    return taxonomy
+
+
+def get_skill_index() -> SkillIndex:
+    """The process-wide index, compiled on first use (the API warms it at startup)."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = SkillIndex(load_taxonomy(), SKILL_CONTEXT_ALIASES, SKILL_CONTEXT_WORDS)
+    return _index
+
+
+def set_skill_index(index: SkillIndex) -> None:
+    """Swap the process-wide index (e.g. a larger taxonomy in benchmarks)."""
+    global _index
+    _index = index
@@ -1,83 +1,389 @@
-# backend/template_engine.py
-import os
-import tempfile
-from typing import Dict, Any
-from docx import Document
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-import uuid
-
-def generate_docx(enhanced: Dict[str, Any]) -> str:
-    """
-    Generate a .docx from enhanced dict and return path.
-    """
-    doc = Document()
-    name = enhanced.get("name", "")
-    summary = enhanced.get("summary", "")
-    bullets = enhanced.get("bullets", []) or []
-    text = enhanced.get("text", "")
-
-    if name:
-        doc.add_heading(name, level=1)
-    if summary:
-        doc.add_paragraph(summary)
-    if bullets:
-        doc.add_paragraph("")
-        for b in bullets:
-            doc.add_paragraph(b, style='List Bullet')
-
-    # Also append raw text at end
-    if text:
-        doc.add_paragraph("")
-        doc.add_paragraph(text)
-
-    tmpdir = tempfile.gettempdir()
-    fname = f"enhanced_{uuid.uuid4().hex[:8]}.docx"
-    path = os.path.join(tmpdir, fname)
-    doc.save(path)
-    return path
-
-def generate_pdf_from_text(text: str, name: str = "candidate") -> str:
-    """
-    Simple PDF generation using reportlab. Returns file path.
-    """
-    tmpdir = tempfile.gettempdir()
-    fname = f"resume_{uuid.uuid4().hex[:8]}.pdf"
-    path = os.path.join(tmpdir, fname)
-
-    c = canvas.Canvas(path, pagesize=letter)
-    width, height = letter
-    margin = 50
-    max_width = width - 2 * margin
-    y = height - margin
-
-    # Title
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(margin, y, name)
-    y -= 24
-
-    c.setFont("Helvetica", 10)
-    lines = text.splitlines()
-    for line in lines:
-        # wrap long lines
-        while line and y > margin:
-            if len(line) < 90:
-                c.drawString(margin, y, line)
-                y -= 14
-                break
-            else:
-                # take slice approx
-                part = line[:90]
-                # try to cut at space
-                last_space = part.rfind(" ")
-                if last_space > 0:
-                    part = line[:last_space]
-                c.drawString(margin, y, part)
-                y -= 14
-                line = line[len(part):].lstrip()
-        if y <= margin + 20:
-            c.showPage()
-            y = height - margin
-            c.setFont("Helvetica", 10)
-    c.save()
-    return path
+# backend/template_engine.py
+"""
+Resume rendering to DOCX and PDF.
+
+Named templates (TEMPLATES) are compiled once, on first use or at startup
+with WARMUP=render (compile_templates()), into:
+  - a DOCX base: the default package with the template's styles applied,
+    pre-zipped without word/document.xml, plus resolved style ids. A render
+    only builds and zips the new document.xml.
+  - PDF fonts registered with reportlab and per-(font, size) glyph width
+    tables, used for width-based line wrapping.
+Both formats render from the same block layout built by layout_blocks().
+Output is byte-for-byte deterministic (fixed zip timestamps, invariant PDF
+metadata), so identical inputs give identical files across processes;
+RENDER_VERSION is part of the export cache key and ETag.
+
+python-docx and reportlab are imported when a template is first compiled,
+so importing this module (e.g. in a /score-only worker) does not load them.
+"""
+import copy
+import io
+import os
+import tempfile
+import threading
+import zipfile
+from typing import Dict, Any, List, Optional, Tuple
+import uuid
+
+from backend.metrics import stage
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PDF_MIME = "application/pdf"
+DEFAULT_TEMPLATE = os.environ.get("RESUME_TEMPLATE", "classic")
+# bump when rendered output changes for the same input (invalidates cached exports)
+RENDER_VERSION = "2"
+# zip member timestamp, so the same document always zips to the same bytes
+_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+_WORD_CACHE_MAX = 50000
+
+
+class WidthTable:
+    """Glyph advance widths for one font at one size, filled on first use of each character."""
+
+    def __init__(self, font: str, size: float):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        self._string_width = stringWidth
+        self.font = font
+        self.size = size
+        self._widths: Dict[str, float] = {}
+        self._words: Dict[str, float] = {}
+
+    def width(self, s: str) -> float:
+        w = self._widths
+        total = 0.0
+        for ch in s:
+            cw = w.get(ch)
+            if cw is None:
+                cw = w[ch] = self._string_width(ch, self.font, self.size)
+            total += cw
+        return total
+
+    def word_width(self, word: str) -> float:
+        """Width of a whole word, memoised (resume vocabularies repeat a lot)."""
+        ww = self._words.get(word)
+        if ww is None:
+            if len(self._words) >= _WORD_CACHE_MAX:
+                self._words.clear()
+            ww = self._words[word] = self.width(word)
+        return ww
+
+    def wrap(self, text: str, max_width: float) -> List[str]:
+        """Greedy word wrap by measured width; words wider than a line are split."""
+        lines: List[str] = []
+        space = self.width(" ")
+        cur, cur_w = [], 0.0
+        for word in text.split():
+            ww = self.word_width(word)
+            while ww > max_width:
+                # hard-split an over-long word
+                if cur:
+                    lines.append(" ".join(cur))
+                    cur, cur_w = [], 0.0
+                i, acc = 0, 0.0
+                while i < len(word) and acc + self.width(word[i]) <= max_width:
+                    acc += self.width(word[i])
+                    i += 1
+                i = max(i, 1)
+                lines.append(word[:i])
+                word = word[i:]
+                ww = self.width(word)
+            if not word:
+                continue
+            if cur and cur_w + space + ww > max_width:
+                lines.append(" ".join(cur))
+                cur, cur_w = [], 0.0
+            cur_w = ww if not cur else cur_w + space + ww
+            cur.append(word)
+        if cur:
+            lines.append(" ".join(cur))
+        return lines
+
+
+def _zip_info(name: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+class ResumeTemplate:
+    """
+    A named layout. PDF fonts are reportlab font names; ttf_path optionally
+    registers a TrueType font under pdf_font. DOCX styling is applied to the
+    base document's Normal style.
+    """
+
+    def __init__(self, name: str, pdf_font: str = "Helvetica", pdf_bold_font: str = "Helvetica-Bold",
+                 title_size: float = 14, body_size: float = 10, leading: float = 14, margin: float = 50,
+                 bullet: str = "-", docx_font: Optional[str] = None, docx_size: Optional[float] = None,
+                 ttf_path: Optional[str] = None, ttf_bold_path: Optional[str] = None):
+        self.name = name
+        self.pdf_font = pdf_font
+        self.pdf_bold_font = pdf_bold_font
+        self.title_size = title_size
+        self.body_size = body_size
+        self.leading = leading
+        self.margin = margin
+        self.bullet = bullet
+        self.docx_font = docx_font
+        self.docx_size = docx_size
+        self.ttf_path = ttf_path
+        self.ttf_bold_path = ttf_bold_path
+        self.compiled = False
+
+    def compile(self) -> "ResumeTemplate":
+        from docx import Document
+        from docx.shared import Pt
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        if self.ttf_path:
+            pdfmetrics.registerFont(TTFont(self.pdf_font, self.ttf_path))
+        if self.ttf_bold_path:
+            pdfmetrics.registerFont(TTFont(self.pdf_bold_font, self.ttf_bold_path))
+        self.body_widths = WidthTable(self.pdf_font, self.body_size)
+        self.title_widths = WidthTable(self.pdf_bold_font, self.title_size)
+
+        doc = Document()
+        normal = doc.styles["Normal"]
+        if self.docx_font:
+            normal.font.name = self.docx_font
+        if self.docx_size:
+            normal.font.size = Pt(self.docx_size)
+        self.style_ids = {
+            "title": doc.styles["Heading 1"].style_id,
+            "bullet": doc.styles["List Bullet"].style_id,
+        }
+        doc.element.body.clear_content()
+        self._document_element = doc.element
+        buf = io.BytesIO()
+        doc.save(buf)
+        prefix = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(buf.getvalue())) as src, \
+                zipfile.ZipFile(prefix, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.filename != "word/document.xml":
+                    dst.writestr(_zip_info(info.filename), src.read(info.filename))
+        self._docx_prefix = prefix.getvalue()
+        self.compiled = True
+        return self
+
+
+TEMPLATES: Dict[str, ResumeTemplate] = {
+    "classic": ResumeTemplate("classic"),
+    "compact": ResumeTemplate("compact", pdf_font="Times-Roman", pdf_bold_font="Times-Bold",
+                              title_size=12, body_size=9, leading=11.5, margin=40,
+                              docx_font="Times New Roman", docx_size=10),
+}
+_compile_lock = threading.Lock()
+
+
+def compile_templates() -> None:
+    """Compile every registered template now instead of on first render."""
+    for name in TEMPLATES:
+        get_template(name)
+
+
+def get_template(name: Optional[str] = None) -> ResumeTemplate:
+    name = name or DEFAULT_TEMPLATE
+    tpl = TEMPLATES.get(name)
+    if tpl is None:
+        raise ValueError(f"unknown template: {name}")
+    if not tpl.compiled:
+        with _compile_lock:
+            if not tpl.compiled:
+                tpl.compile()
+    return tpl
+
+
+def layout_blocks(enhanced: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    The shared document layout: (kind, text) blocks with kind in
+    title / para / blank / bullet / text (multi-line raw text).
+    """
+    name = enhanced.get("name", "")
+    summary = enhanced.get("summary", "")
+    bullets = enhanced.get("bullets", []) or []
+    skills = enhanced.get("skills", []) or []
+    text = enhanced.get("text", "")
+
+    blocks: List[Tuple[str, str]] = []
+    if name:
+        blocks.append(("title", name))
+    if summary:
+        blocks.append(("para", summary))
+    if bullets:
+        blocks.append(("blank", ""))
+        blocks.extend(("bullet", b) for b in bullets)
+    if skills:
+        blocks.append(("para", "Skills: " + ", ".join(skills)))
+    # Also append raw text at end
+    if text:
+        blocks.append(("blank", ""))
+        blocks.append(("text", text))
+    return blocks
+
+
+def render_docx(enhanced: Dict[str, Any], template: Optional[str] = None) -> bytes:
+    """
+    Render a .docx from enhanced dict into memory and return its bytes.
+    """
+    with stage("render_docx"):
+        # compiling imports python-docx under the compile lock; importing its
+        # submodules before that races a concurrent first render (/generate/pdf)
+        tpl = get_template(template)
+        from docx.opc.oxml import serialize_part_xml
+        from docx.text.paragraph import Paragraph
+
+        element = copy.deepcopy(tpl._document_element)
+        body = element.body
+        for kind, value in layout_blocks(enhanced):
+            p = body.add_p()
+            if value:
+                Paragraph(p, None).add_run(value)
+            if kind == "title":
+                p.style = tpl.style_ids["title"]
+            elif kind == "bullet":
+                p.style = tpl.style_ids["bullet"]
+        # keep the section properties last, as Word expects
+        sect = body.sectPr
+        if sect is not None:
+            body.remove(sect)
+            body.append(sect)
+
+        buf = io.BytesIO(tpl._docx_prefix)
+        buf.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(buf, "a", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(_zip_info("word/document.xml"), serialize_part_xml(element))
+        return buf.getvalue()
+
+
+def generate_docx(enhanced: Dict[str, Any]) -> str:
+    """
+    Generate a .docx from enhanced dict and return path (in the temp dir).
+    The API streams render_docx() instead; this is kept for scripts.
+    """
+    path = os.path.join(tempfile.gettempdir(), f"enhanced_{uuid.uuid4().hex[:8]}.docx")
+    with open(path, "wb") as f:
+        f.write(render_docx(enhanced))
+    return path
+
+
+class _PdfWriter:
+    """
+    Line-oriented writer over a reportlab canvas with page breaks. Body text
+    goes through one text object per page rather than a drawString per line.
+    """
+
+    def __init__(self, buf, tpl: ResumeTemplate):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+
+        self.tpl = tpl
+        # invariant: fixed creation date and document id
+        self.c = canvas.Canvas(buf, pagesize=letter, invariant=1)
+        self.width, self.height = letter
+        self.max_width = self.width - 2 * tpl.margin
+        self.y = self.height - tpl.margin
+        self.t = None
+
+    def _text(self):
+        if self.t is None:
+            self.t = self.c.beginText()
+            self.t.setFont(self.tpl.pdf_font, self.tpl.body_size)
+        return self.t
+
+    def _flush(self) -> None:
+        if self.t is not None:
+            self.c.drawText(self.t)
+            self.t = None
+
+    def _room(self, needed: float) -> None:
+        if self.y - needed < self.tpl.margin:
+            self._flush()
+            self.c.showPage()
+            self.y = self.height - self.tpl.margin
+
+    def _line(self, x: float, text: str) -> None:
+        t = self._text()
+        t.setTextOrigin(x, self.y)
+        t.textOut(text)
+
+    def title(self, text: str) -> None:
+        tpl = self.tpl
+        self._flush()
+        self.c.setFont(tpl.pdf_bold_font, tpl.title_size)
+        for line in tpl.title_widths.wrap(text, self.max_width) or [""]:
+            self._room(tpl.title_size + 4)
+            self.c.drawString(tpl.margin, self.y, line)
+            self.y -= tpl.title_size + 10
+
+    def para(self, text: str, indent: float = 0.0, first_prefix: str = "") -> None:
+        tpl = self.tpl
+        x = tpl.margin + indent
+        lines = tpl.body_widths.wrap(text, self.max_width - indent)
+        for i, line in enumerate(lines):
+            self._room(tpl.leading)
+            if i == 0 and first_prefix:
+                self._line(x - indent * 0.7, first_prefix)
+            self._line(x, line)
+            self.y -= tpl.leading
+
+    def blank(self) -> None:
+        self.y -= self.tpl.leading
+
+    def save(self) -> None:
+        self._flush()
+        self.c.save()
+
+
+def _render_blocks_pdf(blocks: List[Tuple[str, str]], tpl: ResumeTemplate) -> bytes:
+    buf = io.BytesIO()
+    w = _PdfWriter(buf, tpl)
+    for kind, value in blocks:
+        if kind == "title":
+            w.title(value)
+        elif kind == "bullet":
+            w.para(value, indent=14, first_prefix=tpl.bullet)
+        elif kind == "blank":
+            w.blank()
+        elif kind == "text":
+            for line in value.splitlines():
+                if line.strip():
+                    w.para(line)
+                else:
+                    w.blank()
+        else:
+            w.para(value)
+    w.save()
+    return buf.getvalue()
+
+
+def render_pdf_document(enhanced: Dict[str, Any], template: Optional[str] = None) -> bytes:
+    """
+    Render the enhanced dict to PDF with the same layout as render_docx.
+    """
+    with stage("render_pdf"):
+        return _render_blocks_pdf(layout_blocks(enhanced), get_template(template))
+
+
+def render_pdf(text: str, name: str = "candidate", template: Optional[str] = None) -> bytes:
+    """
+    Simple PDF generation from plain text using reportlab, into memory.
+    Returns the PDF bytes.
+    """
+    with stage("render_pdf"):
+        return _render_blocks_pdf([("title", name), ("text", text)], get_template(template))
+
+
+def generate_pdf_from_text(text: str, name: str = "candidate") -> str:
+    """
+    Simple PDF generation using reportlab. Returns file path (in the temp dir).
+    The API streams render_pdf() instead; this is kept for scripts.
+    """
+    path = os.path.join(tempfile.gettempdir(), f"resume_{uuid.uuid4().hex[:8]}.pdf")
+    with open(path, "wb") as f:
+        f.write(render_pdf(text, name=name))
+    return path
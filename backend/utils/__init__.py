@@ -0,0 +1,3 @@
+# backend/utils/__init__.py
+# text helpers live in backend/utils/text_cleanup.py; re-exported for older imports
+from backend.utils.text_cleanup import clean_whitespace  # noqa: F401
@@ -0,0 +1,186 @@
+# backend/utils/constants.py
+
+# English function words and generic filler that never count as JD keywords
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very via was we were what when where which while
+who whom why will with within without would you your yours yourself yourselves
+ability able across candidate candidates closely company daily deep excellent experience need needs
+experienced familiarity familiar good great help ideal ideally including include job join
+knowledge looking must new plus preferred proficiency proficient qualifications related
+required requirements responsibilities role skill skills solid strong team teams understanding
+using well work working year years
+eg ex go ie ok re us vs
+""".split())
+
+# Skill taxonomy: canonical name -> aliases. Matching is on tokens (see
+# backend/utils/text_cleanup.tokenize), so multi-word aliases are phrases
+# and "ci/cd" matches "CI/CD" and "ci cd" alike. Canonical names are what
+# /score reports as keywords. Extra entries can be loaded from a JSON file
+# via SKILL_TAXONOMY_PATH (see backend/skills.py). Aliases are matched
+# anywhere in the text, so each one must name the skill on its own: short
+# or generic words ("c", "ts", "ui", "monitoring", "containers") are left
+# out rather than risk crediting a skill from ordinary prose. Tools that
+# imply a skill are not its synonyms: "pytest" and "github" are skills of
+# their own, not aliases of "unit testing" and "git".
+SKILL_ALIASES = {
+    # languages
+    "python": ("python3", "py"),
+    "javascript": ("js", "ecmascript", "es6", "vanilla js"),
+    "typescript": (),
+    "java": ("java se", "java ee", "j2ee"),
+    "c programming": ("ansi c", "c language"),
+    "c++": ("cpp", "cplusplus"),
+    "c#": ("csharp", "c sharp"),
+    "golang": ("go lang",),
+    "rust": ("rustlang",),
+    "ruby": (),
+    "php": (),
+    "kotlin": (),
+    "swift": (),
+    "scala": (),
+    "r programming": ("rstats", "r language"),
+    "matlab": (),
+    "perl": (),
+    "bash": ("shell scripting", "shell script"),
+    "powershell": (),
+    "sql": ("structured query language",),
+    "html": ("html5",),
+    "css": ("css3",),
+    "sass": ("scss",),
+    # web / frameworks
+    "react": ("react.js", "reactjs"),
+    "angular": ("angular.js", "angularjs"),
+    "vue": ("vue.js", "vuejs"),
+    "next.js": ("nextjs",),
+    "node.js": ("nodejs",),
+    "express.js": ("expressjs",),
+    "django": (),
+    "flask": (),
+    "fastapi": ("fast api",),
+    "spring boot": ("springboot", "spring framework"),
+    "ruby on rails": ("rails", "ror"),
+    ".net": ("dotnet", "dot net", "asp.net", ".net core"),
+    "graphql": (),
+    "rest api": ("restful", "restful api", "rest apis", "restful apis"),
+    "grpc": (),
+    "jquery": (),
+    "tailwind": ("tailwindcss", "tailwind css"),
+    "redux": (),
+    # data / ML
+    "machine learning": ("ml",),
+    "deep learning": ("dl",),
+    "artificial intelligence": ("ai",),
+    "natural language processing": ("nlp",),
+    "computer vision": (),
+    "large language models": ("llm", "llms", "large language model"),
+    "generative ai": ("genai", "gen ai"),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "tensorflow": ("tensor flow",),
+    "pytorch": ("torch",),
+    "keras": (),
+    "xgboost": (),
+    "lightgbm": (),
+    "hugging face": ("huggingface",),
+    "pandas": (),
+    "numpy": (),
+    "scipy": (),
+    "matplotlib": (),
+    "jupyter": ("jupyter notebook", "ipython"),
+    "apache spark": ("spark", "pyspark"),
+    "hadoop": ("hdfs", "mapreduce"),
+    "apache kafka": ("kafka",),
+    "apache airflow": ("airflow",),
+    "dbt": ("data build tool",),
+    "etl": ("elt", "data pipelines", "data pipeline"),
+    "data warehousing": ("data warehouse",),
+    "data visualization": ("data viz", "dataviz"),
+    "statistics": ("statistical analysis", "stats"),
+    "a/b testing": ("ab testing", "split testing"),
+    "tableau": (),
+    "power bi": ("powerbi",),
+    "looker": (),
+    "microsoft excel": ("ms excel", "excel spreadsheets"),
+    "snowflake": (),
+    "databricks": (),
+    "bigquery": ("big query",),
+    "redshift": ("amazon redshift",),
+    # databases
+    "postgresql": ("postgres", "psql"),
+    "mysql": (),
+    "sqlite": (),
+    "oracle database": ("oracle db",),
+    "sql server": ("mssql", "ms sql", "microsoft sql server"),
+    "mongodb": ("mongo",),
+    "redis": (),
+    "elasticsearch": ("elastic search", "elk"),
+    "cassandra": (),
+    "dynamodb": ("dynamo db",),
+    "nosql": ("no sql",),
+    # cloud / devops
+    "aws": ("amazon web services",),
+    "gcp": ("google cloud", "google cloud platform"),
+    "azure": ("microsoft azure",),
+    "docker": ("containerization",),
+    "kubernetes": ("k8s",),
+    "terraform": (),
+    "ansible": (),
+    "helm": (),
+    "ci/cd": ("cicd", "continuous integration", "continuous delivery", "continuous deployment"),
+    "jenkins": (),
+    "github actions": ("gh actions",),
+    "gitlab ci": (),
+    "gitlab": (),
+    "git": ("version control",),
+    "github": (),
+    "linux": (),
+    "microservices": ("microservice", "micro services"),
+    "serverless": ("aws lambda",),
+    "devops": ("dev ops",),
+    "site reliability engineering": ("sre",),
+    "observability": (),
+    "prometheus": (),
+    "grafana": (),
+    "nginx": (),
+    # mobile
+    "android": (),
+    "ios": (),
+    "react native": (),
+    "flutter": (),
+    # practices / other
+    "agile": ("scrum", "kanban"),
+    "test-driven development": ("tdd",),
+    "unit testing": ("unit tests",),
+    "pytest": (),
+    "junit": (),
+    "object-oriented programming": ("oop", "object oriented"),
+    "data structures": ("dsa",),
+    "distributed systems": (),
+    "system design": (),
+    "api design": (),
+    "cybersecurity": ("cyber security", "infosec", "information security"),
+    "ui/ux": ("user experience", "user interface"),
+    "figma": (),
+    "project management": (),
+    "product management": (),
+    "jira": (),
+    "blockchain": (),
+    "embedded systems": ("embedded software",),
+    "networking": ("tcp/ip",),
+}
+
+# Aliases too ambiguous to match anywhere ("go" is also a verb). They count
+# only next to another skill or a SKILL_CONTEXT_WORDS word (see
+# backend/skills.py), so "Python, Go and Rust" and "Go developer" credit
+# golang while "ready to go" does not.
+SKILL_CONTEXT_ALIASES = {
+    "golang": ("go",),
+}
+
+SKILL_CONTEXT_WORDS = frozenset("""
+backend developer developers engineer engineers lang language languages programming
+""".split())
@@ -0,0 +1,167 @@
+# backend/utils/text_cleanup.py
+"""
+Shared text core. Every module normalizes, segments and tokenizes through
+here, so resume, JD and query text are split the same way everywhere:
+
+  normalize_text   canonical form of extracted text (ligatures, invisible
+                   characters, NFC, PDF line-break hyphenation)
+  clean_whitespace collapse whitespace runs
+  sentence_spans / split_sentences
+  tokenize         ATS keyword tokens ("c++", "node.js" kept whole)
+  tokenize_terms   similarity-engine terms (letters, digits, '+', '#')
+  index_text       tokens, offsets and sentences of a resume in one call
+
+index_text()/tokenize_with_offsets() keep offsets in an array('I') (4
+bytes per token instead of a boxed int), find them by scanning forward
+rather than through match objects, and share one string object between
+repeats of a token within the document.
+"""
+import re
+import unicodedata
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+# ATS keyword tokens: lowercase words, keeping + # . - so "c++", "c#", "node.js" survive
+TOKEN_RE = re.compile(r"[a-z0-9\+\#\.\-]+")
+# same tokens matched case-insensitively on the original text, so offsets stay valid
+_TOKEN_RE_I = re.compile(r"[a-z0-9\+\#\.\-]+", re.I)
+# similarity terms: no '.' or '-', so "node.js" is "node", "js"
+TERM_RE = re.compile(r"[a-z0-9\+\#]+")
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+# compatibility characters left by PDF/DOCX extraction. Full NFKC would also
+# fold characters worth keeping (superscripts, ™, full-width forms), so only
+# these are mapped.
+_CHAR_MAP = {
+    "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi", "\ufb04": "ffl", "\ufb05": "st", "\ufb06": "st",
+    # soft hyphen, zero-width space/joiners, word joiner, BOM
+    "\u00ad": "", "\u200b": "", "\u200c": "", "\u200d": "", "\u2060": "", "\ufeff": "",
+    # no-break, figure and narrow no-break spaces; hyphen and no-break hyphen
+    "\u00a0": " ", "\u2007": " ", "\u202f": " ",
+    "\u2010": "-", "\u2011": "-",
+}
+
+
+def _dehyphenate(text: str) -> str:
+    # rejoin a word broken across lines by the PDF layout: "develop-\nment"
+    parts = text.split("-\n")
+    out = [parts[0]]
+    for prev, part in zip(parts, parts[1:]):
+        if not ("a" <= prev[-1:] <= "z" and "a" <= part[:1] <= "z"):
+            out.append("-\n")
+        out.append(part)
+    return "".join(out)
+
+
+def normalize_text(text: str, dehyphenate: bool = False) -> str:
+    """
+    Canonical form of extracted text: ligatures expanded ("ﬁ" -> "fi"), soft
+    hyphens and zero-width characters dropped, non-breaking spaces and
+    hyphens made plain, composed to NFC. With dehyphenate, words split
+    across lines by a hyphen are rejoined. ASCII text is only scanned.
+    """
+    if not text:
+        return text
+    if not text.isascii():
+        # these are rare: a scan per character beats str.translate's per-character lookup
+        for ch, repl in _CHAR_MAP.items():
+            if ch in text:
+                text = text.replace(ch, repl)
+        if not unicodedata.is_normalized("NFC", text):
+            text = unicodedata.normalize("NFC", text)
+    if dehyphenate and "-\n" in text:
+        text = _dehyphenate(text)
+    return text
+
+
+def clean_whitespace(s: str) -> str:
+    """Collapse whitespace runs to one space and strip."""
+    return " ".join(s.split()) if s else s
+
+
+def sentence_spans(text: str) -> List[List[int]]:
+    """[start, end] of each sentence, split after . ! ? followed by whitespace."""
+    lo = len(text) - len(text.lstrip())
+    hi = len(text.rstrip())
+    spans = []
+    start = lo
+    for m in _SENT_SPLIT_RE.finditer(text, lo, hi):
+        spans.append([start, m.start()])
+        start = m.end()
+    if start < hi:
+        spans.append([start, hi])
+    return spans
+
+
+def split_sentences(text: str) -> List[str]:
+    if not text:
+        return []
+    return [s for s in (text[a:b].strip() for a, b in sentence_spans(text)) if s]
+
+
+def tokenize(text: str) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def tokenize_terms(text: str) -> List[str]:
+    if not text:
+        return []
+    return TERM_RE.findall(text.lower())
+
+
+def tokenize_with_offsets(text: str) -> Tuple[List[str], array]:
+    """
+    Lowercased tokens plus the character offset of each token in text.
+    """
+    if not text:
+        return [], array("I")
+    lower = text.lower()
+    if len(lower) != len(text):
+        # lowercasing changed the length (e.g. 'İ'): match on the original text
+        matches = list(_TOKEN_RE_I.finditer(text))
+        return [m.group().lower() for m in matches], array("I", [m.start() for m in matches])
+    tokens = TOKEN_RE.findall(lower)
+    # only non-token characters separate tokens, so each is the next occurrence
+    offsets = array("I")
+    append, find = offsets.append, lower.find
+    pos = 0
+    for tok in tokens:
+        pos = find(tok, pos)
+        append(pos)
+        pos += len(tok)
+    seen: Dict[str, str] = {}
+    shared = seen.setdefault
+    return [shared(t, t) for t in tokens], offsets
+
+
+def index_text(text: str) -> Dict[str, Any]:
+    """The resume model's "index": {"tokens", "offsets", "sentences"}."""
+    tokens, offsets = tokenize_with_offsets(text)
+    return {"tokens": tokens, "offsets": offsets, "sentences": sentence_spans(text)}
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """
+    Light suffix stripping so inflected forms share a key:
+    developers/developer, managing/managed/manage, databases/database.
+    Only purely alphabetic tokens longer than 3 characters are stemmed.
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    t = token
+    if t.endswith("ies") and len(t) > 4:
+        t = t[:-3] + "y"
+    elif t.endswith("sses"):
+        t = t[:-2]
+    elif t.endswith("s") and not t.endswith(("ss", "us", "is")):
+        t = t[:-1]
+    for suf in ("ing", "ed"):
+        if t.endswith(suf) and len(t) - len(suf) >= 3:
+            t = t[:-len(suf)]
+            break
+    if t.endswith("e") and len(t) > 3:
+        t = t[:-1]
+    return t
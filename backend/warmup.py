@@ -0,0 +1,88 @@
+# backend/warmup.py
+"""
+Startup warm-up hook.
+
+Heavy dependencies are imported by the subsystem that needs them, on first
+use: pdfplumber/pdfminer by the PDF parser, python-docx and reportlab by the
+template engine, httpx by the LLM client. A worker that only serves /score
+never loads them, which keeps spawn time and per-worker RSS down.
+warm_up() loads the named subsystems at startup instead, trading a slower
+start for no first-request penalty (useful when one process serves
+everything, or before forking workers that should share the pages).
+
+Configuration (environment):
+  WARMUP   comma-separated subsystems to load at startup: score, parse,
+           render, llm, requisitions; or "all" / "none" (default "score")
+"""
+from typing import Callable, Dict, Iterable, Optional
+import os
+import time
+
+from backend.metrics import log
+
+
+def _score() -> None:
+    from backend.similarity import get_engine
+    from backend.skills import get_skill_index
+    get_skill_index()
+    get_engine()
+
+
+def _parse() -> None:
+    from backend.parser import load_pdf_backend
+    load_pdf_backend()
+
+
+def _render() -> None:
+    from backend.template_engine import compile_templates
+    compile_templates()
+
+
+def _llm() -> None:
+    # creates the pooled client when LLM_BACKEND=http; no-op otherwise
+    from backend.llm import get_llm_enhancer
+    get_llm_enhancer()
+
+
+def _requisitions() -> None:
+    from backend.requisitions import get_requisition_index
+    get_requisition_index().refresh()
+
+
+SUBSYSTEMS: Dict[str, Callable[[], None]] = {
+    "score": _score,
+    "parse": _parse,
+    "render": _render,
+    "llm": _llm,
+    "requisitions": _requisitions,
+}
+
+
+def warmup_names(spec: Optional[str] = None) -> Iterable[str]:
+    """Parse a WARMUP value into subsystem names (unknown names raise ValueError)."""
+    spec = os.environ.get("WARMUP", "score") if spec is None else spec
+    spec = spec.strip().lower()
+    if spec == "all":
+        return list(SUBSYSTEMS)
+    if spec in ("", "none"):
+        return []
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SUBSYSTEMS]
+    if unknown:
+        raise ValueError(f"unknown WARMUP subsystem(s): {', '.join(unknown)} (choose from {', '.join(SUBSYSTEMS)})")
+    return names
+
+
+def warm_up(spec: Optional[str] = None) -> Dict[str, float]:
+    """
+    Load the subsystems named by spec (default: $WARMUP) and return the
+    seconds each took. The llm subsystem must be warmed from the event loop.
+    """
+    timings: Dict[str, float] = {}
+    for name in warmup_names(spec):
+        t0 = time.perf_counter()
+        SUBSYSTEMS[name]()
+        timings[name] = time.perf_counter() - t0
+    if timings:
+        log.info("warm-up: %s", ", ".join(f"{n} {s * 1000:.0f}ms" for n, s in timings.items()))
+    return timings
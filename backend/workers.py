@@ -0,0 +1,290 @@
+# backend/workers.py
+"""
+Bounded process pools for CPU-heavy work (PDF parsing, scoring).
+
+Each named pool has its own ProcessPoolExecutor, so a burst of /parse
+uploads cannot starve /score. A pool admits at most `queue_size` jobs
+(running + waiting); beyond that submit() raises PoolSaturated, which the
+API maps to 429. Jobs that exceed `timeout` raise PoolTimeout (504). The
+worker keeps running a timed-out job to completion; only the caller stops
+waiting.
+
+Pool processes can be capped and recycled: with max_mb, each process's
+address space is limited, so a job that needs more (a pathological PDF in
+pdfplumber) fails with PoolMemoryError (413) instead of growing the host;
+with max_tasks, a process is replaced after that many jobs, returning
+whatever the parser libraries have fragmented. A pool whose process died
+outright (killed by the OOM killer, say) is rebuilt for the next job.
+
+stream() runs a generator function in the pool under the same admission,
+timeout and memory limits, relaying its items back through a queue as
+they are produced (e.g. PDF pages for /parse/stream).
+
+Configuration (environment), per pool NAME in {PARSE, SCORE}:
+  POOL_<NAME>_WORKERS   worker processes; 0 runs jobs inline (default 2 / 1)
+  POOL_<NAME>_QUEUE     max jobs admitted at once (default 4 x workers)
+  POOL_<NAME>_TIMEOUT   seconds per job (default 60 / 15)
+  POOL_<NAME>_MAX_MB    address-space limit per worker process, in MB (default: none)
+  POOL_<NAME>_MAX_TASKS jobs a worker process runs before it is replaced (default: never)
+"""
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+
+from backend.metrics import capture_call, merge_capture, profiling
+
+
+class PoolSaturated(Exception):
+    pass
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PoolMemoryError(Exception):
+    pass
+
+
+def _limit_memory(max_bytes: int) -> None:
+    # pool process initializer; RLIMIT_AS is POSIX only
+    try:
+        import resource
+    except ImportError:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        max_bytes = min(max_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, hard))
+
+
+_DONE = "__pool_stream_done__"
+_POLL = 0.05
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def _stream_queue():
+    # queues handed to pool processes must be proxies; one manager process serves them all
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = multiprocessing.Manager()
+        return _manager.Queue()
+
+
+def _relay(q, fn: Callable, args) -> None:
+    # pool job behind stream(): push every item of fn(*args), then the end marker
+    try:
+        for item in fn(*args):
+            q.put(item)
+    finally:
+        q.put(_DONE)
+
+
+def _poll(q) -> Any:
+    try:
+        return q.get(timeout=_POLL)
+    except queue.Empty:
+        return None
+
+
+_pool_process = False
+
+
+def init_pool_process(max_bytes: int = 0) -> None:
+    """Process pool initializer: mark the process (see in_pool_process()) and cap its memory."""
+    global _pool_process
+    _pool_process = True
+    if max_bytes:
+        _limit_memory(max_bytes)
+
+
+def in_pool_process() -> bool:
+    """
+    True inside a pool worker process. Work there stays serial: the pool is the
+    one level of parallelism, and nested pools would escape its limits.
+    """
+    return _pool_process
+
+
+class WorkerPool:
+    def __init__(self, name: str, workers: int = 1, queue_size: Optional[int] = None, timeout: Optional[float] = None,
+                 max_mb: Optional[int] = None, max_tasks: Optional[int] = None):
+        self.name = name
+        self.workers = max(0, workers)
+        self.queue_size = queue_size if queue_size is not None else max(1, self.workers) * 4
+        self.timeout = timeout
+        self.max_mb = max_mb
+        self.max_tasks = max_tasks
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.inflight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.memory_errors = 0
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            kwargs: Dict[str, Any] = {"initializer": init_pool_process, "initargs": ((self.max_mb or 0) * 1024 * 1024,)}
+            if self.max_tasks:
+                # implies the spawn start method
+                kwargs["max_tasks_per_child"] = self.max_tasks
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, **kwargs)
+        return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        # a worker process died: jobs still queued on the broken pool fail, later ones get a new pool
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.inflight >= self.queue_size:
+                self.rejected += 1
+                raise PoolSaturated(f"{self.name} pool saturated ({self.inflight}/{self.queue_size} jobs)")
+            self.inflight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.inflight -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) in the pool and await the result.
+        fn and args must be picklable unless the pool runs inline (workers=0).
+        """
+        self._acquire()
+        try:
+            if self.workers == 0:
+                return fn(*args)
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            # stage timings (and a profile, if requested) come back with the result
+            fut = loop.run_in_executor(executor, capture_call, fn, args, profiling())
+            try:
+                return merge_capture(await asyncio.wait_for(fut, timeout or self.timeout))
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise PoolTimeout(f"{self.name} job exceeded {timeout or self.timeout}s")
+            except MemoryError:
+                self.memory_errors += 1
+                raise PoolMemoryError(f"{self.name} job exceeded the {self.max_mb}MB worker memory limit")
+            except BrokenProcessPool:
+                self._reset(executor)
+                raise
+        finally:
+            self._release()
+
+    async def stream(self, fn: Callable, *args: Any, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """
+        Run the generator function fn(*args) in the pool, yielding its items as
+        they arrive. The timeout covers the whole job; errors are raised as in run()
+        once the items produced before them have been yielded.
+        """
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            timeout = timeout or self.timeout
+            if self.workers == 0:
+                executor, q = None, queue.Queue()
+            else:
+                executor, q = self._get_executor(), await loop.run_in_executor(None, _stream_queue)
+            # inline jobs run in a thread of this process, where the request's profiler is already active
+            fut = loop.run_in_executor(executor, capture_call, _relay, (q, fn, args), profiling() and executor is not None)
+            deadline = loop.time() + timeout if timeout else None
+            while True:
+                item = await loop.run_in_executor(None, _poll, q)
+                if item == _DONE:
+                    break
+                # checked on every item, so a job that keeps producing still times out
+                if deadline is not None and loop.time() > deadline:
+                    self.timeouts += 1
+                    raise PoolTimeout(f"{self.name} job exceeded {timeout}s")
+                if item is not None:
+                    yield item
+                elif fut.done() and fut.exception() is not None:
+                    break  # the process died before it could mark the end
+            try:
+                merge_capture(await fut)
+            except MemoryError:
+                self.memory_errors += 1
+                raise PoolMemoryError(f"{self.name} job exceeded the {self.max_mb}MB worker memory limit")
+            except BrokenProcessPool:
+                if executor is not None:
+                    self._reset(executor)
+                raise
+        finally:
+            self._release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "inflight": self.inflight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "memory_errors": self.memory_errors,
+            "restarts": self.restarts,
+        }
+
+
+_DEFAULTS = {
+    "parse": {"workers": 2, "timeout": 60.0},
+    "score": {"workers": 1, "timeout": 15.0},
+}
+_pools: Dict[str, WorkerPool] = {}
+
+
+def _from_env(name: str) -> WorkerPool:
+    d = _DEFAULTS.get(name, {"workers": 1, "timeout": 30.0})
+    prefix = f"POOL_{name.upper()}_"
+    workers = int(os.environ.get(prefix + "WORKERS", d["workers"]))
+    queue = os.environ.get(prefix + "QUEUE")
+    timeout = os.environ.get(prefix + "TIMEOUT")
+    max_mb = os.environ.get(prefix + "MAX_MB")
+    max_tasks = os.environ.get(prefix + "MAX_TASKS")
+    return WorkerPool(
+        name,
+        workers=workers,
+        queue_size=int(queue) if queue else None,
+        timeout=float(timeout) if timeout else d["timeout"],
+        max_mb=int(max_mb) if max_mb else None,
+        max_tasks=int(max_tasks) if max_tasks else None,
+    )
+
+
+def get_pool(name: str) -> WorkerPool:
+    if name not in _pools:
+        _pools[name] = _from_env(name)
+    return _pools[name]
+
+
+def pool_stats() -> Dict[str, Any]:
+    return {name: p.stats() for name, p in _pools.items()}
+
+
+def shutdown_pools(wait: bool = True) -> None:
+    global _manager
+    for p in _pools.values():
+        p.shutdown(wait=wait)
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
@@ -0,0 +1,62 @@
+# benchmarks/bench_exports.py
+"""
+Exports/second and peak Python memory per export for the in-memory DOCX
+and PDF renderers, next to the old write-to-temp-file path. Run from the
+repo root:
+
+    python -m benchmarks.bench_exports
+"""
+import os
+import time
+import tracemalloc
+
+from backend.template_engine import generate_docx, generate_pdf_from_text, render_docx, render_pdf
+
+ENHANCED = {
+    "name": "Jane Doe",
+    "summary": "Backend engineer with 6 years building Python services on AWS.",
+    "bullets": [f"Built service {i} in Python; cut p99 latency {10 + i}% for 2M users" for i in range(10)],
+    "skills": ["Python", "Go", "SQL", "Kubernetes", "AWS"],
+    "text": "\n".join(f"- Line {i} of the enhanced resume body text with some detail" for i in range(60)),
+}
+PDF_TEXT = f"{ENHANCED['name']}\n\n{ENHANCED['summary']}\n\n{ENHANCED['text']}"
+
+
+def _rate(fn, min_seconds=1.0):
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < min_seconds:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def _peak_kb(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def _to_file_and_unlink(gen):
+    def run():
+        os.unlink(gen())
+    return run
+
+
+def main():
+    cases = [
+        ("docx in-memory", lambda: render_docx(ENHANCED)),
+        ("docx temp file", _to_file_and_unlink(lambda: generate_docx(ENHANCED))),
+        ("pdf in-memory", lambda: render_pdf(PDF_TEXT, name="Jane Doe")),
+        ("pdf temp file", _to_file_and_unlink(lambda: generate_pdf_from_text(PDF_TEXT, name="Jane Doe"))),
+    ]
+    print(f"{'export':<16} {'exports/s':>10} {'peak KB':>9}")
+    for name, fn in cases:
+        fn()  # warm-up
+        print(f"{name:<16} {_rate(fn):>10.1f} {_peak_kb(fn):>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
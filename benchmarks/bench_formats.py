@@ -0,0 +1,66 @@
+# benchmarks/bench_formats.py
+"""
+Per-format parse throughput (docs/s and MB/s) through parse_pdf_bytes,
+plus the old DOCX path (failed pdfplumber attempt + raw decode) for
+comparison. Run from the repo root:
+
+    python -m benchmarks.bench_formats
+"""
+import io
+import time
+
+import pdfplumber
+from docx import Document
+
+from backend.parser import parse_pdf_bytes
+from benchmarks.bench_parser import LINE, make_pdf
+
+
+def make_docx(paragraphs: int) -> bytes:
+    doc = Document()
+    for i in range(paragraphs):
+        doc.add_paragraph(f"{i}. {LINE}")
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def make_text(lines: int) -> bytes:
+    return "\n".join(f"{i}. {LINE}" for i in range(lines)).encode()
+
+
+def legacy_docx(data: bytes) -> str:
+    try:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            return "\n".join(p.extract_text() or "" for p in pdf.pages)
+    except Exception:
+        return data.decode(errors="ignore")
+
+
+def _throughput(fn, data, min_seconds=1.0):
+    n = 0
+    t0 = time.perf_counter()
+    while True:
+        fn(data)
+        n += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_seconds:
+            break
+    return n / elapsed, n * len(data) / elapsed / 1e6
+
+
+def main():
+    cases = [
+        ("pdf (2 pages)", parse_pdf_bytes, make_pdf(2)),
+        ("docx (100 paras)", parse_pdf_bytes, make_docx(100)),
+        ("docx legacy path", legacy_docx, make_docx(100)),
+        ("text (100 lines)", parse_pdf_bytes, make_text(100)),
+    ]
+    print(f"{'format':<18} {'KB':>7} {'docs/s':>10} {'MB/s':>8}")
+    for name, fn, data in cases:
+        docs, mb = _throughput(fn, data)
+        print(f"{name:<18} {len(data) / 1024:>7.1f} {docs:>10.1f} {mb:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
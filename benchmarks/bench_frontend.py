@@ -0,0 +1,114 @@
+# benchmarks/bench_frontend.py
+"""
+End-to-end interaction latency of the Streamlit app against a local API.
+Drives frontend/app.py with Streamlit's AppTest and reports the median
+time of each interaction. An interaction is a full script rerun,
+including the HTTP calls it makes. Each round is a new browser session
+uploading a resume the API has not seen, then: parse, score, enhance,
+score again, export DOCX+PDF, export again, full analysis, and an idle
+rerun. Pass --app to time another version of the script, e.g. the one
+before a change:
+
+    git show <commit>:frontend/app.py > /tmp/app_before.py
+    python -m benchmarks.bench_frontend --app /tmp/app_before.py
+    python -m benchmarks.bench_frontend
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.corpus import make_jd, make_resume
+from benchmarks.load_parse_score import _free_port
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "app.py")
+
+
+def _click(at, label):
+    button = next((b for b in at.button if b.label == label), None)
+    if button is None:
+        return None
+    t0 = time.perf_counter()
+    button.click().run()
+    elapsed = time.perf_counter() - t0
+    if at.exception or at.error:
+        raise SystemExit(f"{label!r} failed: {[e.value for e in at.exception or at.error]}")
+    return elapsed
+
+
+def _export(at):
+    # one "Export all" click, or the two separate downloads of older versions
+    elapsed = _click(at, "Export all")
+    if elapsed is None:
+        elapsed = _click(at, "Download DOCX") + _click(at, "Download PDF")
+    return elapsed
+
+
+def _round(app, seed, pages, jd, timings):
+    at = AppTest.from_file(app, default_timeout=180)
+    at.run()
+    at.file_uploader[0].set_value((f"resume_{seed}.pdf", make_resume(seed, pages, "pdf"), "application/pdf"))
+    at.text_area[0].set_value(jd)
+    t0 = time.perf_counter()
+    at.run()
+    timings["upload + JD"].append(time.perf_counter() - t0)
+    for name, step in (
+        ("parse", lambda: _click(at, "Parse Resume")),
+        ("score", lambda: _click(at, "Get ATS Score")),
+        ("enhance", lambda: _click(at, "Enhance Resume")),
+        ("score again", lambda: _click(at, "Get ATS Score")),
+        ("export DOCX+PDF", lambda: _export(at)),
+        ("export again", lambda: _export(at)),
+        ("full analysis", lambda: _click(at, "Run full analysis")),
+    ):
+        timings[name].append(step())
+    t0 = time.perf_counter()
+    at.run()
+    timings["idle rerun"].append(time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--app", default=APP)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--pages", type=int, default=3)
+    args = ap.parse_args()
+    app = os.path.abspath(args.app)
+
+    port = _free_port()
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+    )
+    os.environ["API_URL"] = f"http://127.0.0.1:{port}"
+    sys.path.insert(0, os.path.dirname(app))
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(os.environ["API_URL"] + "/pool/stats", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        jd = make_jd(0, "long")
+        timings = {k: [] for k in ("upload + JD", "parse", "score", "enhance", "score again", "export DOCX+PDF",
+                                   "export again", "full analysis", "idle rerun")}
+        _round(app, 10**6, args.pages, jd, {k: [] for k in timings})  # warm-up
+        for r in range(args.rounds):
+            _round(app, r, args.pages, jd, timings)
+    finally:
+        backend.terminate()
+        backend.wait(timeout=30)
+
+    print(f"{app}: {args.rounds} sessions, {args.pages}-page resumes\n")
+    print(f"{'interaction':<18} {'median ms':>10}")
+    for name, values in timings.items():
+        print(f"{name:<18} {statistics.median(values) * 1000:>10.1f}")
+    print(f"{'total':<18} {sum(statistics.median(v) for v in timings.values()) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_llm.py
+"""
+Throughput and tail latency of LLM enhancement against the local stub
+server (backend/llm_stub.py), with and without micro-batching. Run from
+the repo root:
+
+    python -m benchmarks.bench_llm [--users 32] [--bullets 8]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from backend.llm import CompletionClient, LLMEnhancer
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def _resume(i: int, bullets: int) -> str:
+    lines = [f"Candidate {i}", "", f"Engineer number {i} with broad backend experience."]
+    lines += [f"I built service {i}-{j} in Python and cut costs by {j + 5}%." for j in range(bullets)]
+    return "\n".join(lines)
+
+
+async def _run(base_url: str, users: int, bullets: int, max_batch: int):
+    client = CompletionClient(base_url, "stub", max_connections=32)
+    enhancer = LLMEnhancer(client, concurrency=8, max_batch=max_batch, max_wait=0.01)
+    latencies = []
+
+    async def one(i):
+        t0 = time.perf_counter()
+        await enhancer.enhance(_resume(i, bullets), "Backend engineer, Python, AWS")
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(users)))
+    elapsed = time.perf_counter() - t0
+    stats = enhancer.stats()
+    await enhancer.aclose()
+    return users / elapsed, _pct(latencies, 50), _pct(latencies, 99), stats["batches"], stats["prompts"]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=32)
+    ap.add_argument("--bullets", type=int, default=8)
+    args = ap.parse_args()
+
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.llm_stub:app", "--port", str(port), "--log-level", "warning"],
+        env=dict(os.environ),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + "/stats", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        print(f"{'max_batch':>9} {'enh/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'calls':>6} {'prompts':>8}")
+        for max_batch in (1, 16, 64):
+            rps, p50, p99, batches, prompts = asyncio.run(_run(base_url, args.users, args.bullets, max_batch))
+            print(f"{max_batch:>9} {rps:>8.1f} {p50:>8.1f} {p99:>8.1f} {batches:>6} {prompts:>8}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
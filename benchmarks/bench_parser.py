@@ -0,0 +1,72 @@
+# benchmarks/bench_parser.py
+"""
+parse_pdf_bytes latency for 1/10/100-page PDFs: the old temp-file path
+vs. in-memory serial extraction vs. page-parallel extraction. Run from the
+repo root:
+
+    python -m benchmarks.bench_parser
+"""
+import io
+import os
+import tempfile
+import time
+
+import pdfplumber
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from backend.parser import parse_pdf_bytes
+
+LINE = "Designed and shipped Python services on AWS; cut p99 latency 35% for 2M daily users"
+
+
+def make_pdf(pages: int) -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    for _ in range(pages):
+        y = 740
+        while y > 60:
+            c.drawString(50, y, LINE)
+            y -= 14
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def legacy_parse(pdf_bytes: bytes) -> str:
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    try:
+        tmp.write(pdf_bytes)
+        tmp.close()
+        text = ""
+        with pdfplumber.open(tmp.name) as pdf:
+            for p in pdf.pages:
+                txt = p.extract_text()
+                if txt:
+                    text += txt + "\n"
+        return text.strip()
+    finally:
+        os.unlink(tmp.name)
+
+
+def _time(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    workers = max(2, min(4, os.cpu_count() or 1))
+    # warm the page pool so process start-up is not billed to the first run
+    parse_pdf_bytes(make_pdf(20), max_pages=0, workers=workers)
+    print(f"{'pages':>5} {'legacy ms':>10} {'memory ms':>10} {'parallel x' + str(workers) + ' ms':>16}")
+    for pages in (1, 10, 100):
+        pdf = make_pdf(pages)
+        legacy = _time(lambda: legacy_parse(pdf))
+        serial = _time(lambda: parse_pdf_bytes(pdf, max_pages=0, workers=1))
+        parallel = _time(lambda: parse_pdf_bytes(pdf, max_pages=0, workers=workers))
+        print(f"{pages:>5} {legacy:>10.1f} {serial:>10.1f} {parallel:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_requisitions.py
+"""
+Multi-JD matching: one resume against N open requisitions through the
+requisition index (one sparse matrix-vector product) vs. score_resume()
+per JD with pre-compiled profiles. Also reports index build, snapshot
+reload, incremental add/close and top-10 agreement with the exact ranking.
+Run from the repo root:
+
+    python -m benchmarks.bench_requisitions [--jds 10000] [--exact-sample 500]
+
+The per-JD loop is timed on --exact-sample JDs and extrapolated to --jds.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from backend.ats_score import JobProfile, score_resume
+from backend.requisitions import RequisitionIndex
+from backend.resume_model import build_model
+from benchmarks.corpus import JD_LENGTHS, make_jd, make_resume
+
+
+def _per_call(fn, n):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jds", type=int, default=10000)
+    ap.add_argument("--exact-sample", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    lengths = list(JD_LENGTHS)
+    jds = [make_jd(args.seed * 1000003 + i, lengths[i % len(lengths)]) for i in range(args.jds)]
+    text = make_resume(args.seed, 2, "text").decode()
+    parsed = {"text": text, "model": build_model(text)}
+    root = tempfile.mkdtemp(prefix="bench_req_")
+    try:
+        index = RequisitionIndex(root)
+        t0 = time.perf_counter()
+        ids = index.add_many({"job_description": jd, "title": f"req {i}"} for i, jd in enumerate(jds))
+        index.refresh()
+        build_s = time.perf_counter() - t0
+        stats = index.stats()
+        print(f"index: {stats['open']} JDs, {stats['terms']} terms, {stats['nnz']} nonzeros, built in {build_s:.1f}s")
+
+        t0 = time.perf_counter()
+        index.save()
+        save_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        reloaded = RequisitionIndex(root)
+        reloaded.refresh()
+        load_ms = (time.perf_counter() - t0) * 1000
+        print(f"snapshot: save {save_ms:.0f} ms, reload {load_ms:.0f} ms")
+
+        match_ms = _per_call(lambda: index.match(parsed, top_n=10), 50) * 1000
+        print(f"index match (top 10 of {args.jds}): {match_ms:.2f} ms")
+
+        sample = jds[:args.exact_sample]
+        profiles = [JobProfile(jd) for jd in sample]
+        t0 = time.perf_counter()
+        exact = [score_resume(parsed, p)["ats_score"] for p in profiles]
+        loop_ms = (time.perf_counter() - t0) / len(profiles) * args.jds * 1000
+        print(f"score_resume per JD: {loop_ms:.0f} ms for {args.jds} (extrapolated from {len(sample)}), "
+              f"{loop_ms / match_ms:.0f}x slower")
+
+        # agreement on the sample: index top 10 vs exact top 10
+        sample_index = RequisitionIndex(tempfile.mkdtemp(dir=root))
+        sample_index.add_many({"job_description": jd, "req_id": str(i)} for i, jd in enumerate(sample))
+        got = [int(m["req_id"]) for m in sample_index.match(parsed, top_n=10)["matches"]]
+        want = sorted(range(len(sample)), key=lambda i: (-exact[i], i))[:10]
+        print(f"top-10 overlap with exact ranking ({len(sample)} JDs): {len(set(got) & set(want))}/10")
+
+        add_ms = _per_call(lambda: index.add(make_jd(-1, "medium")), 20) * 1000
+        close_ms = _per_call(lambda: index.close(ids.pop()), 20) * 1000
+        after_ms = _per_call(lambda: index.match(parsed, top_n=10), 20) * 1000
+        print(f"incremental: add {add_ms:.2f} ms, close {close_ms:.2f} ms, match after changes {after_ms:.2f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_score_batch.py
+"""
+Per-resume keyword matching cost vs. JD keyword count.
+
+Compares the old per-keyword regex scan with the precompiled JobProfile
+used by score_many. Run from the repo root:
+
+    python -m benchmarks.bench_score_batch
+"""
+import random
+import re
+import time
+
+from backend.ats_score import JobProfile, score_many
+
+WORDS = [f"skill{i}" for i in range(5000)] + [
+    "python", "java", "sql", "docker", "kubernetes", "aws", "react", "node.js",
+    "pandas", "scikit-learn", "tensorflow", "linux", "git", "ci", "agile",
+]
+
+
+def _text(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _legacy_match(keywords, text):
+    return [kw for kw in keywords if re.search(r"\b" + re.escape(kw) + r"\b", text, flags=re.I)]
+
+
+def main(n_resumes=200, resume_words=600):
+    rng = random.Random(42)
+    resumes = [_text(rng, resume_words) for _ in range(n_resumes)]
+    print(f"{'keywords':>9} {'legacy us/resume':>17} {'matcher us/resume':>18}")
+    for n_kw in (10, 50, 200, 1000):
+        matcher = JobProfile(" ".join(rng.sample(WORDS[:5000], n_kw)))
+        keywords = matcher.keywords
+
+        t0 = time.perf_counter()
+        for r in resumes:
+            _legacy_match(keywords, r)
+        legacy = (time.perf_counter() - t0) / n_resumes * 1e6
+
+        t0 = time.perf_counter()
+        for r in resumes:
+            matcher.match(r)
+        fast = (time.perf_counter() - t0) / n_resumes * 1e6
+        print(f"{len(keywords):>9} {legacy:>17.1f} {fast:>18.1f}")
+
+    t0 = time.perf_counter()
+    ranked = score_many(resumes, _text(rng, 100), top_k=10)
+    print(f"score_many({n_resumes}) end-to-end: {(time.perf_counter() - t0) * 1000:.1f} ms, top score {ranked[0]['ats_score']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_search.py
+"""
+Recruiter search index at scale: bulk and single-document insert rates,
+query latency (ranked and boolean, with and without a recency filter),
+delete and compaction cost, and index size. Documents are synthetic
+one-page resumes (benchmarks/corpus.py) indexed with timestamps spread
+over the past year. Run from the repo root:
+
+    python -m benchmarks.bench_search [--docs 100000]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from backend.search import SearchIndex
+from benchmarks.corpus import resume_lines
+
+QUERIES = [
+    "kubernetes AND golang",
+    "python",
+    "k8s golang NOT php",
+    "(rust OR c++) AND docker",
+    '"data pipelines" spark',
+    "billing platform",
+]
+
+
+def _median_ms(fn, rounds=20):
+    fn()
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=100000)
+    ap.add_argument("--batch", type=int, default=2000)
+    args = ap.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_search_")
+    path = os.path.join(root, "search.db")
+    index = SearchIndex(path)
+    now = time.time()
+    try:
+        t0 = time.perf_counter()
+        for start in range(0, args.docs, args.batch):
+            index.add_many(
+                {"doc_id": f"doc{i}", "text": "\n".join(resume_lines(i, 1)), "filename": f"r{i}.txt",
+                 "indexed": now - (i % 365) * 86400}
+                for i in range(start, min(start + args.batch, args.docs))
+            )
+        bulk = time.perf_counter() - t0
+        print(f"bulk insert: {args.docs} docs in {bulk:.1f}s ({args.docs / bulk:.0f} docs/s), "
+              f"{index.stats()['bytes'] / 2**20:.0f} MB")
+
+        text = "\n".join(resume_lines(args.docs + 1, 1))
+        single = _median_ms(lambda: index.add("single", text))
+        print(f"single insert (re-index one doc): {single:.2f} ms")
+
+        print(f"\n{'query':<30} {'ranked ms':>10} {'boolean ms':>11} {'90d ms':>8} {'matches':>8}")
+        for q in QUERIES:
+            ranked = _median_ms(lambda: index.search(q, limit=20))
+            boolean = _median_ms(lambda: index.search(q, mode="boolean", limit=20))
+            recent = _median_ms(lambda: index.search(q, since_days=90, limit=20))
+            total = index.search(q, mode="boolean", limit=0)["total"]
+            print(f"{q:<30} {ranked:>10.2f} {boolean:>11.2f} {recent:>8.2f} {total:>8}")
+
+        t0 = time.perf_counter()
+        for i in range(0, args.docs, max(1, args.docs // 1000)):
+            index.delete(f"doc{i}")
+        deletes = (time.perf_counter() - t0) / 1000 * 1000
+        print(f"\ndelete: {deletes:.2f} ms per document")
+        t0 = time.perf_counter()
+        stats = index.compact()
+        print(f"compact: {time.perf_counter() - t0:.1f}s -> {stats['bytes'] / 2**20:.0f} MB")
+        ranked = _median_ms(lambda: index.search(QUERIES[0], limit=20))
+        print(f"after compaction, '{QUERIES[0]}' ranked: {ranked:.2f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_sessions.py
+"""
+Live-editing latency: an incremental scoring session (backend/score_session.py)
+vs. a full score_resume() on a long resume. Replays single-keystroke
+typing, word replacements, pasted paragraphs, heading edits and JD edits,
+and checks every incremental result against the full rescore. Run from
+the repo root:
+
+    python -m benchmarks.bench_sessions [--pages 10] [--edits 300]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from backend.ats_score import score_resume
+from backend.resume_model import build_model
+from backend.score_session import ScoreSession
+from benchmarks.corpus import make_jd, make_resume
+
+PASTE = "Led migration of data pipelines to Kubernetes with Python, Go and Terraform, cutting costs 30%. "
+
+
+def _edits(kind, text, jd, rng):
+    if kind == "keystroke":
+        at = rng.randrange(len(text))
+        return [{"target": "resume", "start": at, "end": at, "text": rng.choice("abcdefgh ")}]
+    if kind == "word":
+        at = rng.randrange(len(text))
+        return [{"target": "resume", "start": at, "end": min(len(text), at + 8), "text": rng.choice(["docker", "react", "SQL"])}]
+    if kind == "paste":
+        at = text.rfind("\n", 0, rng.randrange(len(text))) + 1
+        return [{"target": "resume", "start": at, "end": at, "text": PASTE + "\n"}]
+    if kind == "heading":
+        at = text.rfind("\n", 0, rng.randrange(len(text))) + 1
+        return [{"target": "resume", "start": at, "end": at, "text": "Projects\n"}]
+    at = rng.randrange(len(jd))
+    return [{"target": "jd", "start": at, "end": at, "text": rng.choice([" rust", " graphql", "s"])}]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--edits", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    text = make_resume(args.seed, args.pages, "text").decode()
+    jd = make_jd(args.seed, "long")
+    parsed = {"text": text, "model": build_model(text)}
+    t0 = time.perf_counter()
+    session = ScoreSession(parsed, jd)
+    open_ms = (time.perf_counter() - t0) * 1000
+    print(f"resume: {args.pages} pages, {len(text)} chars, {len(session.tokens)} tokens; session opened in {open_ms:.1f} ms")
+
+    print(f"\n{'edit':<10} {'session ms':>11} {'full ms':>9} {'speedup':>8}")
+    for kind in ("keystroke", "word", "paste", "heading", "jd"):
+        inc, full = [], []
+        for _ in range(args.edits // 5):
+            edits = _edits(kind, session.text, session.jd, rng)
+            t0 = time.perf_counter()
+            got = session.apply(edits)
+            inc.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            want = score_resume({"text": session.text}, session.jd)
+            full.append(time.perf_counter() - t0)
+            for k in want:
+                same = abs(want[k] - got[k]) <= 0.05 if k in ("ats_score", "semantic") else want[k] == got[k]
+                if not same:
+                    raise SystemExit(f"mismatch after {kind} edit at version {session.version}: {k} {got[k]!r} != {want[k]!r}")
+        a, b = statistics.median(inc) * 1000, statistics.median(full) * 1000
+        print(f"{kind:<10} {a:>11.3f} {b:>9.2f} {b / a:>7.0f}x")
+    print(f"\nall {session.version} incremental results matched the full rescore")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_similarity.py
+"""
+Latency of the 'semantic' score: legacy SequenceMatcher vs. the sparse
+TF-IDF / BM25 engines, for resumes of 1, 10 and 50 pages. Run from the
+repo root:
+
+    python -m benchmarks.bench_similarity
+"""
+import random
+import time
+
+from backend.similarity import BM25Engine, SequenceEngine, TfidfEngine
+
+WORDS_PER_PAGE = 450
+VOCAB = [f"term{i}" for i in range(3000)] + [
+    "python", "sql", "docker", "kubernetes", "aws", "react", "pandas", "ml",
+    "led", "built", "designed", "improved", "team", "data", "pipeline",
+]
+
+
+def _text(rng, n_words):
+    return " ".join(rng.choice(VOCAB) for _ in range(n_words))
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(7)
+    jd = _text(rng, 250)
+    engines = [SequenceEngine(), TfidfEngine(), BM25Engine()]
+    print(f"{'pages':>5} " + " ".join(f"{e.name + ' ms':>12}" for e in engines))
+    for pages in (1, 10, 50):
+        resume = _text(rng, pages * WORDS_PER_PAGE)
+        row = []
+        for e in engines:
+            repeat = 1 if (e.name == "sequence" and pages > 10) else 3
+            row.append(_time(lambda: e.similarity(jd, resume), repeat))
+        print(f"{pages:>5} " + " ".join(f"{ms:>12.2f}" for ms in row))
+
+    docs = [_text(rng, WORDS_PER_PAGE * 2) for _ in range(1000)]
+    tfidf = TfidfEngine().fit(docs)
+    ms = _time(lambda: tfidf.score(jd, docs), 3)
+    print(f"one-vs-1000 (2 pages each, fitted idf): {ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_skills.py
+"""
+Skill taxonomy cost: per-resume keyword matching and full scoring with the
+bundled taxonomy vs. synthetic taxonomies of up to 50k entries, for 1- and
+4-page resumes. Matching should stay flat as the taxonomy grows and scale
+linearly with resume length. Run from the repo root:
+
+    python -m benchmarks.bench_skills
+"""
+import random
+import time
+
+from backend.ats_score import JobProfile, score_resume
+from backend.resume_model import build_model
+from backend.skills import SkillIndex, load_taxonomy, set_skill_index
+
+COMMON = ["data", "python", "cloud", "platform", "team", "systems", "web", "machine", "api", "test"]
+LINES = [
+    "Built data pipelines in Python and SQL on AWS; cut costs 30% with Spark and Airflow",
+    "Shipped React and Node.js services behind REST APIs with CI/CD on GitHub Actions",
+    "Trained sklearn and PyTorch models for NLP; deployed to k8s with Docker",
+    "Led a team of 5 engineers across platform, web and machine learning systems",
+]
+JD = ("Senior ML engineer: Python, scikit-learn, PyTorch, Spark, SQL, AWS, Docker, Kubernetes, "
+      "CI/CD and REST APIs. Experience with data pipelines and NLP a plus.")
+
+
+def synthetic_taxonomy(size: int, seed: int = 7):
+    """Bundled skills plus made-up ones; a third are phrases starting with a common word."""
+    rng = random.Random(seed)
+    taxonomy = load_taxonomy()
+    for i in range(size - len(taxonomy)):
+        aliases = [f"skl{i}x", f"tool{i}"]
+        if i % 3 == 0:
+            aliases.append(f"{rng.choice(COMMON)} stack{i}")
+        taxonomy[f"synthetic-skill-{i}"] = tuple(aliases)
+    return taxonomy
+
+
+def _resume(pages: int) -> str:
+    body = [LINES[i % len(LINES)] for i in range(45 * pages)]
+    return "Jane Doe\njane@example.com\nSkills\nPython, SQL, Docker\nExperience\n" + "\n".join(body)
+
+
+def _per_call(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    resumes = {pages: _resume(pages) for pages in (1, 4)}
+    models = {pages: build_model(text) for pages, text in resumes.items()}
+    print(f"{'taxonomy':>9} {'compile ms':>11} {'pages':>6} {'match us':>9} {'score ms':>9}")
+    for size in (0, 1000, 10000, 50000):
+        taxonomy = load_taxonomy() if size == 0 else synthetic_taxonomy(size)
+        t0 = time.perf_counter()
+        index = SkillIndex(taxonomy)
+        compile_ms = (time.perf_counter() - t0) * 1000
+        set_skill_index(index)
+        profile = JobProfile(JD)
+        for pages, text in resumes.items():
+            model = models[pages]
+            tokens = model["index"]["tokens"]
+            match = _per_call(lambda: profile.match_tokens(tokens), 200) * 1e6
+            score = _per_call(lambda: score_resume({"text": text, "model": model}, profile), 50) * 1000
+            print(f"{len(index):>9} {compile_ms:>11.1f} {pages:>6} {match:>9.1f} {score:>9.2f}")
+    print("matched:", score_resume({"text": resumes[1]}, profile)["matched_keywords"])
+
+
+if __name__ == "__main__":
+    main()
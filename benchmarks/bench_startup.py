@@ -0,0 +1,161 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of an API worker: import time, lifespan startup time, first
+request latency, resident memory, and which heavy libraries (PDF, DOCX,
+reportlab, httpx) each process has loaded. Every scenario runs in a fresh
+interpreter. Run from the repo root:
+
+    python -m benchmarks.bench_startup [--importtime 15] [--out startup.json]
+
+Scenarios:
+  import       import backend.main only
+  score        default WARMUP, then one /score request (text resume)
+  parse        default WARMUP, then one /parse of a PDF (extracted in the
+               parse pool, so the API process itself stays light)
+  warm-all     WARMUP=all startup, no requests
+
+A /score-only worker (and its score pool process) should show no PDF/DOCX
+library loaded. --importtime N lists the N slowest modules behind
+`import backend.main` (python -X importtime, cumulative microseconds).
+"""
+import argparse
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+HEAVY = ("pdfplumber", "pdfminer", "docx", "reportlab", "httpx", "PIL", "lxml")
+SCENARIOS = {
+    "import": {},
+    "score": {},
+    "parse": {},
+    "warm-all": {"WARMUP": "all"},
+}
+
+
+def _heavy_loaded() -> List[str]:
+    return [m for m in HEAVY if m in sys.modules]
+
+
+def _rss_mb() -> float:
+    """Current resident set size (VmRSS) in MB, or peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_report() -> Dict:
+    # runs inside a pool worker process
+    return {"rss_mb": round(_rss_mb(), 1), "heavy": _heavy_loaded()}
+
+
+def _child(scenario: str, inputs: Dict) -> Dict:
+    """Measure one scenario in this (fresh) interpreter; inputs come from the parent."""
+    report: Dict = {}
+    t0 = time.perf_counter()
+    from backend.main import app
+    report["import_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    if scenario != "import":
+        from fastapi.testclient import TestClient
+        # TestClient itself imports httpx; keep it out of the app's numbers
+        preloaded = set(_heavy_loaded())
+        client = TestClient(app)
+        t0 = time.perf_counter()
+        client.__enter__()
+        report["startup_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        try:
+            if scenario in ("score", "parse"):
+                t0 = time.perf_counter()
+                if scenario == "score":
+                    r = client.post("/score", json={"parsed": {"text": inputs["text"]}, "job_description": inputs["jd"]})
+                else:
+                    r = client.post("/parse", files={"file": ("resume.pdf", base64.b64decode(inputs["pdf"]))})
+                r.raise_for_status()
+                report["first_request_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            if scenario == "score":
+                from backend.workers import get_pool
+                pool = get_pool("score")
+                if pool.workers:
+                    worker = pool._get_executor().submit(_worker_report).result()
+                    # forked from this process, so it inherits TestClient's httpx too
+                    worker["heavy"] = [m for m in worker["heavy"] if m not in preloaded]
+                    report["score_worker"] = worker
+        finally:
+            client.__exit__(None, None, None)
+        report["heavy"] = [m for m in _heavy_loaded() if m not in preloaded]
+    else:
+        report["heavy"] = _heavy_loaded()
+    report["rss_mb"] = round(_rss_mb(), 1)
+    return report
+
+
+def _run_scenario(name: str, env: Dict[str, str], inputs: Dict) -> Dict:
+    code = (
+        "import json, sys\n"
+        "import benchmarks.bench_startup as b\n"
+        f"print(json.dumps(b._child({name!r}, json.load(sys.stdin))))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], input=json.dumps(inputs), capture_output=True,
+                          text=True, env={**os.environ, **env}, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def import_times(top: int) -> List[Dict]:
+    """The slowest modules (cumulative) behind `import backend.main`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"],
+                          capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = [p.strip() for p in line[len("import time:"):].split("|")]
+        rows.append({"module": module, "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    rows.sort(key=lambda r: r["cumulative_us"], reverse=True)
+    return rows[:top]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--importtime", type=int, default=0, metavar="N")
+    ap.add_argument("--out", help="write JSON results here")
+    args = ap.parse_args()
+
+    # the corpus generator imports reportlab/python-docx, so build inputs here, not in the children
+    from benchmarks.corpus import make_jd, make_resume
+    inputs = {
+        "text": make_resume(0, 1, "text").decode(),
+        "jd": make_jd(0),
+        "pdf": base64.b64encode(make_resume(0, 1, "pdf")).decode(),
+    }
+    results = {}
+    print(f"{'scenario':<10} {'import ms':>10} {'startup ms':>11} {'1st req ms':>11} {'RSS MB':>8}  heavy modules")
+    for name, env in SCENARIOS.items():
+        r = results[name] = _run_scenario(name, env, inputs)
+        print(f"{name:<10} {r['import_ms']:>10.1f} {r.get('startup_ms', 0):>11.1f} "
+              f"{r.get('first_request_ms', 0):>11.1f} {r['rss_mb']:>8.1f}  {', '.join(r['heavy']) or '-'}")
+        if "score_worker" in r:
+            w = r["score_worker"]
+            print(f"{'  worker':<10} {'':>10} {'':>11} {'':>11} {w['rss_mb']:>8.1f}  {', '.join(w['heavy']) or '-'}")
+    report = {"scenarios": results}
+    if args.importtime:
+        report["importtime"] = import_times(args.importtime)
+        print(f"\n{'cumulative ms':>13} {'self ms':>8}  module")
+        for row in report["importtime"]:
+            print(f"{row['cumulative_us'] / 1000:>13.1f} {row['self_us'] / 1000:>8.1f}  {row['module']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_text.py
+"""
+Text core microbenchmark (backend/utils/text_cleanup.py): time and memory
+per MB of resume text for normalization, tokenization with offsets,
+sentence segmentation and the full resume model, next to the match-object
+tokenizer it replaced. "peak" is the tracemalloc high-water mark during
+one call; "kept" is what the result still holds afterwards. Run from the
+repo root:
+
+    python -m benchmarks.bench_text [--mb 1]
+"""
+import argparse
+import pickle
+import re
+import time
+import tracemalloc
+
+from backend.resume_model import build_model
+from backend.utils.text_cleanup import (
+    TOKEN_RE, index_text, normalize_text, sentence_spans, split_sentences, tokenize_with_offsets,
+)
+from benchmarks.corpus import make_resume
+
+
+def _finditer_tokens(text):
+    # the previous tokenize_with_offsets: one match object and one boxed int per token
+    matches = list(TOKEN_RE.finditer(text.lower()))
+    return [m.group() for m in matches], [m.start() for m in matches]
+
+
+def _pdf_like(text):
+    # what PDF extraction tends to leave: ligatures, soft hyphens, NBSPs, broken words
+    return (text.replace("fi", "\ufb01").replace("ffl", "\ufb04").replace(" and ", " and\u00a0")
+            .replace("ment", "-\nment").replace("ation", "a\u00adtion"))
+
+
+def _measure(fn, text, mb, rounds=5):
+    fn(text)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(text)
+    ms = (time.perf_counter() - t0) / rounds * 1000 / mb
+    tracemalloc.start()
+    result = fn(text)
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return ms, peak / 2**20 / mb, kept / 2**20 / mb
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mb", type=float, default=1.0)
+    args = ap.parse_args()
+
+    pages, seed = [], 0
+    while sum(map(len, pages)) < args.mb * 2**20:
+        pages.append(make_resume(seed, 10, "text").decode())
+        seed += 1
+    text = "\n".join(pages)
+    pdf_text = _pdf_like(text)
+    mb = len(text) / 2**20
+    print(f"{mb:.2f} MB of resume text ({len(tokenize_with_offsets(text)[0])} tokens)\n")
+
+    cases = [
+        ("normalize (ascii)", lambda t: normalize_text(t, dehyphenate=True), text),
+        ("normalize (pdf-like)", lambda t: normalize_text(t, dehyphenate=True), pdf_text),
+        ("tokens+offsets: finditer", _finditer_tokens, text),
+        ("tokens+offsets: core", tokenize_with_offsets, text),
+        ("sentence_spans", sentence_spans, text),
+        ("split_sentences", split_sentences, text),
+        ("index_text", index_text, text),
+        ("build_model", build_model, text),
+    ]
+    print(f"{'per MB':<26} {'ms':>8} {'peak MB':>8} {'kept MB':>8}")
+    for name, fn, data in cases:
+        ms, peak, kept = _measure(fn, data, mb)
+        print(f"{name:<26} {ms:>8.1f} {peak:>8.1f} {kept:>8.1f}")
+
+    old = _finditer_tokens(text)
+    new = tokenize_with_offsets(text)
+    print(f"\npickled tokens+offsets (sent to/from worker pools): finditer {len(pickle.dumps(old)) / 2**20 / mb:.2f} MB, "
+          f"core {len(pickle.dumps(new)) / 2**20 / mb:.2f} MB per MB of text")
+    repaired = len(re.findall(r"-\n", pdf_text)) - len(re.findall(r"-\n", normalize_text(pdf_text, dehyphenate=True)))
+    print(f"pdf-like text: {repaired} line-break hyphenations repaired")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# benchmarks/corpus.py
+"""
+Deterministic synthetic corpus: resumes (PDF, DOCX, plain text; 1-20 pages;
+several layouts) and job descriptions of varied length. The same seed
+always gives the same documents, so benchmark numbers from different
+commits are comparable.
+
+    python -m benchmarks.corpus --out /tmp/corpus [--seed 0]
+
+writes the default corpus to a directory. Benchmarks import make_resume(),
+make_jd() and corpus() directly.
+"""
+import argparse
+import io
+import json
+import os
+import random
+from typing import Dict, Iterator, List
+
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from backend.utils.constants import SKILL_ALIASES
+
+FORMATS = ("pdf", "docx", "text")
+LAYOUTS = ("classic", "compact", "two_column")
+JD_LENGTHS = {"short": 40, "medium": 150, "long": 500}
+
+FIRST = ["Jane", "Arjun", "Mei", "Carlos", "Amara", "Liam", "Priya", "Noah", "Sofia", "Kenji", "Fatima", "Ethan"]
+LAST = ["Doe", "Sharma", "Chen", "Garcia", "Okafor", "Murphy", "Iyer", "Kim", "Rossi", "Tanaka", "Khan", "Novak"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Analytics", "Hooli", "Vandelay"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "ML Engineer", "DevOps Engineer",
+          "Full Stack Developer", "Data Engineer", "Platform Engineer"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+VERBS = ["Built", "Designed", "Led", "Shipped", "Optimized", "Migrated", "Automated", "Scaled", "Refactored", "Owned"]
+OBJECTS = ["data pipelines", "REST APIs", "a recommendation service", "the billing platform", "CI/CD workflows",
+           "ML training jobs", "dashboards", "the search backend", "an event-driven architecture", "internal tooling"]
+OUTCOMES = ["cutting p99 latency {n}%", "saving ${n}k per year", "serving {n}M daily users",
+            "reducing incidents {n}%", "improving throughput {n}%", "halving deploy time"]
+JD_FILLER = ["We are looking for", "You will", "The ideal candidate has", "Experience with", "Strong knowledge of",
+             "Nice to have:", "You should be comfortable with", "Responsibilities include"]
+SKILLS = sorted(SKILL_ALIASES)
+# PDF layouts: font size and (x, width) of each column
+LAYOUT_SPECS = {
+    "classic": {"size": 10, "columns": [(50, 512)]},
+    "compact": {"size": 8.5, "columns": [(50, 512)]},
+    "two_column": {"size": 10, "columns": [(40, 260), (310, 260)]},
+}
+_TOP, _BOTTOM = 742, 50
+
+
+def _max_chars(size: float, col_width: float) -> int:
+    # crude character-count wrap; enough to keep Helvetica text on the page
+    return int(col_width / (size * 0.5))
+
+
+def _wrap(line: str, size: float, col_width: float) -> List[str]:
+    n = _max_chars(size, col_width)
+    return [line[i:i + n] for i in range(0, len(line), n)] or [""]
+
+
+def _page_capacity(layout: str) -> int:
+    """Wrapped lines that fit on one page, so "pages" means rendered PDF pages."""
+    spec = LAYOUT_SPECS[layout]
+    per_column = (_TOP - _BOTTOM) // (spec["size"] + 3) + 1
+    return int(per_column) * len(spec["columns"])
+
+
+def _bullet(rng: random.Random) -> str:
+    skills = ", ".join(rng.sample(SKILLS, 2))
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(10, 90))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {skills}, {outcome}"
+
+
+def resume_lines(seed: int, pages: int, layout: str = "classic") -> List[str]:
+    """Plain-text resume lines sized to roughly `pages` pages of the given layout."""
+    rng = random.Random(f"resume-{seed}-{pages}-{layout}")
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    lines = [name, f"{name.split()[0].lower()}{seed}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}", ""]
+    lines += ["SUMMARY", f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience in "
+              + ", ".join(rng.sample(SKILLS, 4)) + ".", ""]
+    lines += ["SKILLS", ", ".join(rng.sample(SKILLS, rng.randint(8, 16))), ""]
+    spec = LAYOUT_SPECS[layout]
+    col_width = spec["columns"][0][1]
+    budget = _page_capacity(layout) * pages - 4
+    used = sum(len(_wrap(line, spec["size"], col_width)) for line in lines) + 1
+    lines.append("EXPERIENCE")
+    job = 0
+    while True:
+        job += 1
+        block = [f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({2024 - 2 * job}-{2026 - 2 * job})"]
+        block += [f"- {_bullet(rng)}" for _ in range(rng.randint(3, 7))]
+        block.append("")
+        cost = sum(len(_wrap(line, spec["size"], col_width)) for line in block)
+        if used + cost > budget and job > 1:
+            break
+        lines += block
+        used += cost
+    lines += ["EDUCATION", f"B.S. Computer Science, {rng.choice(SCHOOLS)} ({2024 - 2 * job - 4})"]
+    return lines
+
+
+def _pdf(lines: List[str], layout: str) -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter, invariant=1)
+    spec = LAYOUT_SPECS[layout]
+    size, columns = spec["size"], spec["columns"]
+    leading = size + 3
+    col, y = 0, _TOP
+    c.setFont("Helvetica", size)
+    for line in lines:
+        x, col_width = columns[col]
+        for chunk in _wrap(line, size, col_width):
+            if y < _BOTTOM:
+                col += 1
+                if col == len(columns):
+                    c.showPage()
+                    c.setFont("Helvetica", size)
+                    col = 0
+                x, col_width = columns[col]
+                y = _TOP
+            if chunk.isupper() and chunk.strip():
+                c.setFont("Helvetica-Bold", size + 1)
+                c.drawString(x, y, chunk)
+                c.setFont("Helvetica", size)
+            else:
+                c.drawString(x, y, chunk)
+            y -= leading
+    c.save()
+    return buf.getvalue()
+
+
+def _docx(lines: List[str], layout: str) -> bytes:
+    doc = Document()
+    for line in lines:
+        if line.isupper() and line.strip():
+            doc.add_heading(line.title(), level=2)
+        elif line.startswith("- "):
+            doc.add_paragraph(line[2:], style="List Bullet")
+        elif line:
+            doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def make_resume(seed: int, pages: int = 1, fmt: str = "pdf", layout: str = "classic") -> bytes:
+    """One synthetic resume as upload bytes."""
+    lines = resume_lines(seed, pages, layout)
+    if fmt == "pdf":
+        return _pdf(lines, layout)
+    if fmt == "docx":
+        return _docx(lines, layout)
+    if fmt == "text":
+        return "\n".join(lines).encode("utf-8")
+    raise ValueError(f"unknown format: {fmt}")
+
+
+def make_jd(seed: int, length: str = "medium") -> str:
+    """A synthetic job description of roughly JD_LENGTHS[length] words."""
+    rng = random.Random(f"jd-{seed}-{length}")
+    target = JD_LENGTHS[length]
+    words = [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}."]
+    count = 4
+    while count < target:
+        sentence = f"{rng.choice(JD_FILLER)} {', '.join(rng.sample(SKILLS, rng.randint(1, 4)))} and {rng.choice(OBJECTS)}."
+        words.append(sentence)
+        count += len(sentence.split())
+    return " ".join(words)
+
+
+def corpus(seed: int = 0, pages=(1, 2, 5, 10, 20), formats=FORMATS, layouts=LAYOUTS) -> Iterator[Dict]:
+    """Every (format, layout, pages) combination; DOCX/text have no layouts beyond 'classic'."""
+    for fmt in formats:
+        for layout in (layouts if fmt == "pdf" else ("classic",)):
+            for n in pages:
+                yield {
+                    "id": f"{fmt}-{layout}-{n}p-s{seed}",
+                    "format": fmt,
+                    "layout": layout,
+                    "pages": n,
+                    "data": make_resume(seed, n, fmt, layout),
+                }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    ext = {"pdf": "pdf", "docx": "docx", "text": "txt"}
+    manifest = []
+    for doc in corpus(args.seed):
+        path = f"{doc['id']}.{ext[doc['format']]}"
+        with open(os.path.join(args.out, path), "wb") as f:
+            f.write(doc["data"])
+        manifest.append({k: v for k, v in doc.items() if k != "data"} | {"file": path})
+    for length in JD_LENGTHS:
+        path = f"jd-{length}-s{args.seed}.txt"
+        with open(os.path.join(args.out, path), "w", encoding="utf-8") as f:
+            f.write(make_jd(args.seed, length))
+        manifest.append({"id": f"jd-{length}", "file": path})
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"wrote {len(manifest)} files to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/load_parse_score.py
+"""
+Load test: /score latency while /parse is saturated.
+
+Starts the API under uvicorn, measures /score latency on its own, then
+again while several clients hammer /parse with large, distinct PDFs
+(distinct bytes so the parse cache never hits). Run from the repo root:
+
+    python -m benchmarks.load_parse_score [--parse-clients 8] [--seconds 10]
+"""
+import argparse
+import asyncio
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+LINE = "Led migration of data pipelines to Python and SQL; improved throughput 40% across teams"
+
+
+def _make_pdf(pages: int) -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    for _ in range(pages):
+        y = 740
+        while y > 60:
+            c.drawString(50, y, LINE)
+            y -= 14
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pct(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def _score_loop(client, stop_at, latencies):
+    payload = {"parsed": {"text": LINE * 40}, "job_description": "Python SQL data pipelines Kubernetes"}
+    while time.monotonic() < stop_at:
+        t0 = time.perf_counter()
+        r = await client.post("/score", json=payload)
+        r.raise_for_status()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(0.02)
+
+
+async def _parse_loop(client, stop_at, pdf, counts, worker):
+    i = 0
+    while time.monotonic() < stop_at:
+        i += 1
+        body = pdf + f"\n%{worker}-{i}\n".encode()
+        r = await client.post("/parse", files={"file": ("load.pdf", body)})
+        counts[r.status_code] = counts.get(r.status_code, 0) + 1
+        if r.status_code == 429:
+            await asyncio.sleep(0.05)
+
+
+async def _phase(base_url, seconds, parse_clients, pdf):
+    latencies, counts = [], {}
+    stop_at = time.monotonic() + seconds
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        tasks = [_score_loop(client, stop_at, latencies)]
+        tasks += [_parse_loop(client, stop_at, pdf, counts, w) for w in range(parse_clients)]
+        await asyncio.gather(*tasks)
+    return latencies, counts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--parse-clients", type=int, default=8)
+    ap.add_argument("--pages", type=int, default=20)
+    ap.add_argument("--seconds", type=float, default=10)
+    args = ap.parse_args()
+
+    port = _free_port()
+    env = dict(os.environ)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + "/pool/stats", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        pdf = _make_pdf(args.pages)
+        idle, _ = asyncio.run(_phase(base_url, args.seconds, 0, pdf))
+        busy, counts = asyncio.run(_phase(base_url, args.seconds, args.parse_clients, pdf))
+        print(f"/score alone:          n={len(idle):4d} p50={_pct(idle, 50):7.1f}ms p99={_pct(idle, 99):7.1f}ms")
+        print(f"/score, /parse loaded: n={len(busy):4d} p50={_pct(busy, 50):7.1f}ms p99={_pct(busy, 99):7.1f}ms")
+        print(f"/parse responses by status: {counts}")
+        print(f"pools: {httpx.get(base_url + '/pool/stats').json()}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
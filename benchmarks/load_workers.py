@@ -0,0 +1,113 @@
+# benchmarks/load_workers.py
+"""
+Load test: /score throughput vs. the number of API workers under
+backend.serve. For each worker count, starts the launcher, keeps
+--clients concurrent clients scoring a long resume against a long JD for
+--seconds, and reports requests/second, latency percentiles and how the
+requests spread over the workers (from /workers/stats). Throughput should
+grow with the worker count up to the number of cores. Requests the score
+pools turn away (429: more clients than POOL_SCORE_QUEUE per worker) are
+counted apart from failures. Run from the repo root:
+
+    python -m benchmarks.load_workers [--workers 1,2,4] [--clients 16] [--seconds 10]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.corpus import make_jd, make_resume
+from benchmarks.load_parse_score import _free_port, _pct
+
+
+async def _client_loop(client, stop_at, payload, latencies, errors):
+    while time.monotonic() < stop_at:
+        t0 = time.perf_counter()
+        try:
+            status = (await client.post("/score", json=payload)).status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if status == 200:
+            latencies.append((time.perf_counter() - t0) * 1000)
+        else:
+            errors[status] = errors.get(status, 0) + 1
+            if status == 429:
+                await asyncio.sleep(0.01)
+
+
+async def _phase(base_url, clients, seconds, payload):
+    latencies, errors = [], {}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        # warm every worker's pool before timing
+        await asyncio.gather(*[client.post("/score", json=payload) for _ in range(clients)])
+        stop_at = time.monotonic() + seconds
+        await asyncio.gather(*[_client_loop(client, stop_at, payload, latencies, errors) for _ in range(clients)])
+    return latencies, errors
+
+
+def _wait_ready(base_url, workers, proc):
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"backend.serve exited with {proc.returncode}")
+        try:
+            stats = httpx.get(base_url + "/workers/stats", timeout=2).json()["workers"]
+            if len(stats) == workers and all(w["pid"] for w in stats):
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("workers did not start in time")
+
+
+def run(workers, clients, seconds, payload, state_dir):
+    port = _free_port()
+    env = dict(os.environ, SERVE_STATE_DIR=os.path.join(state_dir, f"w{workers}"), SERVE_HEARTBEAT="0.5")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.serve", "--workers", str(workers), "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base_url, workers, proc)
+        latencies, errors = asyncio.run(_phase(base_url, clients, seconds, payload))
+        time.sleep(1)
+        stats = httpx.get(base_url + "/workers/stats").json()["workers"]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+    return latencies, errors, stats
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", default="1,2,4")
+    ap.add_argument("--clients", type=int, default=16)
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--pages", type=int, default=3)
+    args = ap.parse_args()
+
+    payload = {"parsed": {"text": make_resume(0, args.pages, "text").decode()}, "job_description": make_jd(0, "long")}
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients, {args.seconds:.0f}s per run\n")
+    print(f"{'workers':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'429':>6} {'errors':>7} {'max RSS MB':>11}  served per worker")
+    baseline = None
+    with tempfile.TemporaryDirectory() as state_dir:
+        for n in (int(x) for x in args.workers.split(",")):
+            latencies, errors, stats = run(n, args.clients, args.seconds, payload, state_dir)
+            rps = len(latencies) / args.seconds
+            baseline = baseline or rps
+            rss = max(w["rss_bytes"] + w["pool_rss_bytes"] for w in stats) / 2**20
+            spread = " ".join(str(w["served"]) for w in stats)
+            rejected = errors.pop(429, 0)
+            print(f"{n:>7} {rps:>8.1f} {_pct(latencies, 50):>8.1f} {_pct(latencies, 95):>8.1f} {rejected:>6} {sum(errors.values()):>7} "
+                  f"{rss:>11.0f}  {spread}  ({rps / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
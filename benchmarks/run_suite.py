@@ -0,0 +1,208 @@
+# benchmarks/run_suite.py
+"""
+Regression benchmark suite over the synthetic corpus (benchmarks/corpus.py).
+
+Times the library entry points (parse_pdf_bytes, score_resume,
+ensemble_enhance, generate_docx, generate_pdf_from_text) and the API
+endpoints through a TestClient, and writes the results as JSON so runs
+from two commits can be compared. Run from the repo root:
+
+    python -m benchmarks.run_suite --out before.json        # on the old commit
+    python -m benchmarks.run_suite --out after.json         # on the new one
+    python -m benchmarks.run_suite --compare before.json after.json
+
+Options: --quick (fewer/smaller documents), --filter SUBSTRING,
+--min-time SECONDS per case (default 1.0), --seed N. --compare exits with
+status 1 when any case's median is slower than --threshold (default 0.10).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import make_jd, make_resume
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _meta(args) -> Dict:
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "quick": args.quick,
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def measure(fn: Callable[[], object], min_time: float, min_rounds: int = 3, max_rounds: int = 1000) -> Dict:
+    fn()  # warm-up: imports, caches, compiled templates
+    times: List[float] = []
+    start = time.perf_counter()
+    while len(times) < max_rounds and (len(times) < min_rounds or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    ms = [t * 1000 for t in times]
+    return {
+        "rounds": len(ms),
+        "min_ms": round(ms[0], 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "stdev_ms": round(statistics.stdev(ms), 4) if len(ms) > 1 else 0.0,
+    }
+
+
+def library_cases(seed: int, quick: bool) -> List[Case]:
+    from backend.documents import parse_upload
+    from backend.ats_score import score_resume
+    from backend.enhancer import ensemble_enhance
+    from backend.parser import parse_pdf_bytes
+    from backend.template_engine import generate_docx, generate_pdf_from_text
+
+    pages = (1, 5) if quick else (1, 5, 20)
+    cases: List[Case] = []
+    docs = [("pdf", "classic", n) for n in pages] + [("pdf", "two_column", 5)]
+    docs += [(fmt, "classic", n) for fmt in ("docx", "text") for n in pages]
+    for fmt, layout, n in docs:
+        data = make_resume(seed, n, fmt, layout)
+        cases.append((f"parse/{fmt}-{layout}-{n}p", lambda d=data: parse_pdf_bytes(d)))
+
+    def _remove(path: str) -> None:
+        os.remove(path)
+
+    for n in pages:
+        parsed = parse_upload(make_resume(seed, n, "text"), "resume.txt")
+        for length in ("short", "long"):
+            jd = make_jd(seed, length)
+            cases.append((f"score/{length}-jd-{n}p", lambda p=parsed, j=jd: score_resume(p, j)))
+        jd = make_jd(seed, "medium")
+        enhanced = ensemble_enhance(parsed["text"], jd, model=parsed["model"])
+        cases.append((f"enhance/{n}p", lambda p=parsed, j=jd: ensemble_enhance(p["text"], j, model=p["model"])))
+        cases.append((f"generate_docx/{n}p", lambda e=enhanced: _remove(generate_docx(e))))
+        cases.append((f"generate_pdf_from_text/{n}p",
+                      lambda t=parsed["text"]: _remove(generate_pdf_from_text(t, name="Candidate"))))
+    return cases
+
+
+def api_cases(seed: int, quick: bool):
+    """(cases, client) for the endpoints; the caller closes the client."""
+    from fastapi.testclient import TestClient
+    from backend.documents import forget_document
+    from backend.main import app
+
+    client = TestClient(app)
+    client.__enter__()
+    pdf = make_resume(seed, 2, "pdf")
+    jd = make_jd(seed, "medium")
+    doc_id = client.post("/parse", files={"file": ("resume.pdf", pdf)}).json()["doc_id"]
+    enhanced = client.post("/enhance", json={"doc_id": doc_id, "job_description": jd}).json()
+
+    def post(path: str, **kwargs):
+        r = client.post(path, **kwargs)
+        r.raise_for_status()
+        return r
+
+    pdf_etag = post("/generate/pdf", json={"data": enhanced}).headers["etag"]
+
+    def generate_not_modified():
+        r = client.post("/generate/pdf", json={"data": enhanced}, headers={"If-None-Match": pdf_etag})
+        assert r.status_code == 304, r.status_code
+
+    def parse_uncached():
+        post("/parse", files={"file": ("resume.pdf", pdf)})
+        forget_document(doc_id)
+
+    cases: List[Case] = [
+        ("api/parse", parse_uncached),
+        ("api/parse-cached", lambda: post("/parse", files={"file": ("resume.pdf", pdf)})),
+        ("api/score", lambda: post("/score", json={"doc_id": doc_id, "job_description": jd})),
+        ("api/enhance", lambda: post("/enhance", json={"doc_id": doc_id, "job_description": jd})),
+        ("api/analyze", lambda: post("/analyze", data={"doc_id": doc_id, "job_description": jd,
+                                                        "stages": "score,enhance,render", "render": "pdf"})),
+        ("api/generate-docx", lambda: post("/generate/docx", json={"data": enhanced})),
+        ("api/generate-pdf", lambda: post("/generate/pdf", json={"data": enhanced})),
+        ("api/generate-pdf-304", generate_not_modified),
+    ]
+    return cases, client
+
+
+def run(args) -> Dict:
+    results: Dict[str, Dict] = {}
+    cases = library_cases(args.seed, args.quick)
+    api, client = api_cases(args.seed, args.quick)
+    try:
+        for name, fn in cases + api:
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(fn, args.min_time)
+            r = results[name]
+            print(f"{name:<36} {r['median_ms']:>10.2f} ms  (p95 {r['p95_ms']:.2f}, n={r['rounds']})", flush=True)
+    finally:
+        client.__exit__(None, None, None)
+    return {"meta": _meta(args), "results": results}
+
+
+def compare(base_path: str, new_path: str, threshold: float) -> int:
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"base {base['meta'].get('commit', '?')[:10]}  vs  new {new['meta'].get('commit', '?')[:10]}")
+    print(f"{'case':<36} {'base ms':>10} {'new ms':>10} {'change':>8}")
+    regressions = 0
+    for name in sorted(set(base["results"]) | set(new["results"])):
+        b, n = base["results"].get(name), new["results"].get(name)
+        if b is None or n is None:
+            print(f"{name:<36} {'-' if b is None else b['median_ms']:>10} {'-' if n is None else n['median_ms']:>10}")
+            continue
+        change = n["median_ms"] / b["median_ms"] - 1 if b["median_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<36} {b['median_ms']:>10.2f} {n['median_ms']:>10.2f} {change:>+8.1%}{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", help="write JSON results here")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--quick", action="store_true")
+    ap.add_argument("--filter")
+    ap.add_argument("--min-time", type=float, default=1.0)
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    ap.add_argument("--threshold", type=float, default=0.10)
+    args = ap.parse_args()
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+    report = run(args)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# frontend/api_client.py
+"""
+HTTP client the Streamlit app talks to the API through.
+
+One requests.Session serves the whole Streamlit server (st.cache_resource),
+so every rerun, and every user, reuses pooled keep-alive connections
+instead of opening a TCP connection per click. Responses arrive
+gzip-compressed (the API compresses JSON for clients sending
+Accept-Encoding: gzip), and JSON bodies of GZIP_MIN_BYTES or more are sent
+gzip-compressed.
+
+Configuration (environment):
+  API_URL        backend base URL (default http://127.0.0.1:8000)
+  API_POOL_SIZE  keep-alive connections kept open to the backend (default 8)
+"""
+from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
+import json
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+API_URL = os.environ.get("API_URL", "http://127.0.0.1:8000")
+GZIP_MIN_BYTES = 1024
+EXPORTS = {"docx": "/generate/docx", "pdf": "/generate/pdf"}
+
+
+@st.cache_resource
+def api_session() -> requests.Session:
+    pool = int(os.environ.get("API_POOL_SIZE", "8"))
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
+
+def content_key(data: bytes) -> str:
+    """SHA-256 of an upload: the doc_id the API assigns it."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_key(value: Any) -> str:
+    """Short stable hash of a string or JSON-serialisable value, for memo keys."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+
+
+def post_json(path: str, payload: Dict[str, Any], timeout: float = 120, **kwargs) -> requests.Response:
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return api_session().post(API_URL + path, data=body, headers=headers, timeout=timeout, **kwargs)
+
+
+def post_file(path: str, filename: str, data: bytes, form: Optional[Dict[str, str]] = None,
+              timeout: float = 120, **kwargs) -> requests.Response:
+    return api_session().post(API_URL + path, files={"file": (filename, data)}, data=form, timeout=timeout, **kwargs)
+
+
+def post_parsed(path: str, parsed: Dict[str, Any], extra: Dict[str, Any], timeout: float = 120) -> requests.Response:
+    """
+    Post a request about a parsed resume by its doc_id, falling back to the
+    whole parse if the API no longer has the document (restarted, evicted).
+    """
+    if parsed.get("doc_id"):
+        res = post_json(path, dict(extra, doc_id=parsed["doc_id"]), timeout=timeout)
+        if res.status_code != 404:
+            return res
+    return post_json(path, dict(extra, parsed=parsed), timeout=timeout)
+
+
+def export_all(data: Dict[str, Any], timeout: float = 120) -> Dict[str, requests.Response]:
+    """Render every export format of the enhanced resume at once; {"docx": response, "pdf": response}."""
+    payload = {"data": data}
+    with ThreadPoolExecutor(max_workers=len(EXPORTS)) as pool:
+        futures = {kind: pool.submit(post_json, path, payload, timeout) for kind, path in EXPORTS.items()}
+        return {kind: f.result() for kind, f in futures.items()}
@@ -0,0 +1,47 @@
+# tests/conftest.py
+"""
+Shared fixtures. State directories point at a per-session temp dir, and the
+environment is set before backend.main is imported, since several modules
+read their configuration at import time.
+"""
+import os
+import tempfile
+
+import pytest
+
+_ROOT = tempfile.mkdtemp(prefix="airezume_tests_")
+os.environ.update({
+    "JOB_DIR": os.path.join(_ROOT, "jobs"),
+    "JOB_RUNNER": "0",
+    "REQUISITION_DIR": os.path.join(_ROOT, "requisitions"),
+    "SEARCH_DB": os.path.join(_ROOT, "search.db"),
+    "SERVE_STATE_DIR": os.path.join(_ROOT, "serve"),
+    "PROFILE_REQUESTS": "1",
+    "PROFILE_DIR": os.path.join(_ROOT, "profiles"),
+    "WARMUP": "none",
+    "LLM_BACKEND": "none",
+})
+os.environ.pop("ARTIFACT_DIR", None)
+
+RESUMES = [
+    "Jane Doe\njane@example.com\n\nSummary\nBackend engineer building Python services.\n\n"
+    "Skills\nPython, FastAPI, PostgreSQL, Docker, Kubernetes, AWS\n\n"
+    "Experience\nSenior Engineer, Acme (2019-2024)\n- Built REST APIs in FastAPI serving 2M requests a day\n"
+    "- Moved batch jobs to Kubernetes, cutting costs by 30%\n",
+    "John Smith\njohn@example.com\n\nSkills\nJava, Spring Boot, MySQL\n\n"
+    "Experience\nDeveloper, Initech (2016-2023)\n- Maintained Spring Boot services\n- Wrote SQL reports\n",
+    "Ana Lima\n\nSkills\nReact, TypeScript, CSS, Figma\n\n"
+    "Experience\nFrontend Engineer, Globex (2020-2024)\n- Shipped a design system in React\n",
+]
+JD = ("Senior Python backend engineer. Must have Python, FastAPI, PostgreSQL and Docker; "
+      "Kubernetes and AWS are a plus. You will design REST APIs and run services in production.")
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    with TestClient(app) as c:
+        yield c
@@ -0,0 +1,37 @@
+# tests/test_artifacts.py
+import os
+import time
+
+from backend.artifacts import ArtifactStore, artifact_key
+
+
+def _touch(path: str, age: float = 0.0) -> None:
+    with open(path, "wb") as f:
+        f.write(b"x")
+    if age:
+        t = time.time() - age
+        os.utime(path, (t, t))
+
+
+def test_sweep_only_removes_expired_artifacts(tmp_path):
+    store = ArtifactStore(str(tmp_path), ttl=60)
+    old, fresh = artifact_key("pdf", {"a": 1}), artifact_key("docx", {"a": 2})
+    _touch(str(tmp_path / old), age=120)
+    _touch(str(tmp_path / fresh))
+    _touch(str(tmp_path / "notes.txt"), age=120)
+    _touch(str(tmp_path / ("0" * 64 + ".txt")), age=120)
+    _touch(str(tmp_path / "artifact-abc.part"))
+    _touch(str(tmp_path / "artifact-old.part"), age=120)
+    assert store.sweep() == 2
+    assert sorted(os.listdir(tmp_path)) == sorted([fresh, "notes.txt", "0" * 64 + ".txt", "artifact-abc.part"])
+
+
+def test_clear_keeps_foreign_and_in_flight_files(tmp_path):
+    store = ArtifactStore(str(tmp_path), ttl=60)
+    key = artifact_key("pdf", {"a": 1})
+    store.put(key, b"%PDF")
+    _touch(str(tmp_path / "notes.txt"))
+    _touch(str(tmp_path / "artifact-inflight.part"))
+    assert store.clear() == 1
+    assert not store.has(key)
+    assert sorted(os.listdir(tmp_path)) == ["artifact-inflight.part", "notes.txt"]
@@ -0,0 +1,55 @@
+# tests/test_compression.py
+import gzip
+import json
+import re
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.compression import GzipRequestMiddleware
+from conftest import JD, RESUMES
+
+
+def _count(client, route: str) -> int:
+    text = client.get("/metrics").text
+    pattern = rf'airezume_http_request_duration_seconds_count\{{method="POST",route="{re.escape(route)}",status="200"\}} (\d+)'
+    return sum(int(n) for n in re.findall(pattern, text))
+
+
+def _gzip_json(data) -> bytes:
+    return gzip.compress(json.dumps(data).encode("utf-8"))
+
+
+def test_gzip_request_is_decoded_and_routed(client):
+    body = {"parsed": {"text": RESUMES[0]}, "job_description": JD}
+    plain = client.post("/score", json=body)
+    before, unmatched = _count(client, "/score"), _count(client, "unmatched")
+    r = client.post("/score", content=_gzip_json(body),
+                    headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.json() == plain.json()
+    # the metrics middleware sees the route the router matched
+    assert _count(client, "/score") == before + 1
+    assert _count(client, "unmatched") == unmatched
+
+
+def _echo_app(max_bytes: int) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body()), "length": request.headers.get("content-length")}
+
+    app.add_middleware(GzipRequestMiddleware, max_bytes=max_bytes)
+    return TestClient(app)
+
+
+def test_gzip_limits():
+    c = _echo_app(max_bytes=1000)
+    headers = {"Content-Encoding": "gzip"}
+    ok = c.post("/echo", content=gzip.compress(b"x" * 1000), headers=headers)
+    assert ok.json() == {"size": 1000, "length": "1000"}
+    assert c.post("/echo", content=gzip.compress(b"x" * 1001), headers=headers).status_code == 413
+    assert c.post("/echo", content=b"not gzip", headers=headers).status_code == 400
+    assert c.post("/echo", content=gzip.compress(b"x" * 100)[:-8], headers=headers).status_code == 400
+    assert c.post("/echo", content=b"plain").json()["size"] == 5
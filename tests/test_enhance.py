@@ -0,0 +1,38 @@
+# tests/test_enhance.py
+import asyncio
+
+from backend.main import _enhance_with_etag
+from backend.resume_model import build_model
+from conftest import JD, RESUMES
+
+
+def _parse(client, text: str) -> dict:
+    r = client.post("/parse", files={"file": ("resume.txt", text.encode("utf-8"), "text/plain")})
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_text_and_doc_id_share_cache_entry(client):
+    doc = _parse(client, RESUMES[0])
+    by_text = client.post("/enhance", json={"parsed": {"text": RESUMES[0]}, "job_description": JD})
+    by_doc = client.post("/enhance", json={"doc_id": doc["doc_id"], "job_description": JD})
+    assert by_text.status_code == by_doc.status_code == 200
+    assert by_text.headers["etag"] == by_doc.headers["etag"]
+    assert by_text.json() == by_doc.json()
+
+
+def test_cache_key_includes_model():
+    text = RESUMES[0]
+    model = build_model(text)
+    edited = dict(model, skills=["COBOL"])
+    _, plain_etag = asyncio.run(_enhance_with_etag({"text": text, "model": model}, JD))
+    result, edited_etag = asyncio.run(_enhance_with_etag({"text": text, "model": edited}, JD))
+    assert plain_etag != edited_etag
+    assert "COBOL" in result["skills"]
+
+
+def test_if_none_match(client):
+    first = client.post("/enhance", json={"parsed": {"text": RESUMES[1]}, "job_description": JD})
+    again = client.post("/enhance", json={"parsed": {"text": RESUMES[1]}, "job_description": JD},
+                        headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
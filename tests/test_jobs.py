@@ -0,0 +1,115 @@
+# tests/test_jobs.py
+import io
+import time
+import zipfile
+
+import pytest
+
+from backend.jobs import ItemTimeout, JobRunner, JobStore, _timed_call
+from benchmarks.corpus import make_resume
+from conftest import JD, RESUMES
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path))
+
+
+def _zip_job(store, files) -> str:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    job_id = store.new_job_id()
+    path = store.zip_path(job_id)
+    with open(path, "wb") as f:
+        f.write(buf.getvalue())
+    store.create(job_id, JD, list(files), zip_path=path)
+    return job_id
+
+
+def _wait(store, job_id, timeout=30.0):
+    deadline = time.time() + timeout
+    while store.get(job_id)["status"] in ("queued", "running"):
+        assert time.time() < deadline, "job did not finish"
+        time.sleep(0.05)
+    return store.progress(job_id)
+
+
+def test_inline_job_ranks_results(store):
+    files = {f"r{i}.txt": t.encode("utf-8") for i, t in enumerate(RESUMES)}
+    files["bad.pdf"] = b"%PDF-1.4 not really"
+    job_id = _zip_job(store, files)
+    JobRunner(store, workers=0).run_job(job_id)
+    progress = store.progress(job_id)
+    assert (progress["status"], progress["done"], progress["failed"], progress["pending"]) == ("done", 3, 1, 0)
+    rows = list(store.results(job_id))
+    scores = [r["ats_score"] for r in rows if r["status"] == "done"]
+    assert scores == sorted(scores, reverse=True)
+    assert [r["rank"] for r in rows] == [1, 2, 3, None]
+    assert rows[-1]["name"] == "bad.pdf" and "unreadable PDF" in rows[-1]["error"]
+
+
+def test_results_page_through_large_jobs(store):
+    n = 1203
+    job_id = store.new_job_id()
+    store.create(job_id, JD, [f"r{i}" for i in range(n)])
+    store.finish_items(job_id, [(i, None, {"ats_score": float(i % 97)}, None) for i in range(n - 3)]
+                       + [(i, None, None, "broken") for i in range(n - 3, n)])
+    rows = list(store.results(job_id))
+    assert len(rows) == n
+    assert [r["index"] for r in rows[-3:]] == [n - 3, n - 2, n - 1]
+    scores = [r["ats_score"] for r in rows[:-3]]
+    assert scores == sorted(scores, reverse=True)
+    assert [r["rank"] for r in store.results(job_id, top_k=600)] == list(range(1, 601))
+
+
+def test_requeued_job_only_reruns_pending_items(store, tmp_path):
+    files = {f"r{i}.txt": t.encode("utf-8") for i, t in enumerate(RESUMES)}
+    job_id = _zip_job(store, files)
+    store.set_status(job_id, "running")
+    store.finish_items(job_id, [(0, None, {"ats_score": 1.0}, None)])
+    # a restart finds the job still marked running
+    restarted = JobStore(str(tmp_path))
+    assert restarted.requeue_interrupted() == 1
+    assert restarted.get(job_id)["status"] == "queued"
+    JobRunner(restarted, workers=0).run_job(job_id)
+    rows = {r["index"]: r for r in restarted.results(job_id)}
+    assert rows[0]["ats_score"] == 1.0
+    assert restarted.progress(job_id)["done"] == 3
+
+
+def test_missing_upload_fails_job_and_runner_continues(store):
+    files = {"r0.txt": RESUMES[0].encode("utf-8")}
+    lost = _zip_job(store, files)
+    with open(store.zip_path(lost), "wb") as f:
+        f.write(b"not a zip")
+    ok = _zip_job(store, files)
+    runner = JobRunner(store, workers=0, poll=0.05)
+    runner.start()
+    try:
+        assert _wait(store, lost)["status"] == "failed"
+        assert _wait(store, ok)["status"] == "done"
+    finally:
+        runner.stop()
+    assert store.get(lost)["error"]
+
+
+def test_timed_call_interrupts():
+    with pytest.raises(ItemTimeout):
+        _timed_call(0.05, time.sleep, (2,))
+    result, _, _ = _timed_call(1.0, sum, ([1, 2],))
+    assert result == 3
+
+
+def test_worker_item_timeout_marks_item_failed(store):
+    job_id = _zip_job(store, {"long.pdf": make_resume(7, pages=20), "short.txt": RESUMES[0].encode("utf-8")})
+    runner = JobRunner(store, workers=1, poll=0.05, item_timeout=0.2)
+    try:
+        runner.run_job(job_id)
+    finally:
+        runner.stop()
+    rows = {r["name"]: r for r in store.results(job_id)}
+    assert rows["long.pdf"]["status"] == "failed"
+    assert rows["long.pdf"]["error"] == "item exceeded 0.2s"
+    assert store.progress(job_id)["status"] == "done"
@@ -0,0 +1,63 @@
+# tests/test_llm.py
+import asyncio
+import json
+from typing import List
+
+from backend.llm import LLMEnhancer, MicroBatcher
+from backend.llm_stub import _answer
+from conftest import JD, RESUMES
+
+
+class FakeClient:
+    """Answers like backend/llm_stub.py, or with fixed text; records each upstream call."""
+
+    model = "fake"
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.calls: List[List[str]] = []
+
+    async def complete(self, prompts: List[str], max_tokens: int = 256) -> List[str]:
+        self.calls.append(prompts)
+        await asyncio.sleep(0)
+        return [self.reply if self.reply is not None else _answer(p) for p in prompts]
+
+    async def aclose(self) -> None:
+        pass
+
+
+def test_batcher_groups_concurrent_prompts():
+    client = FakeClient(reply="ok")
+    batcher = MicroBatcher(client, max_batch=4, max_wait=0.01)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(f"p{i}") for i in range(10)))
+
+    assert asyncio.run(run()) == ["ok"] * 10
+    assert [len(c) for c in client.calls] == [4, 4, 2]
+    assert (batcher.batches, batcher.prompts) == (3, 10)
+
+
+def test_rewrites_and_skills_are_cached():
+    client = FakeClient()
+    llm = LLMEnhancer(client, max_wait=0.001)
+    first = asyncio.run(llm.enhance(RESUMES[0], JD))
+    calls = sum(len(c) for c in client.calls)
+    again = asyncio.run(llm.enhance(RESUMES[0], JD))
+    assert again == first
+    assert sum(len(c) for c in client.calls) == calls
+    assert first["metadata"]["source_enhancer"] == "llm-v1"
+    # the stub reports skills found in both texts
+    assert "python" in first["skills"]
+
+
+def test_malformed_output_falls_back_and_is_not_cached():
+    client = FakeClient(reply="Sorry, I cannot help with that.")
+    llm = LLMEnhancer(client, max_wait=0.001)
+    result = asyncio.run(llm.enhance(RESUMES[0], JD))
+    assert llm.cache.stats()["items"] == 0
+    # bullets keep the rule-based text
+    client.reply = json.dumps({"rewritten": "Shipped it"})
+    retried = asyncio.run(llm.enhance(RESUMES[0], JD))
+    assert retried["bullets"][1:] and all(b == "Shipped it" for b in retried["bullets"][1:])
+    assert result["bullets"][1:] != retried["bullets"][1:]
@@ -0,0 +1,79 @@
+# tests/test_metrics.py
+import asyncio
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from fastapi import FastAPI
+
+from backend.metrics import MetricsMiddleware, capture_call, profile_dir, read_profile, stage
+
+
+def test_valid_request_id_is_kept(client):
+    r = client.get("/pool/stats", headers={"X-Request-Id": "trace-42"})
+    assert r.headers["x-request-id"] == "trace-42"
+
+
+def test_unsafe_request_id_is_replaced(client):
+    for bad in ("../escaped", "a/b", "..", "id with spaces", "ids;rm"):
+        r = client.get("/pool/stats", headers={"X-Request-Id": bad, "X-Profile": "1"})
+        rid = r.headers["x-request-id"]
+        assert rid != bad
+        assert re.fullmatch(r"[0-9a-f]{32}", rid)
+        assert os.path.exists(os.path.join(profile_dir(), f"{rid}.json"))
+    assert not os.path.exists(os.path.join(os.path.dirname(profile_dir()), "escaped.json"))
+
+
+def test_profile_round_trip(client):
+    r = client.get("/pool/stats", headers={"X-Request-Id": "profiled-1", "X-Profile": "1"})
+    assert r.headers["x-profile-id"] == "profiled-1"
+    report = client.get("/profiles/profiled-1")
+    assert report.status_code == 200
+    assert report.json()["route"] == "/pool/stats"
+
+
+def test_read_profile_rejects_paths():
+    assert read_profile("../profiled-1") is None
+    assert read_profile("/etc/passwd") is None
+
+
+def test_capture_call_keeps_concurrent_stages_apart():
+    barrier = threading.Barrier(2)
+
+    def work(name):
+        with stage(f"{name}-1"):
+            barrier.wait()
+        with stage(f"{name}-2"):
+            barrier.wait()
+        return name
+
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(lambda n: capture_call(work, (n,)), ["a", "b"]))
+    for result, stages, _ in results:
+        assert [s for s, _ in stages] == [f"{result}-1", f"{result}-2"]
+
+
+def test_one_profile_at_a_time():
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.2)
+        return {}
+
+    app.add_middleware(MetricsMiddleware)
+
+    async def both():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            return await asyncio.gather(*(c.get("/slow", headers={"X-Profile": "1"}) for _ in range(2)))
+
+    responses = asyncio.run(both())
+    assert all(r.status_code == 200 for r in responses)
+    assert sorted(("x-profile-id" in r.headers, r.headers.get("x-profile")) for r in responses) == \
+        [(False, "busy"), (True, None)]
+    # the lock is released: the next profiled request gets its profile
+    again = asyncio.run(both())
+    assert any("x-profile-id" in r.headers for r in again)
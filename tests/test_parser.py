@@ -0,0 +1,85 @@
+# tests/test_parser.py
+import io
+import zipfile
+
+import pytest
+
+import backend.parser as parser
+from backend.parser import ParseLimitError, _CappedReader, extract_pdf_pages, iter_pdf_pages, parse_pdf_bytes, sniff_format
+from benchmarks.corpus import make_resume
+
+
+def test_parallel_pages_match_serial(monkeypatch):
+    pdf = make_resume(21, pages=4)
+    serial = extract_pdf_pages(pdf, workers=1)
+    assert len(serial) == 4 and all(serial)
+    monkeypatch.setattr(parser, "PARALLEL_MIN_PAGES", 2)
+    assert extract_pdf_pages(pdf, workers=2) == serial
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_page_limit(workers):
+    with pytest.raises(ParseLimitError, match="4 pages"):
+        extract_pdf_pages(make_resume(22, pages=4), max_pages=3, workers=workers)
+
+
+def test_page_limit_before_first_page():
+    pages = iter_pdf_pages(make_resume(23, pages=4), max_pages=3)
+    with pytest.raises(ParseLimitError):
+        next(pages)
+
+
+def test_byte_limit(monkeypatch):
+    pdf = make_resume(24, pages=1)
+    monkeypatch.setattr(parser, "MAX_BYTES", len(pdf) - 1)
+    with pytest.raises(ParseLimitError, match="bytes"):
+        parse_pdf_bytes(pdf)
+
+
+def test_page_limit_is_413(client):
+    pdf = make_resume(25, pages=parser.MAX_PAGES + 1)
+    r = client.post("/parse", files={"file": ("long.pdf", pdf, "application/pdf")})
+    assert r.status_code == 413
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _docx(xml: bytes, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as zf:
+        zf.writestr("[Content_Types].xml", "<Types/>")
+        zf.writestr("word/document.xml", xml)
+    return buf.getvalue()
+
+
+def _paragraphs(*texts: str) -> bytes:
+    body = "".join(f"<w:p><w:r><w:t>{t}</w:t></w:r></w:p>" for t in texts)
+    return f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'.encode()
+
+
+def test_docx_paragraphs():
+    assert sniff_format(make_resume(26, fmt="docx")) == "docx"
+    assert parse_pdf_bytes(_docx(_paragraphs("Jane Doe", "", "Python developer"))) == "Jane Doe\nPython developer"
+
+
+def test_capped_reader_stops_past_limit():
+    # backs up the declared-size check while document.xml streams through iterparse
+    reader = _CappedReader(io.BytesIO(b"x" * 100), 60)
+    assert len(reader.read(60)) == 60
+    with pytest.raises(ParseLimitError, match="exceeds 60"):
+        reader.read(10)
+    with pytest.raises(ParseLimitError):
+        _CappedReader(io.BytesIO(b"x" * 100), 60).read()
+
+
+def test_docx_over_declared_size(monkeypatch):
+    monkeypatch.setattr(parser, "MAX_XML_BYTES", 10_000)
+    with pytest.raises(ParseLimitError, match="uncompressed"):
+        parse_pdf_bytes(_docx(_paragraphs(*["x" * 1000] * 50)))
+
+
+def test_corrupt_docx_is_422(client):
+    data = _docx(b"<w:document><w:body><w:p>")
+    r = client.post("/parse", files={"file": ("broken.docx", data, "application/octet-stream")})
+    assert r.status_code == 422
@@ -0,0 +1,88 @@
+# tests/test_requisitions.py
+import pytest
+
+from backend.ats_score import score_resume
+from backend.requisitions import RequisitionError, RequisitionExists, RequisitionIndex
+from conftest import JD, RESUMES
+
+JAVA_JD = "Java developer with Spring Boot and MySQL, writing SQL reports."
+FRONTEND_JD = "Frontend engineer: React, TypeScript and CSS; Figma a plus."
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = RequisitionIndex(str(tmp_path))
+    idx.add(JD, title="backend", req_id="py")
+    idx.add(JAVA_JD, title="java", req_id="java")
+    idx.add(FRONTEND_JD, title="frontend", req_id="fe")
+    return idx
+
+
+def _ranked(index, text, **kw):
+    return [m["req_id"] for m in index.match({"text": text}, **kw)["matches"]]
+
+
+def test_each_resume_ranks_its_own_jd_first(index):
+    assert [_ranked(index, t)[0] for t in RESUMES] == ["py", "java", "fe"]
+
+
+def test_details_are_the_exact_score(index):
+    top = index.match({"text": RESUMES[0]}, top_n=1, details=True)["matches"][0]
+    assert top["detail"] == score_resume({"text": RESUMES[0]}, JD)
+    # the index score estimates ats_score
+    assert top["score"] == pytest.approx(top["detail"]["ats_score"], abs=15)
+
+
+def test_closed_requisitions_stop_matching(index):
+    assert index.close("py") and not index.close("py")
+    assert index.get("py")["status"] == "closed"
+    assert "py" not in _ranked(index, RESUMES[0])
+    assert index.match({"text": RESUMES[0]})["total"] == 2
+    assert [r["req_id"] for r in index.list_requisitions("closed")["requisitions"]] == ["py"]
+
+
+def test_duplicate_and_empty_are_rejected(index):
+    with pytest.raises(RequisitionExists):
+        index.add(JD, req_id="py")
+    with pytest.raises(RequisitionError):
+        index.add("  ")
+    assert index.list_requisitions()["total"] == 3
+
+
+def test_rebuild_after_many_closes_keeps_ranking(tmp_path):
+    idx = RequisitionIndex(str(tmp_path), refit_fraction=0.2)
+    idx.add_many([{"job_description": f"{FRONTEND_JD} Opening {i}.", "req_id": f"fe{i}"} for i in range(10)])
+    idx.add(JD, req_id="py")
+    for i in range(5):
+        idx.close(f"fe{i}")
+    assert _ranked(idx, RESUMES[0])[0] == "py"
+    assert set(_ranked(idx, RESUMES[2], top_n=10)) == {"py"} | {f"fe{i}" for i in range(5, 10)}
+    assert idx.stats()["open"] == 6
+
+
+def test_processes_share_one_database(index, tmp_path):
+    other = RequisitionIndex(str(tmp_path))
+    other.add("Rust systems programmer", req_id="rust")
+    other.close("java")
+    assert "rust" in _ranked(index, RESUMES[1]) and "java" not in _ranked(index, RESUMES[1])
+
+
+def test_snapshot_round_trip(index, tmp_path):
+    before = index.match({"text": RESUMES[0]})
+    index.save()
+    restarted = RequisitionIndex(str(tmp_path))
+    assert restarted.stats()["rows"] == 3
+    assert restarted.match({"text": RESUMES[0]}) == before
+
+
+def test_api(client):
+    r = client.post("/requisitions", json={"job_description": JAVA_JD, "title": "java", "req_id": "api-java"})
+    assert r.status_code == 201 and r.json()["status"] == "open"
+    assert client.post("/requisitions", json={"job_description": JAVA_JD, "req_id": "api-java"}).status_code == 409
+    assert client.post("/requisitions", json={"job_description": ""}).status_code == 422
+    match = client.post("/requisitions/match", json={"parsed": {"text": RESUMES[1]}, "top_n": 5}).json()
+    assert match["matches"][0]["req_id"] == "api-java"
+    assert client.post("/requisitions/api-java/close").json()["status"] == "closed"
+    assert client.post("/requisitions/missing/close").status_code == 404
+    match = client.post("/requisitions/match", json={"parsed": {"text": RESUMES[1]}}).json()
+    assert "api-java" not in [m["req_id"] for m in match["matches"]]
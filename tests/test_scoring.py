@@ -0,0 +1,40 @@
+# tests/test_scoring.py
+from conftest import JD, RESUMES
+
+
+def test_single_score_matches_batch(client):
+    batch = client.post("/score/batch", json={"resumes": [{"text": t} for t in RESUMES],
+                                              "job_description": JD, "top_k": None})
+    assert batch.status_code == 200
+    by_index = {r["index"]: r for r in batch.json()["results"]}
+    assert len(by_index) == len(RESUMES)
+    for i, text in enumerate(RESUMES):
+        single = client.post("/score", json={"parsed": {"text": text}, "job_description": JD})
+        assert single.status_code == 200
+        many = {k: v for k, v in by_index[i].items() if k not in ("rank", "index")}
+        assert single.json() == many
+
+
+def test_score_does_not_depend_on_batch(client):
+    # IDF is per (JD, resume) pair (or a fitted table), so batch-mates do not matter
+    alone = client.post("/score/batch", json={"resumes": [{"text": RESUMES[0]}], "job_description": JD})
+    together = client.post("/score/batch", json={"resumes": [{"text": t} for t in RESUMES], "job_description": JD})
+    first = next(r for r in together.json()["results"] if r["index"] == 0)
+    assert alone.json()["results"][0]["ats_score"] == first["ats_score"]
+
+
+def test_client_index_is_not_trusted(client):
+    plain = client.post("/score", json={"parsed": {"text": RESUMES[0]}, "job_description": JD}).json()
+    forged = {"index": {"tokens": ["cobol"], "offsets": "not offsets"}, "sections": [{"start": None}]}
+    for path, body in (("/score", {"parsed": {"text": RESUMES[0], "model": forged}, "job_description": JD}),
+                       ("/score/sessions", {"parsed": {"text": RESUMES[0], "model": forged}, "job_description": JD}),
+                       ("/score/batch", {"resumes": [{"text": RESUMES[0], "model": forged}], "job_description": JD})):
+        r = client.post(path, json=body)
+        assert r.status_code in (200, 201), (path, r.text)
+        got = r.json().get("score") or r.json().get("results", [r.json()])[0]
+        assert got["ats_score"] == plain["ats_score"], path
+
+
+def test_malformed_parsed_is_422(client):
+    for parsed in ({"text": 42}, {"text": RESUMES[0], "model": "model"}):
+        assert client.post("/score", json={"parsed": parsed, "job_description": JD}).status_code == 422
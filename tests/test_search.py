@@ -0,0 +1,75 @@
+# tests/test_search.py
+import time
+
+import pytest
+
+from backend.search import SearchIndex, SearchQueryError, translate_query
+from conftest import RESUMES
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = SearchIndex(str(tmp_path / "search.db"))
+    idx.add_many({"doc_id": f"r{i}", "text": t} for i, t in enumerate(RESUMES))
+    return idx
+
+
+def _ids(index, query, **kw):
+    return sorted(r["doc_id"] for r in index.search(query, **kw)["results"])
+
+
+@pytest.mark.parametrize("query, fts", [
+    ("k8s", "skills:skillkubernetes"),
+    # NOT binds tighter than AND
+    ("kubernetes AND (java OR react) NOT php",
+     "(skills:skillkubernetes AND ((skills:skilljava OR skills:skillreact) NOT skills:skillphp))"),
+    ('"design system" python', '(text:"design system" AND skills:skillpython)'),
+    ('"machine learning"', "skills:skillmachinelearning"),
+])
+def test_translate_query(query, fts):
+    assert translate_query(query) == fts
+
+
+@pytest.mark.parametrize("query", ["", "NOT php", "(python", "python)", "AND"])
+def test_bad_queries(query):
+    with pytest.raises(SearchQueryError):
+        translate_query(query)
+
+
+def test_boolean_queries(index):
+    assert _ids(index, "k8s") == ["r0"]
+    assert _ids(index, "python OR java") == ["r0", "r1"]
+    assert _ids(index, "engineer NOT react") == ["r0"]
+    assert _ids(index, '"design system"') == ["r2"]
+    # porter stemming on the text column
+    assert _ids(index, "shipping") == ["r2"]
+    boolean = index.search("engineer", mode="boolean")
+    assert boolean["total"] == 2 and len(boolean["results"]) == 2
+
+
+def test_ranked_results_best_first(index):
+    index.add("extra", "Notes mention SQL once, then a long story about gardening, hiking and travel.")
+    ranked = index.search("sql")["results"]
+    assert {r["doc_id"] for r in ranked} == {"r1", "extra"}
+    assert ranked[0]["score"] >= ranked[1]["score"]
+
+
+def test_reindex_delete_and_since(index):
+    old = time.time() - 10 * 86400
+    index.add_many([{"doc_id": "r1", "text": "Rust developer", "indexed": old}])
+    assert _ids(index, "java") == []
+    assert _ids(index, "rust") == ["r1"]
+    assert _ids(index, "developer", since_days=5) == []
+    assert index.delete("r1") and not index.delete("r1")
+    assert "r1" not in index and index.stats()["documents"] == 2
+    assert index.compact()["documents"] == 2
+
+
+def test_parsed_resumes_are_searchable(client):
+    text = "Zed Quill\n\nSkills\nErlang, Elixir\n"
+    doc = client.post("/parse", files={"file": ("z.txt", text.encode("utf-8"), "text/plain")}).json()
+    hits = client.get("/search", params={"q": "elixir"}).json()["results"]
+    assert doc["doc_id"] in [h["doc_id"] for h in hits]
+    assert client.get("/search", params={"q": "(elixir"}).status_code == 422
+    assert client.delete(f"/search/documents/{doc['doc_id']}").status_code == 200
+    assert client.delete(f"/search/documents/{doc['doc_id']}").status_code == 404
@@ -0,0 +1,122 @@
+# tests/test_sessions.py
+import bisect
+import random
+
+import pytest
+
+import backend.score_session as ss
+from backend.ats_score import score_resume
+from backend.cache import LRUCache
+from backend.resume_model import build_model
+from backend.score_session import ScoreSession, SessionError, SharedSessions, VersionConflict, _Offsets
+from benchmarks.corpus import make_jd, make_resume
+from conftest import JD, RESUMES
+
+PASTE = "Led migration of data pipelines to Kubernetes with Python, Go and Terraform.\n"
+
+
+def _edit(rng, text, jd):
+    kind = rng.choice(["keystroke", "word", "delete", "paste", "heading", "jd"])
+    at = rng.randrange(len(text) + 1)
+    if kind == "keystroke":
+        return {"target": "resume", "start": at, "end": at, "text": rng.choice("ab .-\n")}
+    if kind == "word":
+        return {"target": "resume", "start": at, "end": min(len(text), at + 6), "text": rng.choice(["docker", "SQL", "go", ""])}
+    if kind == "delete":
+        return {"target": "resume", "start": at, "end": min(len(text), at + rng.randint(1, 200)), "text": ""}
+    line = text.rfind("\n", 0, at) + 1
+    if kind == "paste":
+        return {"target": "resume", "start": line, "end": line, "text": PASTE}
+    if kind == "heading":
+        return {"target": "resume", "start": line, "end": line, "text": rng.choice(["Projects\n", "Skills\n"])}
+    at = rng.randrange(len(jd) + 1)
+    return {"target": "jd", "start": at, "end": at, "text": rng.choice([" rust", " graphql", "s", ""])}
+
+
+def _same(got, want):
+    for k in want:
+        if k in ("ats_score", "semantic"):
+            assert got[k] == pytest.approx(want[k], abs=0.01), k
+        else:
+            assert got[k] == want[k], k
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_edits_match_full_rescore(seed):
+    rng = random.Random(seed)
+    text = make_resume(seed, 2, "text").decode()
+    jd = make_jd(seed)
+    session = ScoreSession({"text": text, "model": build_model(text)}, jd)
+    _same(session.score(), score_resume({"text": text}, jd))
+    for _ in range(80):
+        got = session.apply([_edit(rng, session.text, session.jd)])
+        _same(got, score_resume({"text": session.text}, session.jd))
+    assert session.version == 80
+
+
+def test_offsets_follow_a_plain_list():
+    rng = random.Random(3)
+    plain = sorted(rng.sample(range(100_000), 2000))
+    offsets = _Offsets(plain)
+    for _ in range(300):
+        a = rng.randrange(len(plain) + 1)
+        b = min(len(plain), a + rng.choice([0, 1, 3, 600]))
+        lo = plain[a - 1] + 1 if a else 0
+        new = sorted(rng.sample(range(lo, lo + 50), rng.randint(0, 5)))
+        shift = (new[-1] + 1 if new else lo) + 60 - (plain[b] if b < len(plain) else lo)
+        plain[a:] = new + [o + shift for o in plain[b:]]
+        offsets.replace(a, b, new, shift)
+        assert len(offsets) == len(plain)
+        x = rng.randrange(plain[-1] + 2) if plain else 0
+        assert offsets.bisect_left(x) == bisect.bisect_left(plain, x)
+    assert list(offsets) == plain
+    assert offsets.slice(100, 900) == plain[100:900]
+
+
+def test_bad_edits_leave_the_session_untouched():
+    session = ScoreSession({"text": RESUMES[0]}, JD)
+    before = session.to_dict(texts=True)
+    edits = [{"start": 0, "end": 4, "text": "Jill"}, {"start": 5, "end": 10_000, "text": ""}]
+    with pytest.raises(SessionError):
+        session.apply(edits)
+    with pytest.raises(SessionError):
+        session.apply([{"target": "title", "start": 0, "end": 0}])
+    with pytest.raises(VersionConflict):
+        session.apply([{"start": 0, "end": 0, "text": "x"}], version=3)
+    assert session.to_dict(texts=True) == before
+
+
+def test_workers_share_sessions(tmp_path, monkeypatch):
+    shared = SharedSessions(str(tmp_path / "sessions.db"))
+    monkeypatch.setattr(ss, "_shared", shared)
+    monkeypatch.setattr(ss, "_sessions", LRUCache(max_items=10))
+    session = ss.create_session({"text": RESUMES[0]}, JD)
+    sid = session.session_id
+    # another worker applies an edit: this one's copy is now behind
+    text = session.text.replace("Python services", "Go services")
+    assert shared.save(sid, 1, text, JD)
+    rebuilt = ss._rebuilt
+    result = ss.update_session(sid, [{"start": 0, "end": 0, "text": "Dr. "}], version=1)
+    assert ss._rebuilt == rebuilt + 1
+    assert result["version"] == 2
+    assert ss.get_session(sid).text == "Dr. " + text
+    assert result["score"] == score_resume({"text": "Dr. " + text}, JD)
+    # a stale write loses
+    assert not shared.save(sid, 2, "stale", JD)
+    assert ss.delete_session(sid) and ss.get_session(sid) is None
+
+
+def test_api(client):
+    r = client.post("/score/sessions", json={"parsed": {"text": RESUMES[0]}, "job_description": JD})
+    assert r.status_code == 201
+    sid = r.json()["session_id"]
+    assert r.json()["score"] == client.post("/score", json={"parsed": {"text": RESUMES[0]}, "job_description": JD}).json()
+    edit = {"target": "jd", "start": len(JD), "end": len(JD), "text": " Terraform required."}
+    r = client.patch(f"/score/sessions/{sid}", json={"edits": [edit], "version": 0})
+    assert r.status_code == 200 and r.json()["version"] == 1
+    assert "terraform" in r.json()["score"]["missing_keywords"]
+    assert client.patch(f"/score/sessions/{sid}", json={"edits": [edit], "version": 0}).status_code == 409
+    assert client.patch(f"/score/sessions/{sid}", json={"edits": [{"start": -1, "end": 0}]}).status_code == 422
+    assert client.get(f"/score/sessions/{sid}", params={"texts": True}).json()["job_description"].endswith("required.")
+    assert client.delete(f"/score/sessions/{sid}").status_code == 200
+    assert client.patch(f"/score/sessions/{sid}", json={"edits": []}).status_code == 404
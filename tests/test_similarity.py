@@ -0,0 +1,34 @@
+# tests/test_similarity.py
+import numpy as np
+import pytest
+
+from backend.similarity import BM25Engine, TfidfEngine
+from conftest import JD, RESUMES
+
+
+@pytest.mark.parametrize("engine", [TfidfEngine, BM25Engine])
+def test_unfitted_batch_matches_pairs(engine):
+    e = engine()
+    docs = RESUMES + ["", "unrelated words only"]
+    assert np.allclose(e.score(JD, docs), [e.similarity(JD, d) for d in docs])
+
+
+def test_pair_idf_matches_similarity():
+    # score sessions rebuild the cosine from pair_idf(); both must agree
+    e = TfidfEngine()
+    a, b = "python python docker aws", "python kubernetes"
+    w = {t: e.pair_idf(t, 2 if t == "python" else 1) for t in ("python", "docker", "aws", "kubernetes")}
+    qa = np.array([(1 + np.log(2)) * w["python"], w["docker"], w["aws"], 0.0])
+    qb = np.array([w["python"], 0.0, 0.0, w["kubernetes"]])
+    assert e.similarity(a, b) == pytest.approx(qa @ qb / np.linalg.norm(qa) / np.linalg.norm(qb))
+
+
+def test_fitted_table_round_trip(tmp_path):
+    path = str(tmp_path / "idf.json")
+    fitted = TfidfEngine().fit(RESUMES + [JD])
+    fitted.save(path)
+    loaded = TfidfEngine().load(path)
+    assert loaded.fitted
+    assert np.allclose(loaded.score(JD, RESUMES), fitted.score(JD, RESUMES))
+    # with a table, a doc's score does not depend on the rest of the batch
+    assert loaded.score(JD, RESUMES[:1])[0] == pytest.approx(loaded.score(JD, RESUMES)[0])
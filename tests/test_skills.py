@@ -0,0 +1,70 @@
+# tests/test_skills.py
+import pytest
+
+from backend.ats_score import JobProfile, score_resume
+from backend.score_session import ScoreSession
+from backend.skills import SkillIndex, get_skill_index
+from backend.utils.text_cleanup import tokenize
+
+
+def _skills(text: str):
+    return get_skill_index().split(tokenize(text))[0]
+
+
+@pytest.mark.parametrize("text", [
+    "Python, Go and Kubernetes",
+    "Go developer",
+    "backend services in Go",
+    "golang",
+])
+def test_go_in_context_is_golang(text):
+    assert "golang" in _skills(text)
+
+
+@pytest.mark.parametrize("text", ["ready to go", "we go to the office", "go-to person"])
+def test_go_as_a_word_is_not_a_skill(text):
+    assert "golang" not in _skills(text)
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("GitHub and Git", ["github", "git"]),
+    ("pytest or JUnit for unit tests", ["pytest", "junit", "unit testing"]),
+    ("GitLab CI on GitLab", ["gitlab ci", "gitlab"]),
+    ("scikit basics, sklearn", ["scikit-learn"]),
+    ("Oracle DB, not Oracle Cloud", ["oracle database"]),
+])
+def test_tools_are_not_aliases_of_what_they_imply(text, skills):
+    assert _skills(text) == skills
+
+
+def test_jd_keywords_keep_go_and_two_letter_terms():
+    jd = "Backend engineer: Python, Go and PostgreSQL. QA and UX exposure, 10+ years, ready to go."
+    keywords = JobProfile(jd).keywords
+    assert "golang" in keywords and "qa" in keywords and "ux" in keywords
+    assert "go" not in keywords and "10" not in keywords
+
+
+def test_index_without_context_aliases():
+    index = SkillIndex({"golang": ("go lang",), "python": ()})
+    assert index.context == 0 and index.reach == index.max_len
+    assert index.split(tokenize("Python, Go"))[0] == ["python"]
+
+
+@pytest.mark.parametrize("resume, edit", [
+    # context arrives before the alias: "go" becomes golang
+    ("Keen on learning. I like go and hiking.", (20, 24, "use Rust,")),
+    # context word typed after it
+    ("Keen on learning. I like go and hiking.", (27, 27, " developer")),
+    # context leaves: golang falls back to a plain word
+    ("Keen on learning. I use Rust, go and hiking.", (20, 29, "like")),
+    # a multi-word skill completed at the edge of the window, further back than one alias length
+    ("I like go and some machine work.", (27, 31, "learning")),
+])
+def test_session_follows_context_changes(resume, edit):
+    jd = "Go developer with Rust and machine learning"
+    session = ScoreSession({"text": resume}, jd)
+    start, end, text = edit
+    got = session.apply([{"target": "resume", "start": start, "end": end, "text": text}])
+    want = score_resume({"text": session.text}, jd)
+    assert got["matched_keywords"] == want["matched_keywords"]
+    assert got["section_matches"] == want["section_matches"]
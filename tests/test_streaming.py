@@ -0,0 +1,97 @@
+# tests/test_streaming.py
+import asyncio
+import json
+import time
+
+import pytest
+
+import backend.main as main
+from backend.workers import PoolTimeout, WorkerPool
+from benchmarks.corpus import make_resume
+
+
+def _ticker(interval: float, n: int):
+    # outlives the timeout, but ends: a timed-out job still runs to completion
+    for i in range(n):
+        time.sleep(interval)
+        yield i
+
+
+def _three():
+    yield from (1, 2, 3)
+
+
+async def _collect(pool, fn, *args):
+    seen = []
+    try:
+        async for item in pool.stream(fn, *args):
+            seen.append(item)
+    finally:
+        pool.shutdown(wait=False)
+    return seen
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_stream_yields_every_item(workers):
+    assert asyncio.run(_collect(WorkerPool("t", workers=workers, timeout=10), _three)) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_busy_stream_still_times_out(workers):
+    pool = WorkerPool("t", workers=workers, timeout=0.5)
+    t0 = time.monotonic()
+    with pytest.raises(PoolTimeout):
+        asyncio.run(_collect(pool, _ticker, 0.01, 150))
+    assert time.monotonic() - t0 < 5
+    assert pool.timeouts == 1
+
+
+def _records(response):
+    return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def _upload(client, data: bytes, name: str = "resume.pdf"):
+    return client.post("/parse/stream", files={"file": (name, data, "application/pdf")})
+
+
+def test_pages_then_done(client):
+    pdf = make_resume(11, pages=3)
+    records = _records(_upload(client, pdf))
+    events = [r["event"] for r in records]
+    assert events == ["page"] * len(events[:-1]) + ["done"]
+    assert [r["page"] for r in records[:-1]] == list(range(1, len(records)))
+    assert records[-1]["pages"] == len(records) - 1 and records[-1]["cached"] is False
+    again = _records(_upload(client, pdf))
+    assert [r["event"] for r in again] == ["text", "done"]
+    assert again[-1]["cached"] is True and again[-1]["doc_id"] == records[-1]["doc_id"]
+
+
+def test_plain_text_upload(client):
+    records = _records(_upload(client, b"Jane Doe\nPython developer\n", "resume.txt"))
+    assert [r["event"] for r in records] == ["text", "done"]
+
+
+def test_unreadable_pdf_is_422(client):
+    assert _upload(client, b"%PDF-1.4 broken").status_code == 422
+
+
+def test_saturated_pool_is_429(client, monkeypatch):
+    pool = WorkerPool("parse", workers=0, queue_size=0)
+    monkeypatch.setattr(main, "get_pool", lambda name: pool)
+    assert _upload(client, make_resume(12, pages=1)).status_code == 429
+
+
+def test_timeout_mid_stream_ends_with_one_error(client, monkeypatch):
+    def slow(contents, filename):
+        for _ in range(50):
+            time.sleep(0.02)
+            yield "page", "more text"
+
+    pool = WorkerPool("parse", workers=0, timeout=0.3)
+    monkeypatch.setattr(main, "get_pool", lambda name: pool)
+    monkeypatch.setattr(main, "stream_upload", slow)
+    r = _upload(client, make_resume(13, pages=1))
+    assert r.status_code == 200
+    records = _records(r)
+    assert {rec["event"] for rec in records[:-1]} == {"page"}
+    assert records[-1] == {"event": "error", "status": 504, "detail": "parse job exceeded 0.3s"}
@@ -0,0 +1,60 @@
+# tests/test_workers.py
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import backend.main as main
+from backend.workers import WorkerPool
+from conftest import JD, RESUMES
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def _allocate() -> None:
+    raise MemoryError()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    p = WorkerPool("test", workers=1, timeout=0.5, max_mb=2048)
+    monkeypatch.setattr(main, "get_pool", lambda name: p)
+    yield p
+    p.shutdown(wait=True)
+
+
+def _status(fn, *args) -> int:
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(main._run_pooled("test", fn, *args))
+    return e.value.status_code
+
+
+def test_runs_job(pool):
+    assert asyncio.run(main._run_pooled("test", _sleep, 0.0)) == 0.0
+
+
+def test_saturated_is_429(pool):
+    pool.queue_size = 0
+    assert _status(_sleep, 0.0) == 429
+    assert pool.rejected == 1
+
+
+def test_timeout_is_504(pool):
+    assert _status(_sleep, 2.0) == 504
+    assert pool.timeouts == 1
+
+
+def test_memory_limit_is_413(pool):
+    assert _status(_allocate) == 413
+    assert pool.memory_errors == 1
+
+
+def test_saturated_endpoint_sets_retry_after(client, pool):
+    pool.queue_size = 0
+    r = client.post("/score", json={"parsed": {"text": RESUMES[0]}, "job_description": JD})
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "1"